@@ -0,0 +1,69 @@
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# As of this migration; migrations don't use application code, which may change.
+HOMOGRAPH_DISAMBIGUATORS = ("pos", "inflectional_category", "analysis", "id")
+
+
+def homograph_disambiguator(lemma, homographs):
+    """
+    The first of HOMOGRAPH_DISAMBIGUATORS whose value, together with the text,
+    matches only that lemma, or None when the text alone is unique.
+    """
+    if len(homographs) == 1:
+        return None
+    for field in HOMOGRAPH_DISAMBIGUATORS[:-1]:
+        value = getattr(lemma, field)
+        if sum(1 for wf in homographs if getattr(wf, field) == value) == 1:
+            return field
+    return "id"  # id always guarantees unique match
+
+
+def homograph_disambiguators(lemmas):
+    by_text = defaultdict(list)
+    for lemma in lemmas:
+        by_text[lemma.text].append(lemma)
+
+    return {
+        lemma.id: homograph_disambiguator(lemma, homographs)
+        for homographs in by_text.values()
+        for lemma in homographs
+    }
+
+
+def compute_homograph_disambiguators(apps, schema_editor):
+    Wordform = apps.get_model("API", "Wordform")
+    lemmas = list(
+        Wordform.objects.filter(is_lemma=True).only(
+            "id", "text", "pos", "inflectional_category", "analysis"
+        )
+    )
+    disambiguators = homograph_disambiguators(lemmas)
+
+    ambiguous = []
+    for lemma in lemmas:
+        if disambiguators[lemma.id] is not None:
+            lemma.homograph_disambiguator = disambiguators[lemma.id]
+            ambiguous.append(lemma)
+    Wordform.objects.bulk_update(
+        ambiguous, ["homograph_disambiguator"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('API', '0005_wordform_paradigm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wordform',
+            name='homograph_disambiguator',
+            field=models.CharField(blank=True, choices=[('pos', 'pos'), ('inflectional_category', 'inflectional_category'), ('analysis', 'analysis'), ('id', 'id')], default=None, help_text='For lemmas: the least strict field that, together with the text, uniquely identifies this lemma among its homographs; empty when the text alone is enough. Computed at import time.', max_length=21, null=True),
+        ),
+        migrations.RunPython(
+            compute_homograph_disambiguators, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.2.25 on 2026-10-18 03:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("API", "0006_wordform_homograph_disambiguator"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DictionaryImport",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(primary_key=True, serialize=False),
+                ),
+                (
+                    "source",
+                    models.CharField(help_text="The file imported", max_length=256),
+                ),
+                ("incremental", models.BooleanField(default=False)),
+                ("imported_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ImportedEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(primary_key=True, serialize=False),
+                ),
+                ("hash", models.CharField(max_length=40, unique=True)),
+                ("text", models.CharField(max_length=40)),
+                (
+                    "lemma",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="imported_entries",
+                        to="API.wordform",
+                    ),
+                ),
+            ],
+        ),
+    ]
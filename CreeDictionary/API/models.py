@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import logging
+from array import array
+from bisect import bisect_left
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Literal, Optional, Union
+from typing import (
+    Collection,
+    Iterable,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
 from urllib.parse import quote
 
 from django.db import models, transaction
@@ -11,6 +22,7 @@ from django.db.models import Max, Q
 from django.urls import reverse
 from django.utils.functional import cached_property
 from utils import PartOfSpeech, WordClass, fst_analysis_parser, shared_res_dir
+from utils.compiled_table import load_table
 from utils.cree_lev_dist import remove_cree_diacritics
 from utils.types import FSTTag
 
@@ -25,6 +37,11 @@ MAX_WORDFORM_LENGTH = 40
 # Don't start evicting cache entries until we've seen over this many unique definitions:
 MAX_SOURCE_ID_CACHE_ENTRIES = 4096
 
+# The fields that can tell homographic lemmas apart, least strict first:
+HOMOGRAPH_DISAMBIGUATORS = ("pos", "inflectional_category", "analysis", "id")
+
+MORPHEME_RANKINGS_FILE = shared_res_dir / "W_aggr_corp_morph_log_freq.txt"
+
 logger = logging.getLogger(__name__)
 
 
@@ -112,6 +129,17 @@ class Wordform(models.Model):
         blank=True,
     )
 
+    homograph_disambiguator = models.CharField(
+        max_length=21,
+        choices=[(field,) * 2 for field in HOMOGRAPH_DISAMBIGUATORS],
+        null=True,
+        blank=True,
+        default=None,
+        help_text="For lemmas: the least strict field that, together with the text, "
+        "uniquely identifies this lemma among its homographs; empty when the text "
+        "alone is enough. Computed at import time.",
+    )
+
     class Meta:
         indexes = [
             # analysis is for faster user query (see search/lookup.py)
@@ -148,7 +176,6 @@ class Wordform(models.Model):
         )
 
         if ambiguity == "allow":
-            # avoids doing an expensive lookup to disambiguate
             return lemma_url
 
         if self.homograph_disambiguator is not None:
@@ -183,26 +210,6 @@ class Wordform(models.Model):
         tags = [FSTTag(t) for t in fst_tag_str.split("+")]
         return LABELS.emoji.get_longest(tags)
 
-    # We do our own caching instead of using @cachedproperty so that we can
-    # disambiguate homographs in bulk when displaying search results
-    _cached_homograph_disambiguator: Optional[str]
-
-    @property
-    def homograph_disambiguator(self) -> Optional[str]:
-        """
-        :return: the least strict field name that guarantees unique match together with the text field.
-            could be pos, inflectional_category, analysis, id or None when the text is enough to disambiguate
-        """
-        assert self.is_lemma
-
-        if hasattr(self, "_cached_homograph_disambiguator"):
-            return self._cached_homograph_disambiguator
-
-        homographs = Wordform.objects.filter(text=self.text, is_lemma=True)
-        key = self._compute_homograph_key(homographs)
-        self._cached_homograph_disambiguator = key
-        return key
-
     # TODO: rename! it should not have an underscore!
     @property
     def word_class(self) -> Optional[WordClass]:
@@ -248,38 +255,56 @@ class Wordform(models.Model):
 
         super(Wordform, self).save(*args, **kwargs)
 
-    @classmethod
-    def bulk_homograph_disambiguate(cls, wordform_objects: list[Wordform]):
-        """Precache the homograph key information on the wordform_objects
+        if self.is_lemma:
+            self._update_homograph_disambiguators()
 
-        The information will be retrieved with a single database query.
+    def _update_homograph_disambiguators(self):
+        """
+        A new lemma can make its existing homographs ambiguous, so recompute the
+        disambiguators of every lemma with the same text.
         """
-        wordform_texts = list(set(wf.text for wf in wordform_objects))
-        homographs = Wordform.objects.filter(text__in=wordform_texts, is_lemma=True)
-        by_text = defaultdict(list)
+        homographs = list(Wordform.objects.filter(text=self.text, is_lemma=True))
+        disambiguators = homograph_disambiguators(homographs)
+
+        changed = []
         for wf in homographs:
-            by_text[wf.text].append(wf)
-        for wf in wordform_objects:
-            wf._cached_homograph_disambiguator = wf._compute_homograph_key(
-                by_text[wf.text]
-            )
+            if wf.homograph_disambiguator != disambiguators[wf.id]:
+                wf.homograph_disambiguator = disambiguators[wf.id]
+                changed.append(wf)
+        Wordform.objects.bulk_update(changed, ["homograph_disambiguator"])
 
-    def _compute_homograph_key(self, all_wordforms_with_same_text):
-        if len(all_wordforms_with_same_text) == 1:
-            return None
-        for field in "pos", "inflectional_category", "analysis":
-            if (
-                len(
-                    [
-                        wf
-                        for wf in all_wordforms_with_same_text
-                        if getattr(self, field) == getattr(wf, field)
-                    ]
-                )
-                == 1
-            ):
-                return field
-        return "id"  # id always guarantees unique match
+        self.homograph_disambiguator = disambiguators[self.id]
+
+
+def homograph_disambiguators(lemmas: Iterable) -> dict[int, Optional[str]]:
+    """
+    Figures out the homograph_disambiguator of each lemma.
+
+    :param lemmas: every lemma in the dictionary with any of the texts involved;
+        only their id, text, pos, inflectional_category and analysis are used.
+    :return: the disambiguator of each lemma, by id: the first of
+        HOMOGRAPH_DISAMBIGUATORS whose value, together with the text, matches only
+        that lemma, or None when the text alone is unique.
+    """
+    by_text: dict[str, list] = defaultdict(list)
+    for lemma in lemmas:
+        by_text[lemma.text].append(lemma)
+
+    result: dict[int, Optional[str]] = {}
+    for homographs in by_text.values():
+        for lemma in homographs:
+            result[lemma.id] = _homograph_disambiguator(lemma, homographs)
+    return result
+
+
+def _homograph_disambiguator(lemma, homographs: list) -> Optional[str]:
+    if len(homographs) == 1:
+        return None
+    for field in HOMOGRAPH_DISAMBIGUATORS[:-1]:
+        value = getattr(lemma, field)
+        if sum(1 for wf in homographs if getattr(wf, field) == value) == 1:
+            return field
+    return "id"  # id always guarantees unique match
 
 
 class DictionarySource(models.Model):
@@ -407,6 +432,335 @@ class EnglishKeyword(models.Model):
         indexes = [models.Index(fields=["text"])]
 
 
+class ImportedEntry(models.Model):
+    """
+    An entry of the dictionary source, as of the last import, and the lemma it was
+    imported as.
+
+    An incremental import compares the entries of the new source with these, and
+    only imports the ones that changed (see DatabaseManager.xml_importer).
+    """
+
+    id = models.AutoField(primary_key=True)
+
+    # Identifies the entry's contents; see xml_importer.entry_hash()
+    hash = models.CharField(max_length=40, unique=True)
+
+    # The <l> of the entry: the definitions of any wordform with this text may
+    # come from it.
+    text = models.CharField(max_length=MAX_WORDFORM_LENGTH)
+
+    lemma = models.ForeignKey(
+        Wordform, on_delete=models.CASCADE, related_name="imported_entries"
+    )
+
+    def __str__(self):
+        return self.text
+
+
+class DictionaryImport(models.Model):
+    """
+    A record of each import of the dictionary source, full or incremental, or of
+    any other change to the dictionary (see dictionary_version()).
+    """
+
+    id = models.AutoField(primary_key=True)
+
+    source = models.CharField(max_length=256, help_text="The file imported")
+    incremental = models.BooleanField(default=False)
+    imported_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.source} ({self.imported_at})"
+
+
+def dictionary_version() -> str:
+    """
+    Identifies the imported dictionary, so that anything precomputed from it can
+    tell when the database has been re-imported or swapped out.
+
+    Every import records itself as a DictionaryImport, and so does anything else
+    that changes the dictionary (e.g., translatewordforms), so the latest one
+    identifies what's in the database. Looking it up is a single query on the
+    primary key, which is cheap enough to call on every request. Its time tells
+    apart databases that happen to have recorded the same number of imports.
+    """
+    latest = (
+        DictionaryImport.objects.order_by("-pk")
+        .values_list("pk", "imported_at")
+        .first()
+    )
+    if latest is None:
+        # Imported before imports were recorded; the next import will be.
+        return "unrecorded"
+    pk, imported_at = latest
+    return f"{pk}:{imported_at.isoformat()}"
+
+
+class WordformRow(NamedTuple):
+    """
+    The stored columns of one Wordform, as held by the LexiconIndex.
+
+    Field names are the attribute names of the Wordform model, so a row can be
+    used wherever only attribute access on a wordform is needed.
+    """
+
+    id: int
+    text: str
+    inflectional_category: str
+    pos: str
+    analysis: str
+    paradigm: Optional[str]
+    is_lemma: bool
+    as_is: bool
+    lemma_id: int
+    stem: str
+    homograph_disambiguator: Optional[str] = None
+
+
+class LexiconIndex:
+    """
+    A compact, read-only, in-memory copy of the Wordform table.
+
+    The dictionary only changes when it is re-imported, so exact matches on a
+    wordform's analysis or text can be answered from memory instead of with an
+    SQLite query.
+
+    Every column is stored in flat arrays: text and analysis are concatenated
+    into one string blob each with an array of offsets, and the columns that
+    are shared by all the inflections of a lemma (pos, inflectional category,
+    stem, paradigm) are stored once and referred to by index. Lookups by text
+    or analysis bisect a sorted array of hashes. This keeps the whole
+    dictionary's worth of inflections to a small, constant number of Python
+    objects per worker.
+    """
+
+    _IS_LEMMA = 0b001
+    _AS_IS = 0b010
+    _HAS_CW_DEFINITION = 0b100
+    # The remaining bits hold the homograph disambiguator, as an index into:
+    _DISAMBIGUATORS = (None,) + HOMOGRAPH_DISAMBIGUATORS
+    _DISAMBIGUATOR_SHIFT = 3
+
+    def __init__(self, rows: Iterable[Sequence], cw_wordform_ids: Collection[int] = ()):
+        """
+        :param rows: tuples with the same fields, in the same order, as
+            WordformRow, sorted by id
+        :param cw_wordform_ids: ids of the wordforms with at least one definition
+            that cites CW
+        """
+        cw_wordform_ids = set(cw_wordform_ids)
+
+        self._ids = array("I")
+        self._lemma_ids = array("I")
+        self._flags = array("B")
+        self._shared_columns = array("I")
+        self._shared_column_values: list[tuple[str, str, str, Optional[str]]] = []
+        shared_column_to_index: dict[tuple[str, str, str, Optional[str]], int] = {}
+
+        texts: list[str] = []
+        analyses: list[str] = []
+
+        for row in (WordformRow(*r) for r in rows):
+            if self._ids and row.id <= self._ids[-1]:
+                raise ValueError(f"rows are not sorted by id: {row.id}")
+            self._ids.append(row.id)
+            self._lemma_ids.append(row.lemma_id)
+            self._flags.append(
+                (self._IS_LEMMA if row.is_lemma else 0)
+                | (self._AS_IS if row.as_is else 0)
+                | (self._HAS_CW_DEFINITION if row.id in cw_wordform_ids else 0)
+                | (
+                    self._DISAMBIGUATORS.index(row.homograph_disambiguator)
+                    << self._DISAMBIGUATOR_SHIFT
+                )
+            )
+
+            shared = (row.inflectional_category, row.pos, row.stem, row.paradigm)
+            if shared not in shared_column_to_index:
+                shared_column_to_index[shared] = len(self._shared_column_values)
+                self._shared_column_values.append(shared)
+            self._shared_columns.append(shared_column_to_index[shared])
+
+            texts.append(row.text)
+            analyses.append(row.analysis)
+
+        self._text_blob, self._text_offsets = _pack_strings(texts)
+        self._analysis_blob, self._analysis_offsets = _pack_strings(analyses)
+        self._text_hashes, self._text_positions = _hash_index(texts)
+        self._analysis_hashes, self._analysis_positions = _hash_index(analyses)
+
+    @classmethod
+    def from_database(cls) -> LexiconIndex:
+        """
+        Slurp the Wordform table into a new index.
+        """
+        rows = Wordform.objects.order_by("id").values_list(*WordformRow._fields)
+        cw_wordform_ids = (
+            Definition.citations.through.objects.filter(dictionarysource_id="CW")
+            .values_list("definition__wordform_id", flat=True)
+            .distinct()
+        )
+        return cls(rows.iterator(), cw_wordform_ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, wordform_id: object) -> bool:
+        return isinstance(wordform_id, int) and self._position(wordform_id) is not None
+
+    def wordform_ids_with_analysis(self, analysis: str) -> list[int]:
+        """
+        The ids of all wordforms with exactly this analysis, in id order.
+        """
+        return [
+            self._ids[p]
+            for p in self._lookup(
+                self._analysis_hashes,
+                self._analysis_positions,
+                analysis,
+                self._analysis_at,
+            )
+        ]
+
+    def wordform_ids_with_text(self, text: str, is_lemma: bool) -> list[int]:
+        """
+        The ids of all wordforms with exactly this text, in id order.
+        """
+        return [
+            self._ids[p]
+            for p in self._lookup(
+                self._text_hashes, self._text_positions, text, self._text_at
+            )
+            if bool(self._flags[p] & self._IS_LEMMA) == is_lemma
+        ]
+
+    def rows_with_text(self, text: str, is_lemma: bool) -> list[WordformRow]:
+        return [
+            self.row(wordform_id)
+            for wordform_id in self.wordform_ids_with_text(text, is_lemma)
+        ]
+
+    def row(self, wordform_id: int) -> WordformRow:
+        """
+        :raise KeyError: when there is no wordform with this id
+        """
+        position = self._position(wordform_id)
+        if position is None:
+            raise KeyError(wordform_id)
+
+        flags = self._flags[position]
+        inflectional_category, pos, stem, paradigm = self._shared_column_values[
+            self._shared_columns[position]
+        ]
+        return WordformRow(
+            id=wordform_id,
+            text=self._text_at(position),
+            inflectional_category=inflectional_category,
+            pos=pos,
+            analysis=self._analysis_at(position),
+            paradigm=paradigm,
+            is_lemma=bool(flags & self._IS_LEMMA),
+            as_is=bool(flags & self._AS_IS),
+            lemma_id=self._lemma_ids[position],
+            stem=stem,
+            homograph_disambiguator=self._DISAMBIGUATORS[
+                flags >> self._DISAMBIGUATOR_SHIFT
+            ],
+        )
+
+    def has_cw_definition(self, wordform_id: int) -> bool:
+        position = self._position(wordform_id)
+        return position is not None and bool(
+            self._flags[position] & self._HAS_CW_DEFINITION
+        )
+
+    def wordforms(self, wordform_ids: Iterable[int]) -> list[Wordform]:
+        """
+        Materialize Wordform instances, with their lemmas attached, without
+        touching the database.
+        """
+        lemmas: dict[int, Wordform] = {}
+
+        def instantiate(row: WordformRow) -> Wordform:
+            return Wordform.from_db(
+                Wordform.objects.db,
+                _WORDFORM_ATTNAMES,
+                [getattr(row, attname) for attname in _WORDFORM_ATTNAMES],
+            )
+
+        def lemma_for(row: WordformRow, wordform: Wordform) -> Wordform:
+            if row.lemma_id == row.id:
+                return wordform
+            if row.lemma_id not in lemmas:
+                lemmas[row.lemma_id] = instantiate(self.row(row.lemma_id))
+                lemmas[row.lemma_id].lemma = lemmas[row.lemma_id]
+            return lemmas[row.lemma_id]
+
+        result = []
+        for wordform_id in wordform_ids:
+            row = self.row(wordform_id)
+            wordform = instantiate(row)
+            wordform.lemma = lemma_for(row, wordform)
+            result.append(wordform)
+        return result
+
+    def _position(self, wordform_id: int) -> Optional[int]:
+        position = bisect_left(self._ids, wordform_id)
+        if position < len(self._ids) and self._ids[position] == wordform_id:
+            return position
+        return None
+
+    def _text_at(self, position: int) -> str:
+        return self._text_blob[
+            self._text_offsets[position] : self._text_offsets[position + 1]
+        ]
+
+    def _analysis_at(self, position: int) -> str:
+        return self._analysis_blob[
+            self._analysis_offsets[position] : self._analysis_offsets[position + 1]
+        ]
+
+    @staticmethod
+    def _lookup(hashes: array, positions: array, key: str, value_at) -> list[int]:
+        key_hash = hash(key)
+        i = bisect_left(hashes, key_hash)
+        matches = []
+        while i < len(hashes) and hashes[i] == key_hash:
+            # Different strings can share a hash, so compare the real value:
+            if value_at(positions[i]) == key:
+                matches.append(positions[i])
+            i += 1
+        return matches
+
+
+def _pack_strings(strings: list[str]) -> tuple[str, array]:
+    """
+    Concatenate strings into one blob, with an offsets array such that string
+    i is blob[offsets[i]:offsets[i + 1]].
+    """
+    offsets = array("I", [0])
+    total = 0
+    for string in strings:
+        total += len(string)
+        offsets.append(total)
+    return "".join(strings), offsets
+
+
+def _hash_index(strings: list[str]) -> tuple[array, array]:
+    """
+    Returns the hashes of the strings in ascending order, and the positions of
+    the strings they came from, in parallel arrays. Positions that share a hash
+    stay in ascending order.
+    """
+    hashes = [hash(string) for string in strings]
+    order = sorted(range(len(strings)), key=hashes.__getitem__)
+    return array("q", (hashes[p] for p in order)), array("I", order)
+
+
+_WORDFORM_ATTNAMES = tuple(f.attname for f in Wordform._meta.concrete_fields)
+
+
 class _WordformCache:
     @cached_property
     def PREVERB_ASCII_LOOKUP(self) -> dict[str, set[models.Wordform]]:
@@ -442,27 +796,39 @@ class _WordformCache:
         return lookup
 
     @cached_property
-    def MORPHEME_RANKINGS(self) -> Dict[str, float]:
+    def MORPHEME_RANKINGS(self) -> Mapping[str, float]:
         logger.debug("reading morpheme rankings")
-        ret = {}
+        return load_table(MORPHEME_RANKINGS_FILE, read_morpheme_rankings, "d")
 
-        lines = (
-            Path(shared_res_dir / "W_aggr_corp_morph_log_freq.txt")
-            .read_text()
-            .splitlines()
-        )
-        for line in lines:
-            cells = line.split("\t")
-            # todo: use the third row
-            if len(cells) >= 2:
-                freq, morpheme, *_ = cells
-                ret[morpheme] = float(freq)
-        return ret
+    @cached_property
+    def LEXICON_INDEX(self) -> LexiconIndex:
+        logger.debug("building lexicon index")
+        return LexiconIndex.from_database()
 
     def preload(self):
         # Accessing these cached properties will preload them
         self.PREVERB_ASCII_LOOKUP
         self.MORPHEME_RANKINGS
+        self.LEXICON_INDEX
+
+    def clear(self):
+        """
+        Forgets everything loaded from the database, so that it's loaded again when
+        it's next needed, e.g., after an incremental import.
+        """
+        for name in ("PREVERB_ASCII_LOOKUP", "LEXICON_INDEX"):
+            self.__dict__.pop(name, None)
 
 
 wordform_cache = _WordformCache()
+
+
+def read_morpheme_rankings(rankings_file: Path) -> dict[str, float]:
+    ret = {}
+    for line in rankings_file.read_text().splitlines():
+        cells = line.split("\t")
+        # todo: use the third row
+        if len(cells) >= 2:
+            freq, morpheme, *_ = cells
+            ret[morpheme] = float(freq)
+    return ret
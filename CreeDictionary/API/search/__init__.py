@@ -1,3 +1,4 @@
+from .result_cache import cached_search
 from .runner import search
 
 
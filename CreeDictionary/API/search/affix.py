@@ -9,17 +9,26 @@ tab-completion. It uses tries to expand queries, so that searching for ‘snowm
 also returns results for ‘snowmobile’
 """
 
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import mmap
+import os
+import sys
+from array import array
 from collections import defaultdict
 from functools import cached_property
-from itertools import chain
-from typing import Dict, Iterable, List, NewType, Tuple
+from itertools import chain, islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NewType, Optional, Sequence, Tuple
 
 import dawg
 from django.conf import settings
 
-from API.models import Wordform, EnglishKeyword
-from utils import get_modified_distance
-from utils.cree_lev_dist import remove_cree_diacritics
+from API.models import Wordform, EnglishKeyword, dictionary_version, wordform_cache
+from utils.cree_lev_dist import ModifiedDistanceScorer, remove_cree_diacritics
 from .types import (
     InternalForm,
     Result,
@@ -29,51 +38,208 @@ from . import core
 # A simplified form intended to be used within the affix search trie.
 SimplifiedForm = NewType("SimplifiedForm", str)
 
+# Bump this whenever AffixSearcher.save() changes what it writes
+AFFIX_SEARCH_INDEX_FORMAT = 1
+
+logger = logging.getLogger(__name__)
+
 
 class AffixSearcher:
     """
     Enables prefix and suffix searches given a list of words and their wordform IDs.
+
+    Each distinct simplified form is numbered in sorted order; both tries map a
+    form to its number, and the wordform IDs of form n are
+    ids[offsets[n]:offsets[n + 1]]. Since all of that is plain bytes, a searcher
+    can be saved to disk and loaded back with the IDs memory-mapped, so that
+    server processes share them rather than each rebuilding a copy.
     """
 
     # TODO: "int" should be Wordform PK type
 
     def __init__(self, words: Iterable[Tuple[str, int]]):
-        self.text_to_ids: Dict[str, List[int]] = defaultdict(list)
+        text_to_ids: Dict[SimplifiedForm, List[int]] = defaultdict(list)
+        for raw_text, wordform_id in words:
+            if simplified_text := self.to_simplified_form(raw_text):
+                text_to_ids[simplified_text].append(wordform_id)
+
+        texts = sorted(text_to_ids)
+        offsets = array("I", [0])
+        ids = array("I")
+        for text in texts:
+            ids.extend(text_to_ids[text])
+            offsets.append(len(ids))
+
+        self._prefixes = dawg.IntCompletionDAWG(zip(texts, range(len(texts))))
+        self._suffixes = dawg.IntCompletionDAWG(
+            (_reverse(text), n) for n, text in enumerate(texts)
+        )
+        self._offsets: Sequence[int] = offsets
+        self._ids: Sequence[int] = ids
+        self._alphabet = sorted({char for text in texts for char in text})
 
-        words_marked_for_indexing = [
-            (simplified_text, wordform_id)
-            for raw_text, wordform_id in words
-            if (simplified_text := self.to_simplified_form(raw_text))
-        ]
+    def save(self, directory: Path, name: str, version: str) -> None:
+        """
+        Writes this searcher to files called name.* in directory.
+
+        The manifest is written last, and every file is swapped in atomically, so
+        a process loading at the same time sees either the old files or the
+        new ones.
 
-        for text, wordform_id in words_marked_for_indexing:
-            self.text_to_ids[self.to_simplified_form(text)].append(wordform_id)
+        :param version: the dictionary_version() this searcher was built from
+        """
+        directory.mkdir(parents=True, exist_ok=True)
 
-        self._prefixes = dawg.CompletionDAWG(
-            [text for text, _ in words_marked_for_indexing]
+        _write_atomically(directory / f"{name}.prefixes.dawg", self._prefixes.tobytes())
+        _write_atomically(directory / f"{name}.suffixes.dawg", self._suffixes.tobytes())
+        _write_atomically(
+            directory / f"{name}.ids",
+            array("I", self._offsets).tobytes() + array("I", self._ids).tobytes(),
         )
-        self._suffixes = dawg.CompletionDAWG(
-            [_reverse(text) for text, _ in words_marked_for_indexing]
+        manifest = {
+            "format": AFFIX_SEARCH_INDEX_FORMAT,
+            "dictionary_version": version,
+            "byteorder": sys.byteorder,
+            "itemsize": array("I").itemsize,
+            "form_count": len(self._offsets) - 1,
+            "alphabet": "".join(self._alphabet),
+        }
+        _write_atomically(
+            directory / f"{name}.json", json.dumps(manifest).encode("UTF-8")
         )
 
+    @classmethod
+    def load(cls, directory: Path, name: str, version: str) -> Optional[AffixSearcher]:
+        """
+        Loads a searcher saved by save(), memory-mapping its wordform IDs.
+
+        :return: None if there is no saved searcher, or if it was saved by an
+                 incompatible version of this code or from a different
+                 dictionary_version().
+        """
+        try:
+            manifest = json.loads((directory / f"{name}.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+
+        if manifest != {
+            **manifest,
+            "format": AFFIX_SEARCH_INDEX_FORMAT,
+            "dictionary_version": version,
+            "byteorder": sys.byteorder,
+            "itemsize": array("I").itemsize,
+        }:
+            logger.info("saved %s affix searcher is out of date", name)
+            return None
+
+        searcher = cls.__new__(cls)
+        try:
+            searcher._prefixes = dawg.IntCompletionDAWG().load(
+                os.fspath(directory / f"{name}.prefixes.dawg")
+            )
+            searcher._suffixes = dawg.IntCompletionDAWG().load(
+                os.fspath(directory / f"{name}.suffixes.dawg")
+            )
+            with open(directory / f"{name}.ids", "rb") as ids_file:
+                # The mapping stays valid after the file is closed, and even
+                # after the file is replaced by a later save().
+                mapped = mmap.mmap(ids_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.warning("could not load saved %s affix searcher: %s", name, e)
+            return None
+
+        numbers = memoryview(mapped).cast("I")
+        form_count = manifest["form_count"]
+        searcher._offsets = numbers[: form_count + 1]
+        searcher._ids = numbers[form_count + 1 :]
+        searcher._alphabet = sorted(manifest["alphabet"])
+        return searcher
+
     def search_by_prefix(self, prefix: str) -> Iterable[int]:
         """
         :return: an iterable of Wordform IDs that match the prefix
         """
         term = self.to_simplified_form(prefix)
-        matched_words = self._prefixes.keys(term)
-        return chain.from_iterable(self.text_to_ids[t] for t in matched_words)
+        matched_forms = self._prefixes.items(term)
+        return chain.from_iterable(self._ids_of(n) for _, n in matched_forms)
 
     def search_by_suffix(self, suffix: str) -> Iterable[int]:
         """
         :return: an iterable of Wordform IDs that match the suffix
         """
         term = self.to_simplified_form(suffix)
-        matched_reversed_words = self._suffixes.keys(_reverse(term))
+        matched_forms = self._suffixes.items(_reverse(term))
+        return chain.from_iterable(self._ids_of(n) for _, n in matched_forms)
+
+    def search_by_affix(self, affix: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Combines search_by_prefix() and search_by_suffix(), best matches first.
+
+        Matches are ranked by how little they add to the affix, i.e., shortest
+        first, so when there are more than limit matches, the ones kept are the
+        most likely to be what was meant. This only looks at the tries, so the
+        IDs can be cut down before anything is fetched from the database.
+
+        :return: at most limit distinct Wordform IDs
+        """
+        term = self.to_simplified_form(affix)
+        form_lengths = {n: len(form) for form, n in self._prefixes.items(term)}
+        form_lengths.update(
+            (n, len(form)) for form, n in self._suffixes.items(_reverse(term))
+        )
+
+        def rank(form_number: int) -> Tuple[int, int]:
+            return form_lengths[form_number], form_number
+
+        if limit is None:
+            best_forms = sorted(form_lengths, key=rank)
+        else:
+            # Every form has at least one ID, so this is enough forms
+            best_forms = heapq.nsmallest(limit, form_lengths, key=rank)
+
+        # Wordforms with several keywords can be reached from more than one form
+        ids = dict.fromkeys(chain.from_iterable(map(self._ids_of, best_forms)))
+        return list(islice(ids, limit))
+
+    def search_by_similarity(self, query: str, max_distance: float) -> Iterable[int]:
+        """
+        Walks the prefix trie with a bounded edit-distance automaton, following the
+        cost model of get_modified_distance(word, query).
+
+        Since the trie holds simplified forms, diacritics are not compared, so
+        this may return words that are further than max_distance from the
+        query once diacritics are counted; but it never misses a word that is
+        within max_distance.
+
+        :return: an iterable of Wordform IDs that are similar to the query
+        """
+        scorer = ModifiedDistanceScorer(self.to_simplified_form(query))
+        matched_words = []
+
+        # Depth-first, sharing the automaton rows of common prefixes, and
+        # abandoning a prefix as soon as every extension is too far away.
+        stack = [(SimplifiedForm(""), scorer.first_row())]
+        while stack:
+            prefix, row = stack.pop()
+            if row[-1] <= max_distance and prefix in self._prefixes:
+                matched_words.append(prefix)
+
+            previous_char = prefix[-1] if prefix else None
+            for char in self._alphabet:
+                extended = SimplifiedForm(prefix + char)
+                if not self._prefixes.has_keys_with_prefix(extended):
+                    continue
+                next_row = scorer.next_row(row, char, previous_char)
+                if min(next_row) <= max_distance:
+                    stack.append((extended, next_row))
+
         return chain.from_iterable(
-            self.text_to_ids[_reverse(t)] for t in matched_reversed_words
+            self._ids_of(self._prefixes[t]) for t in matched_words
         )
 
+    def _ids_of(self, form_number: int) -> Sequence[int]:
+        return self._ids[self._offsets[form_number] : self._offsets[form_number + 1]]
+
     @staticmethod
     def to_simplified_form(query: str) -> SimplifiedForm:
         """
@@ -90,13 +256,25 @@ def _reverse(text: SimplifiedForm) -> SimplifiedForm:
     return SimplifiedForm(text[::-1])
 
 
-def do_affix_search(query: InternalForm, affixes: AffixSearcher) -> Iterable[Wordform]:
+def _write_atomically(path: Path, contents: bytes) -> None:
+    temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary_path.write_bytes(contents)
+    os.replace(temporary_path, path)
+
+
+def do_affix_search(
+    query: InternalForm, affixes: AffixSearcher, limit: Optional[int] = None
+) -> List[Wordform]:
     """
     Augments the given set with results from performing both a suffix and prefix search on the wordforms.
+
+    :param limit: how many of the best matches to return; defaults to
+                  settings.AFFIX_SEARCH_RESULT_LIMIT
     """
-    matched_ids = set(affixes.search_by_prefix(query))
-    matched_ids |= set(affixes.search_by_suffix(query))
-    return Wordform.objects.filter(id__in=matched_ids)
+    if limit is None:
+        limit = settings.AFFIX_SEARCH_RESULT_LIMIT
+    matched_ids = affixes.search_by_affix(query, limit)
+    return wordform_cache.LEXICON_INDEX.wordforms(sorted(matched_ids))
 
 
 def do_target_language_affix_search(search_run: core.SearchRun):
@@ -113,18 +291,53 @@ def do_source_language_affix_search(search_run: core.SearchRun):
         search_run.internal_query,
         cache.source_language_affix_searcher,
     )
-    for word in matching_words:
+    distances = ModifiedDistanceScorer(search_run.internal_query).distances_to(
+        word.text for word in matching_words
+    )
+    for word, distance in zip(matching_words, distances):
         search_run.add_result(
             Result(
                 word,
                 source_language_affix_match=True,
-                query_wordform_edit_distance=get_modified_distance(
-                    word.text, search_run.internal_query
-                ),
+                query_wordform_edit_distance=distance,
             )
         )
 
 
+def do_source_language_fuzzy_search(
+    search_run: core.SearchRun, max_distance: Optional[float] = None
+):
+    """
+    Adds source-language lemmas within max_distance of the query, for queries
+    that are misspelled beyond what the relaxed FST can analyze.
+
+    :param max_distance: the largest get_modified_distance() from a lemma to the
+                         query; defaults to settings.FUZZY_SEARCH_MAX_DISTANCE
+    """
+    if max_distance is None:
+        max_distance = settings.FUZZY_SEARCH_MAX_DISTANCE
+
+    matched_ids = set(
+        cache.source_language_affix_searcher.search_by_similarity(
+            search_run.internal_query, max_distance
+        )
+    )
+    matching_words = wordform_cache.LEXICON_INDEX.wordforms(sorted(matched_ids))
+    scorer = ModifiedDistanceScorer(search_run.internal_query)
+    distances = scorer.distances_from(word.text for word in matching_words)
+    for word, distance in zip(matching_words, distances):
+        # The trie walk ignores diacritics, so check the real distance.
+        if distance <= max_distance:
+            search_run.add_result(
+                Result(
+                    word,
+                    source_language_fuzzy_match=True,
+                    # the other way around, as results are ranked by:
+                    query_wordform_edit_distance=scorer.distance_to(word.text),
+                )
+            )
+
+
 def query_would_return_too_many_results(query: InternalForm) -> bool:
     """
     If we do an search on too short an affix, the tries will match
@@ -149,6 +362,45 @@ def fetch_source_language_lemmas_with_ids():
     return tuple(Wordform.objects.filter(is_lemma=True).values_list("text", "id"))
 
 
+# The words indexed by each affix searcher, by the name its files are saved under
+_SEARCHER_WORDS: Dict[str, Callable[[], Iterable[Tuple[str, int]]]] = {
+    "source_language": fetch_source_language_lemmas_with_ids,
+    "target_language": fetch_target_language_keywords_with_ids,
+}
+
+
+def save_affix_searchers(directory: Optional[Path] = None) -> None:
+    """
+    Builds the affix searchers from the database and saves them, so that server
+    processes can load them instead of building them. The importer calls this.
+
+    :param directory: defaults to settings.SEARCH_INDEX_DIR
+    """
+    if directory is None:
+        directory = Path(settings.SEARCH_INDEX_DIR)
+    version = dictionary_version()
+    for name, fetch_words in _SEARCHER_WORDS.items():
+        AffixSearcher(fetch_words()).save(directory, name, version)
+
+
+def _load_or_build_affix_searcher(name: str) -> AffixSearcher:
+    directory = Path(settings.SEARCH_INDEX_DIR)
+    version = dictionary_version()
+
+    searcher = AffixSearcher.load(directory, name, version)
+    if searcher is not None:
+        return searcher
+
+    logger.info("building %s affix searcher from the database", name)
+    searcher = AffixSearcher(_SEARCHER_WORDS[name]())
+    try:
+        # Save it so that the next process can load it
+        searcher.save(directory, name, version)
+    except OSError as e:
+        logger.warning("could not save %s affix searcher: %s", name, e)
+    return searcher
+
+
 class _Cache:
     """A holder for cached properties since caching module attributes is messy
 
@@ -161,7 +413,7 @@ class _Cache:
         """
         Returns the affix searcher that matches source language lemmas
         """
-        return AffixSearcher(fetch_source_language_lemmas_with_ids())
+        return _load_or_build_affix_searcher("source_language")
 
     @cached_property
     def target_language_affix_searcher(self) -> AffixSearcher:
@@ -169,7 +421,7 @@ class _Cache:
         Returns the affix searcher that matches target language keywords mined from the dictionary
         definitions
         """
-        return AffixSearcher(fetch_target_language_keywords_with_ids())
+        return _load_or_build_affix_searcher("target_language")
 
     def preload(self):
         """Preload caches by accessing cached properties
@@ -179,5 +431,16 @@ class _Cache:
         self.source_language_affix_searcher
         self.target_language_affix_searcher
 
+    def clear(self):
+        """
+        Forgets the affix searchers, so that they're loaded again when they're next
+        needed, e.g., after an incremental import.
+        """
+        for name in (
+            "source_language_affix_searcher",
+            "target_language_affix_searcher",
+        ):
+            self.__dict__.pop(name, None)
+
 
 cache = _Cache()
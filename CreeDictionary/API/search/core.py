@@ -3,7 +3,7 @@ from django.db.models import prefetch_related_objects
 from . import types, presentation, ranking
 from .query import Query
 from .util import first_non_none_value
-from ..models import WordformKey, Wordform
+from ..models import WordformKey
 
 
 class SearchRun:
@@ -35,8 +35,11 @@ class SearchRun:
         else:
             self._results[key] = result
 
+    def unsorted_results(self) -> list[types.Result]:
+        return list(self._results.values())
+
     def sorted_results(self) -> list[types.Result]:
-        results = list(self._results.values())
+        results = self.unsorted_results()
         results.sort(key=ranking.sort_by_user_query(self))
         return results
 
@@ -51,13 +54,8 @@ class SearchRun:
 
     def serialized_presentation_results(self):
         results = self.presentation_results()
-        wordforms = [r.wordform for r in results] + [r.wordform.lemma for r in results]
-
-        Wordform.bulk_homograph_disambiguate(
-            [wf for wf in wordforms if wf.is_lemma and wf.id is not None]
-        )
-
-        return [r.serialize() for r in results]
+        wordform_serializer = presentation.WordformSerializer()
+        return [r.serialize(wordform_serializer) for r in results]
 
     def __repr__(self):
         return f"SearchRun<query={self.query!r}>"
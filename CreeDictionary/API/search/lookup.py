@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, Set
+import operator
+from collections import defaultdict
+from functools import reduce
+from itertools import chain
+from typing import Set
 
 from django.db.models import Q
 
@@ -23,9 +27,16 @@ logger = logging.getLogger(__name__)
 
 def fetch_results(search_run: core.SearchRun):
     """
-    The rest of this method is code Eddie has NOT refactored, so I don't really
-    understand what's going on here:
+    Adds the wordforms that match the query, in Cree or in English, to the search
+    run.
+
+    Cree wordforms are matched against the in-memory LexiconIndex, so matching
+    the source language does not query the database at all. The English keywords
+    of the query are all looked up in one query, and the lemmas they match in
+    another, no matter how many keywords the query has.
     """
+    lexicon = wordform_cache.LEXICON_INDEX
+
     # Use the spelling relaxation to try to decipher the query
     #   e.g., "atchakosuk" becomes "acâhkos+N+A+Pl" --
     #         thus, we can match "acâhkos" in the dictionary!
@@ -38,18 +49,20 @@ def fetch_results(search_run: core.SearchRun):
     for analysis in fst_analyses:
         # todo: test
 
-        exactly_matched_wordforms = Wordform.objects.filter(
-            analysis=analysis, as_is=False
-        )
+        exactly_matched_wordforms = [
+            wf
+            for wf in lexicon.wordforms(lexicon.wordform_ids_with_analysis(analysis))
+            if not wf.as_is
+        ]
 
-        if exactly_matched_wordforms.exists():
+        if exactly_matched_wordforms:
             for wf in exactly_matched_wordforms:
                 search_run.add_result(
                     Result(
                         wf,
                         source_language_match=wf.text,
                         query_wordform_edit_distance=get_modified_distance(
-                            wf.text, search_run.internal_query
+                            search_run.internal_query, wf.text
                         ),
                     )
                 )
@@ -78,7 +91,9 @@ def fetch_results(search_run: core.SearchRun):
             )
 
             lemma, word_class = lemma_wc
-            matched_lemma_wordforms = Wordform.objects.filter(text=lemma, is_lemma=True)
+            matched_lemma_wordforms = lexicon.wordforms(
+                lexicon.wordform_ids_with_text(lemma, is_lemma=True)
+            )
 
             # now we get wordform objects from database
             # Note:
@@ -108,9 +123,12 @@ def fetch_results(search_run: core.SearchRun):
                         Result(synthetic_wordform, pronoun_as_is_match=True)
                     )
             else:
-                for lemma_wordform in matched_lemma_wordforms.filter(
-                    as_is=False, pos=word_class.pos.name
-                ):
+                for lemma_wordform in matched_lemma_wordforms:
+                    if (
+                        lemma_wordform.as_is
+                        or lemma_wordform.pos != word_class.pos.name
+                    ):
+                        continue
                     synthetic_wordform = Wordform(
                         lemma=lemma_wordform,
                         analysis=analysis,
@@ -122,16 +140,18 @@ def fetch_results(search_run: core.SearchRun):
                     )
 
     # we choose to trust CW and show those matches with definition from CW.
-    # text__in = all_standard_forms help match those lemmas that are labeled as_is but trust-worthy nonetheless
+    # all_standard_forms help match those lemmas that are labeled as_is but trust-worthy nonetheless
     # because they come from CW
-    # text__in = [user_query] help matching entries with spaces in it, which fst can't analyze.
-    for cw_as_is_wordform in filter_cw_wordforms(
-        Wordform.objects.filter(
-            text__in=all_standard_forms + [search_run.internal_query],
-            as_is=True,
-            is_lemma=True,
-        )
-    ):
+    # [user_query] help matching entries with spaces in it, which fst can't analyze.
+    cw_as_is_ids = sorted(
+        {
+            wordform_id
+            for text in all_standard_forms + [search_run.internal_query]
+            for wordform_id in lexicon.wordform_ids_with_text(text, is_lemma=True)
+            if lexicon.row(wordform_id).as_is and lexicon.has_cw_definition(wordform_id)
+        }
+    )
+    for cw_as_is_wordform in lexicon.wordforms(cw_as_is_ids):
         search_run.add_result(Result(cw_as_is_wordform, is_cw_as_is_wordform=True))
 
     # as per https://github.com/UAlbertaALTLab/cree-intelligent-dictionary/issues/161
@@ -149,37 +169,45 @@ def fetch_results(search_run: core.SearchRun):
     # todo: remind user "are you searching in cree/english?"
     # todo: allow inflected forms to be searched through English. (requires database migration
     #  since now EnglishKeywords are bound to lemmas)
-    for stemmed_keyword in stem_keywords(search_run.internal_query):
+    stemmed_keywords = stem_keywords(search_run.internal_query)
+    if not stemmed_keywords:
+        return
+
+    # Every keyword is looked up in a single query; the keywords are
+    # case-folded, so matching EnglishKeyword texts are case-folded too to
+    # emulate text__iexact.
+    lemma_ids_by_keyword: dict[str, set[int]] = defaultdict(set)
+    for keyword_text, lemma_id in EnglishKeyword.objects.filter(
+        reduce(
+            operator.or_,
+            (Q(text__iexact=keyword) for keyword in stemmed_keywords),
+        )
+    ).values_list("text", "lemma__id"):
+        lemma_ids_by_keyword[keyword_text.lower()].add(lemma_id)
 
-        lemma_ids = EnglishKeyword.objects.filter(text__iexact=stemmed_keyword).values(
-            "lemma__id"
+    wordforms_by_id = {
+        wf.id: wf
+        for wf in Wordform.objects.filter(
+            id__in=set(chain.from_iterable(lemma_ids_by_keyword.values()))
         )
+    }
+
+    for stemmed_keyword in stemmed_keywords:
+        lemma_ids = lemma_ids_by_keyword.get(stemmed_keyword.lower(), ())
+        matched_wordforms = [wordforms_by_id[wf_id] for wf_id in sorted(lemma_ids)]
 
-        for wordform in Wordform.objects.filter(id__in=lemma_ids):
+        for wordform in matched_wordforms:
             search_run.add_result(
                 Result(wordform, target_language_keyword_match=[stemmed_keyword])
             )
 
         # explained above, preverbs should be presented
-        for wordform in Wordform.objects.filter(
-            Q(pos="IPV") | Q(inflectional_category="IPV") | Q(pos="PRON"),
-            id__in=lemma_ids,
-            as_is=True,
-        ):
-            search_run.add_result(Result(wordform, is_preverb_match=True))
-
-
-def filter_cw_wordforms(queryset: Iterable[Wordform]) -> Iterable[Wordform]:
-    """
-    return the wordforms that has definition from CW dictionary
-
-    :param queryset: an Iterable of Wordforms
-    """
-    for wordform in queryset:
-        for definition in wordform.definitions.all():
-            if "CW" in definition.source_ids:
-                yield wordform
-                break
+        for wordform in matched_wordforms:
+            if wordform.as_is and (
+                wordform.pos in ("IPV", "PRON")
+                or wordform.inflectional_category == "IPV"
+            ):
+                search_run.add_result(Result(wordform, is_preverb_match=True))
 
 
 def fetch_preverbs(user_query: str) -> Set[Wordform]:
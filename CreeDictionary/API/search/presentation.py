@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Optional, TypedDict, Iterable, Any, cast
-
-from django.forms import model_to_dict
-
-from utils import get_modified_distance
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypedDict,
+    cast,
+)
+
+from utils.cree_lev_dist import ModifiedDistanceScorer
 from . import types, core, lookup
 from utils.fst_analysis_parser import partition_analysis
 from CreeDictionary.relabelling import LABELS
 from utils.types import FSTTag, Label, ConcatAnalysis
 from .types import Preverb, LinguisticTag, linguistic_tag_from_fst_tags
-from ..models import Wordform
+from ..models import Wordform, WordformKey
 from ..schema import SerializedWordform, SerializedDefinition, SerializedLinguisticTag
 
+# Results on the same page share analyses and word classes, and so do the searches
+# after them; remember the presentation of this many of each:
+MAX_PRESENTED_ANALYSES = 10_000
+
 
 class SerializedPresentationResult(TypedDict):
     lemma_wordform: SerializedWordform
@@ -43,23 +56,31 @@ class PresentationResult:
         self.is_lemma = result.is_lemma
         self.source_language_match = result.source_language_match
 
-        (
-            self.linguistic_breakdown_head,
-            self.linguistic_breakdown_tail,
-        ) = safe_partition_analysis(result.wordform.analysis)
+        self._analysis = present_analysis(result.wordform.analysis)
+        self.linguistic_breakdown_head = list(self._analysis.linguistic_breakdown_head)
+        self.linguistic_breakdown_tail = list(self._analysis.linguistic_breakdown_tail)
 
         self.preverbs = get_preverbs_from_head_breakdown(self.linguistic_breakdown_head)
 
-        self.friendly_linguistic_breakdown_head = replace_user_friendly_tags(
-            self.linguistic_breakdown_head
+        self.friendly_linguistic_breakdown_head = list(
+            self._analysis.friendly_linguistic_breakdown_head
         )
-        self.friendly_linguistic_breakdown_tail = replace_user_friendly_tags(
-            self.linguistic_breakdown_tail
+        self.friendly_linguistic_breakdown_tail = list(
+            self._analysis.friendly_linguistic_breakdown_tail
         )
 
-    def serialize(self) -> SerializedPresentationResult:
+    def serialize(
+        self,
+        wordform_serializer: Optional[Callable[[Wordform], SerializedWordform]] = None,
+    ) -> SerializedPresentationResult:
+        """
+        :param wordform_serializer: e.g., a WordformSerializer shared by all the
+            results of a response; serialize_wordform() by default
+        """
+        serialize = wordform_serializer or serialize_wordform
+
         ret: SerializedPresentationResult = {
-            "lemma_wordform": serialize_wordform(self.lemma_wordform),
+            "lemma_wordform": serialize(self.lemma_wordform),
             "wordform_text": self.wordform.text,
             "is_lemma": self.is_lemma,
             "definitions": serialize_definitions(
@@ -69,10 +90,10 @@ class PresentationResult:
                 # only place where a non-lemma search result appears.
                 include_auto_definitions=self._search_run.include_auto_definitions,
             ),
-            "preverbs": [serialize_wordform(pv) for pv in self.preverbs],
+            "preverbs": [serialize(pv) for pv in self.preverbs],
             "friendly_linguistic_breakdown_head": self.friendly_linguistic_breakdown_head,
             "friendly_linguistic_breakdown_tail": self.friendly_linguistic_breakdown_tail,
-            "relevant_tags": tuple(t.serialize() for t in self.relevant_tags),
+            "relevant_tags": self._analysis.serialized_relevant_tags,
         }
         if self._search_run.query.verbose:
             cast(Any, ret)["verbose_info"] = self._result
@@ -87,10 +108,7 @@ class PresentationResult:
         In itwêwina, these tags are derived from the suffix features exclusively.
         We chunk based on the English relabelleings!
         """
-        return tuple(
-            linguistic_tag_from_fst_tags(fst_tags)
-            for fst_tags in LABELS.english.chunk(self.linguistic_breakdown_tail)
-        )
+        return self._analysis.relevant_tags
 
     def __str__(self):
         return f"PresentationResult<{self.wordform}:{self.wordform.id}>"
@@ -102,21 +120,101 @@ def serialize_wordform(wordform) -> SerializedWordform:
 
     :return: json parsable result
     """
-    result = model_to_dict(wordform)
+    # Same as model_to_dict(wordform), without looking up the fields every time:
+    result: dict[str, Any] = {
+        name: getattr(wordform, attname) for name, attname in _WORDFORM_FIELDS
+    }
     result["definitions"] = serialize_definitions(wordform.definitions.all())
     result["lemma_url"] = wordform.get_absolute_url()
+    result.update(
+        present_word_class(
+            wordform.analysis, wordform.pos, wordform.inflectional_category
+        )
+    )
+    return cast(SerializedWordform, result)
+
+
+# The fields model_to_dict() serializes, as (key, attribute name) pairs; e.g., the
+# lemma foreign key is serialized as the lemma's ID:
+_WORDFORM_FIELDS = tuple(
+    (field.name, field.attname)
+    for field in Wordform._meta.concrete_fields
+    if field.editable
+)
+
+
+class WordformSerializer:
+    """
+    serialize_wordform(), for all the results of one response: results often share
+    their lemma or preverbs, which are then serialized only once.
 
-    # Displayed in the word class/inflection help:
-    result["inflectional_category_plain_english"] = LABELS.english.get(
-        wordform.inflectional_category
+    Wordforms serialized once are shared: treat them as read-only!
+    """
+
+    def __init__(self) -> None:
+        self._serialized: dict[WordformKey, SerializedWordform] = {}
+
+    def __call__(self, wordform: Wordform) -> SerializedWordform:
+        key = wordform.key
+        serialized = self._serialized.get(key)
+        if serialized is None:
+            serialized = self._serialized[key] = serialize_wordform(wordform)
+        return serialized
+
+
+class AnalysisPresentation(NamedTuple):
+    """
+    Everything about the presentation of a result that depends only on the
+    analysis of its wordform.
+    """
+
+    linguistic_breakdown_head: tuple[FSTTag, ...]
+    linguistic_breakdown_tail: tuple[FSTTag, ...]
+    friendly_linguistic_breakdown_head: tuple[Label, ...]
+    friendly_linguistic_breakdown_tail: tuple[Label, ...]
+    relevant_tags: tuple[LinguisticTag, ...]
+    serialized_relevant_tags: tuple[SerializedLinguisticTag, ...]
+
+
+@lru_cache(maxsize=MAX_PRESENTED_ANALYSES)
+def present_analysis(analysis: ConcatAnalysis) -> AnalysisPresentation:
+    head, tail = safe_partition_analysis(analysis)
+    relevant_tags = tuple(
+        linguistic_tag_from_fst_tags(fst_tags)
+        for fst_tags in LABELS.english.chunk(tail)
     )
-    result["inflectional_category_linguistic"] = LABELS.linguistic_long.get(
-        wordform.inflectional_category
+    return AnalysisPresentation(
+        linguistic_breakdown_head=tuple(head),
+        linguistic_breakdown_tail=tuple(tail),
+        friendly_linguistic_breakdown_head=tuple(replace_user_friendly_tags(head)),
+        friendly_linguistic_breakdown_tail=tuple(replace_user_friendly_tags(tail)),
+        relevant_tags=relevant_tags,
+        serialized_relevant_tags=tuple(tag.serialize() for tag in relevant_tags),
     )
-    result["wordclass_emoji"] = wordform.get_emoji_for_cree_wordclass()
-    result["wordclass"] = wordform.wordclass_text
 
-    return result
+
+@lru_cache(maxsize=MAX_PRESENTED_ANALYSES)
+def present_word_class(
+    analysis: str, pos: str, inflectional_category: str
+) -> dict[str, Optional[str]]:
+    """
+    The parts of serialize_wordform() that depend only on the word class of the
+    wordform, i.e., on these fields.
+    """
+    wordform = Wordform(
+        analysis=analysis, pos=pos, inflectional_category=inflectional_category
+    )
+    return {
+        # Displayed in the word class/inflection help:
+        "inflectional_category_plain_english": LABELS.english.get(
+            FSTTag(inflectional_category)
+        ),
+        "inflectional_category_linguistic": LABELS.linguistic_long.get(
+            FSTTag(inflectional_category)
+        ),
+        "wordclass_emoji": wordform.get_emoji_for_cree_wordclass(),
+        "wordclass": wordform.wordclass_text,
+    }
 
 
 def serialize_definitions(definitions, include_auto_definitions=False):
@@ -165,12 +263,10 @@ def get_preverbs_from_head_breakdown(
 
                 # find the one that looks the most similar
                 if preverb_results:
+                    scorer = ModifiedDistanceScorer(normative_preverb_text)
                     preverb_result = min(
                         preverb_results,
-                        key=lambda pr: get_modified_distance(
-                            normative_preverb_text,
-                            pr.text.strip("-"),
-                        ),
+                        key=lambda pr: scorer.distance_to(pr.text.strip("-")),
                     )
 
                 else:
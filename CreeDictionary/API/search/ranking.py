@@ -1,84 +1,51 @@
 from __future__ import annotations
 
-from functools import cmp_to_key, partial
-from typing import Callable, Any, cast
+from typing import Callable, Tuple
 
-from utils import get_modified_distance
+from utils.cree_lev_dist import ModifiedDistanceScorer
 from . import core
 from .types import Result
 from ..models import wordform_cache
 
+# Results sort in ascending order of this key:
+#  - source-language matches first, by their edit distance to the query, with
+#    lemmas before other wordforms of the same distance;
+#  - then target-language matches, those with a morpheme ranking first (by
+#    ranking), then the rest in the order they were found.
+SortKey = Tuple[int, float, float]
 
-def sort_search_result(
-    res_a: Result,
-    res_b: Result,
-    search_run: core.SearchRun,
-) -> float:
-    """
-    determine how we sort search results.
-
-    :return:   0: does not matter;
-              >0: res_a should appear after res_b;
-              <0: res_a should appear before res_b.
-    """
+_SOURCE_LANGUAGE_MATCH = 0
+_TARGET_LANGUAGE_MATCH = 1
 
-    if res_a.did_match_source_language and res_b.did_match_source_language:
-        # both from source
-        a_dis = get_modified_distance(search_run.internal_query, res_a.wordform.text)
-        b_dis = get_modified_distance(search_run.internal_query, res_b.wordform.text)
-        difference = a_dis - b_dis
-        if difference:
-            return difference
 
-        # Both results are EXACTLY the same form!
-        # Further disambiguate by checking if one is the lemma.
-        if res_a.is_lemma and res_b.is_lemma:
-            return 0
-        elif res_a.is_lemma:
-            return -1
-        elif res_b.is_lemma:
-            return 1
-        else:
-            # Somehow, both forms exactly match the user query and neither
-            # is a lemma?
-            return 0
-
-    # todo: better English sort
-    elif res_a.did_match_source_language:
-        # a from source, b from target
-        return -1
-    elif res_b.did_match_target_language:
-        # a from target, b from source
-        return 1
-    else:
-        # both from English
-        a_in_rankings = res_a.wordform.text in wordform_cache.MORPHEME_RANKINGS
-        b_in_rankings = res_b.wordform.text in wordform_cache.MORPHEME_RANKINGS
+def sort_by_user_query(search_run: core.SearchRun) -> Callable[[Result], SortKey]:
+    """
+    Returns a key function that sorts search results ranked by their distance
+    to the user query.
 
-        if a_in_rankings and not b_in_rankings:
-            return -1
-        elif not a_in_rankings and b_in_rankings:
-            return 1
-        elif not a_in_rankings and not b_in_rankings:
-            return 0
-        else:  # both in rankings
+    Each key is computed exactly once per result by list.sort(), so the
+    morpheme ranking is looked up once per result rather than once per
+    comparison. Source-language results come with their edit distance to the
+    query already; it's only computed here for results that don't have it.
+    """
+    scorer = ModifiedDistanceScorer(search_run.internal_query)
+    morpheme_rankings = wordform_cache.MORPHEME_RANKINGS
+
+    def sort_key(result: Result) -> SortKey:
+        if result.did_match_source_language:
+            distance = result.query_wordform_edit_distance
+            if distance is None:
+                distance = scorer.distance_to(result.wordform.text)
             return (
-                wordform_cache.MORPHEME_RANKINGS[res_a.wordform.text]
-                - wordform_cache.MORPHEME_RANKINGS[res_b.wordform.text]
+                _SOURCE_LANGUAGE_MATCH,
+                distance,
+                0 if result.is_lemma else 1,
             )
 
+        # todo: better English sort
+        ranking = morpheme_rankings.get(result.wordform.text)
+        if ranking is None:
+            return (_TARGET_LANGUAGE_MATCH, 1, 0)
+        return (_TARGET_LANGUAGE_MATCH, 0, ranking)
 
-def sort_by_user_query(search_run: core.SearchRun) -> Callable[[Any], Any]:
-    """
-    Returns a key function that sorts search results ranked by their distance
-    to the user query.
-    """
-    # mypy doesn't really know how to handle partial(), so we tell it the
-    # correct type with cast()
-    # See: https://github.com/python/mypy/issues/1484
-    return cmp_to_key(
-        cast(
-            Callable[[Any, Any], Any],
-            partial(sort_search_result, search_run=search_run),
-        )
-    )
+    return sort_key
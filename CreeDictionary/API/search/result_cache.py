@@ -0,0 +1,188 @@
+"""
+Caches whole serialized search responses.
+
+Popular queries are searched over and over, and every search repeats the FST
+analysis, the database lookups, ranking, and serialization. The cache keeps the
+serialized results of recent searches, keyed by the normalized query and the
+search options, and forgets everything when the dictionary is re-imported.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+from django.conf import settings
+
+from API.models import dictionary_version, wordform_cache
+from API.schema import SerializedSearchResult
+from . import affix
+from .query import Query
+from .runner import search
+from .util import first_non_none_value
+
+SerializedResults = list[SerializedSearchResult]
+
+
+class SearchCacheKey(NamedTuple):
+    query_string: str
+    include_affixes: bool
+    include_auto_definitions: bool
+    verbose: bool
+
+    @classmethod
+    def for_query(
+        cls, query: str, *, include_affixes: bool, include_auto_definitions: bool
+    ) -> SearchCacheKey:
+        """
+        The key for a search, after the same normalization that SearchRun applies,
+        so that e.g., "Nipāw" and "nipâw " share an entry.
+        """
+        parsed = Query(query)
+        return cls(
+            query_string=parsed.query_string,
+            include_affixes=include_affixes,
+            include_auto_definitions=bool(
+                first_non_none_value(
+                    parsed.auto, include_auto_definitions, default=False
+                )
+            ),
+            verbose=bool(parsed.verbose),
+        )
+
+
+class SearchResultCache:
+    """
+    A thread-safe LRU cache of serialized search results.
+
+    Entries are evicted, least recently used first, when there are more than
+    max_entries of them, or when they hold more than max_results results in
+    total, so that a few huge responses can't take over the cache.
+
+    Cached results are shared between requests: treat them as read-only!
+
+    :param on_dictionary_change: called when the dictionary turns out to have
+        changed since the last lookup, e.g., to forget other caches too
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_results: int,
+        on_dictionary_change: Optional[Callable[[], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_results = max_results
+        self.on_dictionary_change = on_dictionary_change
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[SearchCacheKey, SerializedResults] = OrderedDict()
+        self._total_results = 0
+        self._dictionary_version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get_or_search(
+        self, key: SearchCacheKey, perform_search: Callable[[], SerializedResults]
+    ) -> SerializedResults:
+        """
+        Returns the cached results for key, or calls perform_search() and caches
+        its results.
+        """
+        version = dictionary_version()
+
+        with self._lock:
+            if version != self._dictionary_version:
+                if self._dictionary_version is not None and self.on_dictionary_change:
+                    self.on_dictionary_change()
+                self._clear()
+                self._dictionary_version = version
+
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return results
+            self.misses += 1
+
+        # Search without holding the lock; if two threads race for the same key,
+        # both search, and the last one to finish wins.
+        results = perform_search()
+
+        with self._lock:
+            if version == self._dictionary_version:
+                self._store(key, results)
+        return results
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups so far that were answered from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: SearchCacheKey, results: SerializedResults) -> None:
+        if key in self._entries:
+            self._total_results -= len(self._entries.pop(key))
+        self._entries[key] = results
+        self._total_results += len(results)
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or self._total_results > self.max_results
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_results -= len(evicted)
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._total_results = 0
+
+
+def forget_loaded_dictionary() -> None:
+    """
+    Forgets everything that searches load from the dictionary once per process:
+    the lexicon index, the preverb lookup and the affix searchers.
+    """
+    wordform_cache.clear()
+    affix.cache.clear()
+
+
+search_result_cache = SearchResultCache(
+    max_entries=settings.SEARCH_RESULT_CACHE_MAX_ENTRIES,
+    max_results=settings.SEARCH_RESULT_CACHE_MAX_RESULTS,
+    # An incremental import changes the dictionary under running processes:
+    on_dictionary_change=forget_loaded_dictionary,
+)
+
+
+def cached_search(
+    query: str, *, include_affixes=True, include_auto_definitions=False
+) -> SerializedResults:
+    """
+    Like search_with_affixes() or simple_search(), but answered from the search
+    result cache when possible.
+    """
+    key = SearchCacheKey.for_query(
+        query,
+        include_affixes=include_affixes,
+        include_auto_definitions=include_auto_definitions,
+    )
+    return search_result_cache.get_or_search(
+        key,
+        lambda: search(
+            query=query,
+            include_affixes=include_affixes,
+            include_auto_definitions=include_auto_definitions,
+        ).serialized_presentation_results(),
+    )
@@ -1,5 +1,6 @@
 from API.search.affix import (
     do_source_language_affix_search,
+    do_source_language_fuzzy_search,
     do_target_language_affix_search,
     query_would_return_too_many_results,
 )
@@ -26,4 +27,8 @@ def search(*, query: str, include_affixes=True, include_auto_definitions=False):
         do_source_language_affix_search(search_run)
         do_target_language_affix_search(search_run)
 
+        if not search_run.unsorted_results():
+            # Nothing matched: maybe a misspelling the FST can't make sense of
+            do_source_language_fuzzy_search(search_run)
+
     return search_run
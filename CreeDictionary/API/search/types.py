@@ -154,9 +154,12 @@ class Result:
 
     #: What, if any, was the matching string?
     source_language_match: Optional[str] = None
+    #: get_modified_distance(query, wordform text); source-language results are
+    #: ranked by it
     query_wordform_edit_distance: Optional[float] = None
 
     source_language_affix_match: Optional[bool] = None
+    source_language_fuzzy_match: Optional[bool] = None
     target_language_affix_match: Optional[bool] = None
 
     target_language_keyword_match: list[str] = field(default_factory=list)
@@ -193,7 +196,9 @@ class Result:
     @property
     def did_match_source_language(self) -> bool:
         return bool(
-            self.source_language_match or self.source_language_affix_match is not None
+            self.source_language_match
+            or self.source_language_affix_match is not None
+            or self.source_language_fuzzy_match is not None
         )
 
     def __str__(self):
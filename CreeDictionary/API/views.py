@@ -1,8 +1,10 @@
+import orjson
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, Http404
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseBadRequest, Http404
 from django.shortcuts import render
 
-from .search import simple_search
+from .search import cached_search
 
 
 def click_in_text(request) -> HttpResponse:
@@ -17,15 +19,25 @@ def click_in_text(request) -> HttpResponse:
     elif q == "":
         return HttpResponseBadRequest("query param q is an empty string")
 
-    results = simple_search(q, include_auto_definitions=False)
+    results = cached_search(q, include_affixes=False, include_auto_definitions=False)
 
     response = {"results": results}
 
-    json_response = JsonResponse(response)
+    json_response = fast_json_response(response)
     json_response["Access-Control-Allow-Origin"] = "*"
     return json_response
 
 
+def fast_json_response(data) -> HttpResponse:
+    """
+    Like JsonResponse(data), but encoded with orjson, which is much faster.
+    """
+    return HttpResponse(
+        orjson.dumps(data, default=DjangoJSONEncoder().default),
+        content_type="application/json",
+    )
+
+
 def click_in_text_embedded_test(request):
     if not settings.DEBUG:
         raise Http404()
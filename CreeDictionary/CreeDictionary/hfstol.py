@@ -2,22 +2,154 @@
 
 """
 Run finite-state transducer analyzer and generator
+
+Lookups are memoized: popular queries, and the paradigms of popular words, are
+looked up over and over again, and the answers only change when the FSTs do.
 """
 
-from typing import Generator, Iterable, List, Tuple
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Dict,
+    Generator,
+    Generic,
+    Iterable,
+    List,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from hfst_optimized_lookup import TransducerFile
 
-from shared.expensive import relaxed_analyzer, strict_generator
+from shared import expensive
 from utils.data_classes import Analysis
 
+# How many distinct lookups each memoized transducer remembers
+ANALYSIS_CACHE_SIZE = 10_000
+# Paradigms generate hundreds of forms at a time, so remember more of these:
+GENERATION_CACHE_SIZE = 50_000
+
+T = TypeVar("T")
+
+
+class MemoizedTransducer(Generic[T]):
+    """
+    Wraps one of the transducers in shared.expensive, remembering the results of
+    the most recent lookups.
+
+    Like TransducerFile, it has lookup() and bulk_lookup(), so it can be used in
+    place of one. Results can be post-processed by ``parse``, in which case the
+    parsed results are what is remembered.
+    """
+
+    def __init__(
+        self,
+        transducer_name: str,
+        maxsize: int,
+        parse: Callable[[Iterable[str]], Iterable[T]] = iter,  # type: ignore
+    ):
+        self._transducer_name = transducer_name
+        self._parse = parse
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+
+        self._results: OrderedDict[str, Tuple[T, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def transducer(self) -> TransducerFile:
+        # Don't load the FST until the first lookup
+        return getattr(expensive, self._transducer_name)
+
+    def lookup(self, string: str) -> Tuple[T, ...]:
+        """
+        The (parsed) results of transducer.lookup(string), in the same order.
+        """
+        with self._lock:
+            results = self._results.get(string)
+            if results is not None:
+                self._results.move_to_end(string)
+                self.hits += 1
+                return results
+            self.misses += 1
+
+        results = tuple(self._parse(self.transducer.lookup(string)))
+
+        with self._lock:
+            self._results[string] = results
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return results
+
+    def lookup_many(self, strings: Iterable[str]) -> Dict[str, Tuple[T, ...]]:
+        """
+        Looks up every distinct string once.
+
+        :return: the results of lookup() for each string
+        """
+        return {string: self.lookup(string) for string in dict.fromkeys(strings)}
+
+    def bulk_lookup(self, strings: Iterable[str]) -> Dict[str, Set[T]]:
+        """
+        Same as transducer.bulk_lookup(strings).
+        """
+        return {
+            string: set(results)
+            for string, results in self.lookup_many(strings).items()
+        }
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups so far that did not need the transducer.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
 
 def analyze(wordform: str) -> Iterable[Analysis]:
-    return parse_analyses(relaxed_analyzer.lookup(wordform))
+    return relaxed_analyzer.lookup(wordform)
 
 
 def generate(analysis: str) -> Iterable[str]:
     return strict_generator.lookup(analysis)
 
 
+def analyze_many(wordforms: Iterable[str]) -> Dict[str, Tuple[Analysis, ...]]:
+    """
+    analyze() every distinct wordform.
+    """
+    return relaxed_analyzer.lookup_many(wordforms)
+
+
+def generate_many(analyses: Iterable[str]) -> Dict[str, Tuple[str, ...]]:
+    """
+    generate() every distinct analysis.
+    """
+    return strict_generator.lookup_many(analyses)
+
+
+def hit_rates() -> Dict[str, float]:
+    """
+    How often analyze() and generate() were answered without using the FST.
+    """
+    return {
+        "analyze": relaxed_analyzer.hit_rate,
+        "generate": strict_generator.hit_rate,
+    }
+
+
 def parse_analyses(raw_analyses: Iterable[str]) -> Generator[Analysis, None, None]:
     """
     Given a list of lines from xfst/hfst output from the Plains Cree FST,
@@ -59,3 +191,11 @@ def find_prefixes(parts: List[str]) -> Tuple[List[str], int]:
             # pos is now set to the position of the lemma.
             break
     return prefixes, pos
+
+
+relaxed_analyzer: MemoizedTransducer[Analysis] = MemoizedTransducer(
+    "relaxed_analyzer", ANALYSIS_CACHE_SIZE, parse=parse_analyses
+)
+strict_generator: MemoizedTransducer[str] = MemoizedTransducer(
+    "strict_generator", GENERATION_CACHE_SIZE
+)
@@ -0,0 +1,23 @@
+from API.models import MORPHEME_RANKINGS_FILE, read_morpheme_rankings
+from django.core.management.base import BaseCommand
+from utils.compiled_table import compile_table, compiled_path
+
+from CreeDictionary.paradigm.filler import CORPUS_FREQUENCY_FILE, read_frequency
+
+
+class Command(BaseCommand):
+    help = """Compile the frequency files in res/ into tables that every process
+    can memory-map, instead of each parsing them into a dict.
+
+    The tables are also compiled on first use, when they're missing or out of
+    date; run this when building a deployment, so that no server process has to.
+    """
+
+    def handle(self, *args, **options):
+        for source, parse, typecode in [
+            (CORPUS_FREQUENCY_FILE, read_frequency, "i"),
+            (MORPHEME_RANKINGS_FILE, read_morpheme_rankings, "d"),
+        ]:
+            compiled = compiled_path(source)
+            compile_table(parse(source), compiled, typecode)
+            self.stdout.write(f"Compiled {source.name} to {compiled}")
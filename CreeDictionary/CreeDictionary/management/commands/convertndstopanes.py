@@ -16,7 +16,6 @@ from django.core.management import BaseCommand
 from utils import ParadigmSize
 
 from CreeDictionary.paradigm.filler import EmptyRow, TitleRow
-from CreeDictionary.paradigm.generation import paradigm_filler
 from CreeDictionary.paradigm.panes import (
     Cell,
     ColumnLabel,
@@ -29,6 +28,7 @@ from CreeDictionary.paradigm.panes import (
     ParadigmLayout,
     RowLabel,
 )
+from CreeDictionary.paradigm.service import default_paradigm_service
 from CreeDictionary.relabelling import LABELS
 
 
@@ -40,7 +40,7 @@ class Command(BaseCommand):
         )
 
     def handle(self, *, outdir: Path, force=False, **options):
-        existing_paradigms = paradigm_filler()
+        existing_paradigms = default_paradigm_service().filler
         english_templates = snoop_all_plain_english_templates(existing_paradigms)
         self.label_to_tags = snoop_unambiguous_plain_english_tags()
 
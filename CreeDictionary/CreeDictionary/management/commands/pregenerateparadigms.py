@@ -0,0 +1,126 @@
+import os
+from argparse import ArgumentParser
+from multiprocessing import Pool
+from time import perf_counter
+from typing import Optional
+
+from django.core.management.base import BaseCommand
+from more_itertools import chunked
+from utils import ParadigmSize, WordClass
+from utils.fst_analysis_parser import extract_word_class
+
+from CreeDictionary.paradigm.cache import (
+    LAYOUT_DIR,
+    STRICT_GENERATOR_PATH,
+    Inflections,
+    ParadigmKey,
+)
+from CreeDictionary.paradigm.filler import ParadigmFiller
+
+
+class Command(BaseCommand):
+    help = """Generate the paradigm of every lemma, in every size, into the paradigm
+    cache, so that word pages never have to wait for the FST.
+
+    Paradigms already in the cache are skipped, so an interrupted run picks up
+    where it left off. Static paradigms (e.g., pronouns) are not included, since
+    they are the same for every lemma.
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=os.cpu_count(),
+            help="how many worker processes to generate paradigms with",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50,
+            help="how many paradigms each worker generates at a time",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="first delete the paradigms generated with other versions of the "
+            "FST or the layouts; only once no server uses them anymore",
+        )
+
+    def handle(self, *args, jobs: int, chunk_size: int, prune: bool, **options):
+        # Imported here, rather than at the top, so that worker processes that
+        # import this module don't need Django's models to be ready.
+        from API.models import Wordform
+        from CreeDictionary.paradigm.service import default_paradigm_service
+
+        service = default_paradigm_service()
+        paradigm_cache = service.filler.cache
+        assert paradigm_cache is not None and paradigm_cache.store is not None
+        store = paradigm_cache.store
+        if prune:
+            deleted = service.prune_cache()
+            self.stdout.write(f"Deleted {deleted} outdated paradigms.")
+
+        keys = set()
+        lemmas = Wordform.objects.filter(is_lemma=True).values_list("text", "analysis")
+        for text, analysis in lemmas.iterator():
+            word_class = extract_word_class(analysis)
+            if word_class is None or not word_class.has_inflections():
+                continue
+            for size in ParadigmSize:
+                keys.add(ParadigmKey(text, word_class.value, size.value))
+
+        todo = sorted(keys - store.keys())
+        self.stdout.write(
+            f"{len(keys)} paradigms; {len(keys) - len(todo)} already generated."
+        )
+        if not todo:
+            return
+
+        start = perf_counter()
+        done = 0
+        with Pool(jobs, initializer=_start_worker) as pool:
+            for results in pool.imap_unordered(
+                _generate_paradigms, chunked(todo, chunk_size)
+            ):
+                store.put_many(results)
+                done += len(results)
+                elapsed = perf_counter() - start
+                self.stdout.write(
+                    f"{done}/{len(todo)} paradigms, "
+                    f"{done / elapsed:.1f} paradigms/s",
+                    ending="\r",
+                )
+
+        elapsed = perf_counter() - start
+        self.stdout.write(
+            f"\nGenerated {done} paradigms in {elapsed:.1f}s "
+            f"({done / elapsed:.1f} paradigms/s with {jobs} jobs)."
+        )
+
+
+_worker_filler: Optional[ParadigmFiller] = None
+
+
+def _start_worker():
+    """
+    Each worker process gets its own filler, with its own TransducerFile.
+    """
+    global _worker_filler
+    _worker_filler = ParadigmFiller(LAYOUT_DIR, STRICT_GENERATOR_PATH)
+
+
+def _generate_paradigms(
+    keys: list[ParadigmKey],
+) -> list[tuple[ParadigmKey, Inflections]]:
+    assert _worker_filler is not None
+    return [
+        (
+            key,
+            _worker_filler.generate_inflections(
+                key.lemma, WordClass(key.word_class), ParadigmSize(key.size)
+            ),
+        )
+        for key in keys
+    ]
@@ -0,0 +1,35 @@
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from CreeDictionary.paradigm.service import default_paradigm_service
+
+
+class Command(BaseCommand):
+    help = """Generate the most visited paradigms into the paradigm cache.
+
+    Run this after updating the FST or the paradigm layouts, which leaves the
+    cache without any paradigm of the new version, so that visitors to popular
+    words don't have to wait for the FST.
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=1000,
+            help="how many of the most visited paradigms to generate",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="first delete the paradigms generated with other versions of the "
+            "FST or the layouts; only once no server uses them anymore",
+        )
+
+    def handle(self, *args, top: int, prune: bool, **options):
+        service = default_paradigm_service()
+        if prune:
+            self.stdout.write(f"Deleted {service.prune_cache()} outdated paradigms.")
+        generated = service.warm_up(most_visited=top)
+        self.stdout.write(f"Generated {generated} paradigms.")
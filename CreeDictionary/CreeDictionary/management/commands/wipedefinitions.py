@@ -3,7 +3,13 @@ from argparse import ArgumentParser
 from django.core.management.base import BaseCommand
 from django.db import connection
 
-from API.models import Definition, DictionarySource, EnglishKeyword, Wordform
+from API.models import (
+    Definition,
+    DictionarySource,
+    EnglishKeyword,
+    ImportedEntry,
+    Wordform,
+)
 
 
 class Command(BaseCommand):
@@ -27,6 +33,7 @@ class Command(BaseCommand):
             EnglishKeyword,
             Definition.citations.through,
             Definition,
+            ImportedEntry,
             Wordform,
             DictionarySource,
         ]:
@@ -0,0 +1,443 @@
+"""
+Caches the inflections generated to fill paradigm tables.
+
+Filling a paradigm runs every analysis in its layout through the generator FST,
+but the result only depends on the lemma, the layout, and the FST. So the most
+recently filled paradigms are kept in memory, in front of an SQLite database,
+shared by all server processes, that keeps every paradigm ever filled.
+
+Everything in the database is stamped with a version computed from the contents
+of the FST and of the layout files: when either one changes, the paradigms
+generated with the old ones are no longer used, and can be pruned once no
+server uses the old ones either (see ParadigmStore.prune_other_versions()). How
+often each paradigm is visited is kept across versions, so that the most
+visited ones can be generated again ahead of time (see the warmparadigmcache
+management command), or all of them at once (see the pregenerateparadigms
+management command).
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from functools import cache
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from utils import shared_res_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever what is stored for a paradigm changes meaning:
+PARADIGM_CACHE_FORMAT = 1
+
+STRICT_GENERATOR_PATH = shared_res_dir / "fst" / "crk-strict-generator.hfstol"
+LAYOUT_DIR = shared_res_dir / "layouts"
+
+# Visit counts are written to the database in batches of this many visits
+VISIT_FLUSH_INTERVAL = 100
+
+# The inflections of every inflection cell of a layout, in layout order, with
+# multiple forms of one analysis joined by " / ".
+Inflections = Tuple[str, ...]
+
+
+class ParadigmKey(NamedTuple):
+    lemma: str
+    word_class: str  # WordClass.value
+    size: str  # ParadigmSize.value
+
+
+def compute_version(fst_path: Path, layout_dir: Path) -> str:
+    """
+    A digest of everything that determines the inflections of a paradigm.
+    """
+    digest = hashlib.sha256(f"format {PARADIGM_CACHE_FORMAT}\n".encode("UTF-8"))
+    with fst_path.open("rb") as fst_file:
+        for chunk in iter(lambda: fst_file.read(1 << 20), b""):
+            digest.update(chunk)
+    for layout_file in sorted(layout_dir.rglob("*.tsv")):
+        digest.update(layout_file.relative_to(layout_dir).as_posix().encode("UTF-8"))
+        digest.update(layout_file.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ParadigmStore:
+    """
+    Paradigms in an SQLite database that many processes can share.
+
+    The database is only a cache: if it can't be read or written, that's logged
+    and the paradigm is generated again.
+    """
+
+    def __init__(self, path: Path, version: str):
+        self.path = path
+        self.version = version
+        self._local = threading.local()
+
+    def get(self, key: ParadigmKey) -> Optional[Inflections]:
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT inflections FROM paradigm "
+                    "WHERE version = ? AND lemma = ? AND word_class = ? AND size = ?",
+                    (self.version, *key),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error:
+            logger.exception("cannot read from the paradigm cache")
+            return None
+        return None if row is None else tuple(json.loads(row[0]))
+
+    def put(self, key: ParadigmKey, inflections: Inflections) -> None:
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO paradigm VALUES (?, ?, ?, ?, ?)",
+                    (self.version, *key, json.dumps(inflections, ensure_ascii=False)),
+                )
+        except sqlite3.Error:
+            logger.exception("cannot write to the paradigm cache")
+
+    def put_many(self, items: Iterable[tuple[ParadigmKey, Inflections]]) -> None:
+        """
+        Stores many paradigms in one transaction.
+        """
+        try:
+            with self._connection() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO paradigm VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            self.version,
+                            *key,
+                            json.dumps(inflections, ensure_ascii=False),
+                        )
+                        for key, inflections in items
+                    ],
+                )
+        except sqlite3.Error:
+            logger.exception("cannot write to the paradigm cache")
+
+    def keys(self) -> set[ParadigmKey]:
+        """
+        Every paradigm stored for the current version.
+        """
+        try:
+            rows = self._connection().execute(
+                "SELECT lemma, word_class, size FROM paradigm WHERE version = ?",
+                (self.version,),
+            )
+            return {ParadigmKey(*row) for row in rows}
+        except sqlite3.Error:
+            logger.exception("cannot read from the paradigm cache")
+            return set()
+
+    def prune_other_versions(self) -> int:
+        """
+        Deletes the paradigms of every other version. Processes that still use
+        another version (e.g., servers that have yet to be updated) will have to
+        generate their paradigms again.
+
+        :return: how many paradigms were deleted
+        """
+        try:
+            with self._connection() as connection:
+                return connection.execute(
+                    "DELETE FROM paradigm WHERE version != ?", (self.version,)
+                ).rowcount
+        except sqlite3.Error:
+            logger.exception("cannot write to the paradigm cache")
+            return 0
+
+    def add_visits(self, visits: dict[ParadigmKey, int]) -> None:
+        try:
+            with self._connection() as connection:
+                connection.executemany(
+                    "INSERT INTO visit VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (lemma, word_class, size) "
+                    "DO UPDATE SET count = count + excluded.count",
+                    [(*key, count) for key, count in visits.items()],
+                )
+        except sqlite3.Error:
+            logger.exception("cannot write to the paradigm cache")
+
+    def most_visited(self, limit: int) -> list[ParadigmKey]:
+        try:
+            rows = self._connection().execute(
+                "SELECT lemma, word_class, size FROM visit ORDER BY count DESC LIMIT ?",
+                (limit,),
+            )
+            return [ParadigmKey(*row) for row in rows]
+        except sqlite3.Error:
+            logger.exception("cannot read from the paradigm cache")
+            return []
+
+    def __contains__(self, key: ParadigmKey) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        try:
+            (count,) = (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*) FROM paradigm WHERE version = ?", (self.version,)
+                )
+                .fetchone()
+            )
+        except sqlite3.Error:
+            logger.exception("cannot read from the paradigm cache")
+            return 0
+        return count
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        sqlite3 connections can't be shared between threads, so each thread
+        gets its own.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            # Let readers in other processes carry on while one process writes:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS paradigm (
+                    version TEXT,
+                    lemma TEXT,
+                    word_class TEXT,
+                    size TEXT,
+                    inflections TEXT,
+                    PRIMARY KEY (version, lemma, word_class, size)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS visit (
+                    lemma TEXT,
+                    word_class TEXT,
+                    size TEXT,
+                    count INTEGER,
+                    PRIMARY KEY (lemma, word_class, size)
+                ) WITHOUT ROWID;
+                """)
+            self._local.connection = connection
+        return connection
+
+
+class ParadigmCache:
+    """
+    A thread-safe LRU cache of paradigm inflections, optionally backed by a
+    ParadigmStore.
+    """
+
+    def __init__(self, maxsize: int, store: Optional[ParadigmStore] = None):
+        self.maxsize = maxsize
+        self.store = store
+
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[ParadigmKey, Inflections] = OrderedDict()
+        self._visits: Counter[ParadigmKey] = Counter()
+        self._pending_visits = 0
+        self._lock = threading.Lock()
+
+    def get_or_generate(
+        self, key: ParadigmKey, generate: Callable[[], Inflections]
+    ) -> Inflections:
+        """
+        Returns the inflections for key from memory, or else from the store, or
+        else calls generate() and remembers its result in both.
+        """
+        return self.get_or_generate_many([key], lambda _keys: {key: generate()})[key]
+
+    def get_or_generate_many(
+        self,
+        keys: Iterable[ParadigmKey],
+        generate_many: Callable[[list[ParadigmKey]], dict[ParadigmKey, Inflections]],
+    ) -> dict[ParadigmKey, Inflections]:
+        """
+        Like get_or_generate() for many keys, but everything that is neither in
+        memory nor in the store is generated with a single call to
+        generate_many(missing_keys).
+        """
+        found: dict[ParadigmKey, Inflections] = {}
+        not_in_memory: list[ParadigmKey] = []
+        visits_to_flush = None
+
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                visits_to_flush = self._record_visit(key) or visits_to_flush
+                inflections = self._entries.get(key)
+                if inflections is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    found[key] = inflections
+                else:
+                    not_in_memory.append(key)
+
+        if visits_to_flush and self.store is not None:
+            self.store.add_visits(visits_to_flush)
+        if not not_in_memory:
+            return found
+
+        missing: list[ParadigmKey] = []
+        from_elsewhere: dict[ParadigmKey, Inflections] = {}
+        for key in not_in_memory:
+            inflections = self.store.get(key) if self.store is not None else None
+            if inflections is not None:
+                self.store_hits += 1
+                from_elsewhere[key] = inflections
+            else:
+                self.misses += 1
+                missing.append(key)
+
+        if missing:
+            generated = generate_many(missing)
+            if self.store is not None:
+                self.store.put_many((key, generated[key]) for key in missing)
+            from_elsewhere.update((key, generated[key]) for key in missing)
+
+        self._remember(from_elsewhere.items())
+        found.update(from_elsewhere)
+        return found
+
+    def get(self, key: ParadigmKey) -> Optional[Inflections]:
+        """
+        Returns the inflections for key from memory, or else from the store, or
+        None when they have yet to be generated; see put().
+        """
+        with self._lock:
+            visits_to_flush = self._record_visit(key)
+            inflections = self._entries.get(key)
+            if inflections is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if visits_to_flush and self.store is not None:
+            self.store.add_visits(visits_to_flush)
+        if inflections is not None:
+            return inflections
+
+        inflections = self.store.get(key) if self.store is not None else None
+        if inflections is None:
+            self.misses += 1
+            return None
+
+        self.store_hits += 1
+        self._remember([(key, inflections)])
+        return inflections
+
+    def put(self, key: ParadigmKey, inflections: Inflections) -> None:
+        """
+        Remembers inflections that were generated after get() came up empty.
+        """
+        if self.store is not None:
+            self.store.put(key, inflections)
+        self._remember([(key, inflections)])
+
+    def precompute(
+        self,
+        keys: Iterable[ParadigmKey],
+        generate: Callable[[ParadigmKey], Inflections],
+    ) -> int:
+        """
+        Generates the paradigms that the store doesn't have yet.
+
+        :return: how many paradigms were generated
+        """
+        if self.store is None:
+            return 0
+
+        generated = 0
+        for key in keys:
+            if key not in self.store:
+                self.store.put(key, generate(key))
+                generated += 1
+        return generated
+
+    def precompute_most_visited(
+        self, limit: int, generate: Callable[[ParadigmKey], Inflections]
+    ) -> int:
+        """
+        Generates the limit most visited paradigms, if the store doesn't have them.
+
+        :return: how many paradigms were generated
+        """
+        if self.store is None:
+            return 0
+        self.flush_visits()
+        return self.precompute(self.store.most_visited(limit), generate)
+
+    def flush_visits(self) -> None:
+        with self._lock:
+            visits = self._take_visits()
+        if visits and self.store is not None:
+            self.store.add_visits(visits)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups so far that did not need the FST.
+        """
+        lookups = self.hits + self.store_hits + self.misses
+        return (self.hits + self.store_hits) / lookups if lookups else 0.0
+
+    def cache_clear(self) -> None:
+        """
+        Forgets the paradigms in memory; the store is left alone.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, items: Iterable[tuple[ParadigmKey, Inflections]]) -> None:
+        with self._lock:
+            for key, inflections in items:
+                self._entries[key] = inflections
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _record_visit(self, key: ParadigmKey) -> Optional[dict[ParadigmKey, int]]:
+        """
+        Counts a visit; returns the visits counted so far once there are enough of
+        them to be worth writing to the store. Call with the lock held.
+        """
+        self._visits[key] += 1
+        self._pending_visits += 1
+        if self._pending_visits < VISIT_FLUSH_INTERVAL:
+            return None
+        return self._take_visits()
+
+    def _take_visits(self) -> dict[ParadigmKey, int]:
+        visits = dict(self._visits)
+        self._visits.clear()
+        self._pending_visits = 0
+        return visits
+
+
+@cache
+def default_paradigm_cache() -> ParadigmCache:
+    """
+    The paradigm cache for the paradigms filled from the res (resource) directory.
+    """
+    paradigm_cache = ParadigmCache(
+        maxsize=settings.PARADIGM_CACHE_MAX_ENTRIES,
+        store=ParadigmStore(
+            settings.PARADIGM_CACHE_PATH,
+            compute_version(STRICT_GENERATOR_PATH, LAYOUT_DIR),
+        ),
+    )
+    # Don't lose the visits counted since the last flush:
+    atexit.register(paradigm_cache.flush_visits)
+    return paradigm_cache
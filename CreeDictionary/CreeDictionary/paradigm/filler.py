@@ -5,16 +5,31 @@ Fill a paradigm table with the inflections of a lemma.
 """
 
 import logging
-from copy import deepcopy
 from pathlib import Path
 from string import Template
-from typing import Iterable, Literal, Optional, Sequence, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
 
 from attr import attrib, attrs
 from hfst_optimized_lookup import TransducerFile
 from utils import ParadigmSize, WordClass, shared_res_dir
+from utils.compiled_table import load_table
 from utils.types import ConcatAnalysis
 
+from .cache import Inflections, ParadigmCache, ParadigmKey, default_paradigm_cache
+
+if TYPE_CHECKING:
+    from CreeDictionary.hfstol import MemoizedTransducer
+
 logger = logging.getLogger(__name__)
 
 PARADIGM_NAME_TO_WC = {
@@ -42,20 +57,32 @@ LayoutID = tuple[WordClass, ParadigmSize]
 
 
 class ParadigmFiller:
-    def __init__(self, layout_dir: Path, generator_hfstol_path: Path = None):
+    def __init__(
+        self,
+        layout_dir: Path,
+        generator_hfstol_path: Path = None,
+        cache: Optional[ParadigmCache] = None,
+    ):
         """
         Combine .layout, .layout.csv, .paradigm files to paradigm tables of different
         sizes and store them in memory.
 
         :param layout_dir: the directory for .layout and .layout.cvs files
+        :param cache: where to keep the inflections of filled paradigms, if anywhere
         """
         self._layout_tables = self._import_layouts(layout_dir)
+        self._compiled_layouts = {
+            layout_id: CompiledLayout(layout)
+            for layout_id, layout in self._layout_tables.items()
+        }
         self._frequency = import_frequency()
+        self.cache = cache
 
+        self._generator: Union[TransducerFile, MemoizedTransducer[str]]
         if generator_hfstol_path is None:
-            from shared import expensive
+            from CreeDictionary import hfstol
 
-            self._generator = expensive.strict_generator
+            self._generator = hfstol.strict_generator
         else:
             self._generator = TransducerFile(generator_hfstol_path)
 
@@ -65,7 +92,9 @@ class ParadigmFiller:
         Return a filler that uses .layout files, .paradigm files and the fst from the
         res (resources) folder.
         """
-        return ParadigmFiller(shared_res_dir / "layouts")
+        return ParadigmFiller(
+            shared_res_dir / "layouts", cache=default_paradigm_cache()
+        )
 
     def fill_paradigm(
         self, lemma: str, category: WordClass, paradigm_size: ParadigmSize
@@ -75,58 +104,112 @@ class ParadigmFiller:
 
         :returns: filled paradigm tables
         """
+        return self.fill_paradigms([(lemma, category, paradigm_size)])[0]
 
-        if not category.has_inflections():
-            return []
-
-        # We want to lookup all of the inflections in bulk,
-        # so set up some data structures that will allow us to:
-        #  - store all unique things to lookup
-        #  - remember which strings need to be replaced after lookups
-        lookup_strings: list[ConcatAnalysis] = []
-        string_locations: list[tuple[list[Cell], int]] = []
-
-        layout_table = deepcopy(self._layout_tables[(category, paradigm_size)])
+    def fill_paradigms(
+        self, requests: Sequence[tuple[str, WordClass, ParadigmSize]]
+    ) -> list[list[Layout]]:
+        """
+        Same as calling fill_paradigm(lemma, category, paradigm_size) for each
+        request, but all the inflections that aren't cached are generated with one
+        lookup.
+        """
+        keys = [
+            ParadigmKey(lemma, category.value, paradigm_size.value)
+            for lemma, category, paradigm_size in requests
+            if category.has_inflections()
+        ]
+        if self.cache is None:
+            inflections = self._generate_many(keys)
+        else:
+            inflections = self.cache.get_or_generate_many(keys, self._generate_many)
 
-        tables: list[Layout] = [[]]
+        filled: list[list[Layout]] = []
+        for lemma, category, paradigm_size in requests:
+            if not category.has_inflections():
+                filled.append([])
+                continue
+            key = ParadigmKey(lemma, category.value, paradigm_size.value)
+            layout = self._compiled_layouts[(category, paradigm_size)]
+            frequencies = [
+                self._frequency.get(analysis, 0)
+                for analysis in layout.concat_analyses(lemma)
+            ]
+            filled.append(layout.fill(inflections[key], frequencies))
+        return filled
+
+    def iter_paradigm(
+        self, lemma: str, category: WordClass, paradigm_size: ParadigmSize
+    ) -> Iterator[Layout]:
+        """
+        Same tables as fill_paradigm(), but one at a time: when the inflections
+        aren't cached, each table is generated right before it is yielded, so that
+        the first table can be shown before the FST gets to the last one.
+        """
+        if not category.has_inflections():
+            return
+
+        key = ParadigmKey(lemma, category.value, paradigm_size.value)
+        layout = self._compiled_layouts[(category, paradigm_size)]
+        analyses = layout.concat_analyses(lemma)
+        frequencies = [self._frequency.get(analysis, 0) for analysis in analyses]
+
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            yield from layout.fill(cached, frequencies)
+            return
+
+        inflections = [""] * len(analyses)
+        for index, slots in enumerate(layout.pane_slots):
+            pane_analyses = analyses[slots.start : slots.stop]
+            results = self._generator.bulk_lookup(pane_analyses)
+            for slot, analysis in zip(slots, pane_analyses):
+                inflections[slot] = " / ".join(sorted(results[analysis]))
+            yield layout.fill_pane(index, inflections, frequencies)
+
+        if self.cache is not None:
+            self.cache.put(key, tuple(inflections))
+
+    def generate_inflections(
+        self, lemma: str, category: WordClass, paradigm_size: ParadigmSize
+    ) -> Inflections:
+        """
+        Runs every inflection cell of a layout through the generator.
 
-        for row in layout_table:
-            if row is EmptyRow:
-                # Create a new "pane"
-                tables.append([])
-            elif isinstance(row, TitleRow):
-                tables[-1].append(row)
-            else:
-                assert isinstance(row, list)
-                row_with_replacements = row.copy()
-                tables[-1].append(row_with_replacements)
-                for col_ind, cell in enumerate(row):
-                    if isinstance(cell, StaticCell) or cell == "":
-                        # We do nothing to static and empty cells.
-                        continue
-                    elif isinstance(cell, InflectionCell):
-                        if cell.has_analysis:
+        :return: the inflection of each inflection cell, in layout order; multiple
+                 forms are joined with " / ".
+        """
+        key = ParadigmKey(lemma, category.value, paradigm_size.value)
+        return self._generate_many([key])[key]
 
-                            lookup_strings.append(cell.create_concat_analysis(lemma))
-                            string_locations.append((row_with_replacements, col_ind))
-                    else:
-                        raise ValueError("Unexpected Cell Type")
+    def _generate_many(
+        self, keys: Iterable[ParadigmKey]
+    ) -> dict[ParadigmKey, Inflections]:
+        """
+        generate_inflections() for many paradigms, with a single bulk lookup.
+        """
+        lookup_strings = {
+            key: self._compiled_layouts[
+                (WordClass(key.word_class), ParadigmSize(key.size))
+            ].concat_analyses(key.lemma)
+            for key in keys
+        }
 
         # Generate ALL OF THE INFLECTIONS!
-        results = self._generator.bulk_lookup(lookup_strings)
-
-        # string_locations and lookup_strings have parallel indices.
-        assert len(string_locations) == len(lookup_strings)
-        for location, analysis in zip(string_locations, lookup_strings):
-            row, col_ind = location
-            results_for_cell = sorted(results[analysis])
-            # TODO: this should actually produce TWO rows!
-            inflection_cell = row[col_ind]
-            assert isinstance(inflection_cell, InflectionCell)
-            inflection_cell.inflection = " / ".join(results_for_cell)
-            inflection_cell.frequency = self._frequency.get(analysis, 0)
+        results = self._generator.bulk_lookup(
+            list(
+                dict.fromkeys(
+                    analysis
+                    for analyses in lookup_strings.values()
+                    for analysis in analyses
+                )
+            )
+        )
 
-        return tables
+        return {
+            key: tuple(" / ".join(sorted(results[analysis])) for analysis in analyses)
+            for key, analyses in lookup_strings.items()
+        }
 
     def inflect_all_with_analyses(
         self, lemma: str, wordclass: WordClass
@@ -153,31 +236,8 @@ class ParadigmFiller:
         Given a lemma and its word class, return a set of all analyses that we could
         generate, but do not actually generate anything!
         """
-        # I just copy-pasted the code from fill_paradigm() and edited it.
-        # I'm sure we could refactor using the Template Method pattern or even Visitor
-        # pattern to reduce code duplication, but I honestly think it's not worth it in
-        # this situation.
-        layout_table = self._layout_tables[(wordclass, ParadigmSize.LINGUISTIC)]
-
-        # Find all of the analyses strings in the table:
-        analyses: set[ConcatAnalysis] = set()
-        for row in layout_table:
-            if row is EmptyRow or isinstance(row, TitleRow):
-                continue
-
-            assert isinstance(row, list)
-            for cell in row:
-                if isinstance(cell, StaticCell) or cell == "":
-                    continue
-                elif isinstance(cell, InflectionCell):
-                    if not cell.has_analysis:
-                        continue
-                    analysis = cell.create_concat_analysis(lemma)
-                    analyses.add(analysis)
-                else:
-                    raise ValueError("Unexpected cell type")
-
-        return analyses
+        layout = self._compiled_layouts[(wordclass, ParadigmSize.LINGUISTIC)]
+        return set(layout.concat_analyses(lemma))
 
     @staticmethod
     def _import_layouts(layout_dir) -> dict[LayoutID, Layout]:
@@ -343,20 +403,164 @@ class InflectionCell:
 
 
 Cell = Union[InflectionCell, StaticCell, Literal[""]]
-Row = Union[list[Cell], EmptyRowType, TitleRow]
+# Filled paradigms have FilledRows instead of lists of cells:
+Row = Union[list[Cell], "FilledRow", EmptyRowType, TitleRow]
 # TODO: Make a class for a list of rows (a Pane)
 Layout = list[Row]
 
 
+############################### Compiled layout classes ################################
+
+
+class CompiledLayout:
+    """
+    A layout, prepared once so that it can be filled over and over without copying it.
+
+    The inflection cells with an analysis are numbered in layout order; these
+    numbers are the "slots" that filling the layout takes inflections for. The
+    rows of the layout are shared by every paradigm filled from it, and are
+    never modified.
+    """
+
+    def __init__(self, layout: Layout):
+        self.analysis_templates: tuple[Template, ...]
+
+        templates: list[Template] = []
+        panes: list[list[Union[Row, tuple[list[Cell], dict[int, int]]]]] = [[]]
+        pane_starts = [0]
+
+        for row in layout:
+            if row is EmptyRow:
+                panes.append([])
+                pane_starts.append(len(templates))
+            elif isinstance(row, TitleRow):
+                panes[-1].append(row)
+            else:
+                assert isinstance(row, list)
+                slots: dict[int, int] = {}
+                for col_ind, cell in enumerate(row):
+                    if isinstance(cell, StaticCell) or cell == "":
+                        continue
+                    elif isinstance(cell, InflectionCell):
+                        if cell.has_analysis:
+                            assert cell.analysis is not None
+                            slots[col_ind] = len(templates)
+                            templates.append(cell.analysis)
+                    else:
+                        raise ValueError("Unexpected Cell Type")
+                # Rows without any inflections are used as-is:
+                panes[-1].append((row, slots) if slots else row)
+
+        self.analysis_templates = tuple(templates)
+        self._panes = panes
+        # Slots are numbered in layout order, so each pane has a contiguous range:
+        self.pane_slots = [
+            range(start, stop)
+            for start, stop in zip(pane_starts, pane_starts[1:] + [len(templates)])
+        ]
+
+    def concat_analyses(self, lemma: str) -> list[ConcatAnalysis]:
+        """
+        The analysis of every slot, for the given lemma.
+        """
+        return [
+            ConcatAnalysis(template.substitute(lemma=lemma))
+            for template in self.analysis_templates
+        ]
+
+    def fill(
+        self, inflections: Sequence[str], frequencies: Sequence[int]
+    ) -> list[Layout]:
+        """
+        :param inflections: the inflection of every slot
+        :param frequencies: the corpus frequency of every slot
+        :return: the filled tables, one per pane
+        """
+        assert len(inflections) == len(frequencies) == len(self.analysis_templates)
+        return [
+            self.fill_pane(index, inflections, frequencies)
+            for index in range(len(self._panes))
+        ]
+
+    def fill_pane(
+        self, index: int, inflections: Sequence[str], frequencies: Sequence[int]
+    ) -> Layout:
+        """
+        Fills a single pane; only the slots in self.pane_slots[index] are read.
+        """
+        return [
+            (
+                FilledRow(row[0], row[1], inflections, frequencies)
+                if isinstance(row, tuple)
+                else row
+            )
+            for row in self._panes[index]
+        ]
+
+
+class FilledRow(Sequence[Cell]):
+    """
+    A read-only view of a layout row with its inflection cells filled in.
+
+    Filled InflectionCells are only created as the row is read, sharing the
+    analysis of the layout's cell; all other cells are the layout's own.
+    """
+
+    __slots__ = ("_row", "_slots", "_inflections", "_frequencies")
+
+    def __init__(
+        self,
+        row: list[Cell],
+        slots: dict[int, int],
+        inflections: Sequence[str],
+        frequencies: Sequence[int],
+    ):
+        self._row = row
+        self._slots = slots
+        self._inflections = inflections
+        self._frequencies = frequencies
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self._row)
+        cell = self._row[index]
+        slot = self._slots.get(index)
+        if slot is None:
+            return cell
+        assert isinstance(cell, InflectionCell)
+        return InflectionCell(
+            cell.analysis, self._inflections[slot], self._frequencies[slot]
+        )
+
+    def __iter__(self) -> Iterator[Cell]:
+        return (self[index] for index in range(len(self._row)))
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, (list, FilledRow)) and list(self) == list(other)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
 ################################## Internal functions ##################################
 
 
-def import_frequency() -> dict[ConcatAnalysis, int]:
+def import_frequency() -> Mapping[ConcatAnalysis, int]:
     # TODO: store this in the database, rather than as a source file
     # TODO: make a management command that updates wordform frequencies
+    return load_table(CORPUS_FREQUENCY_FILE, read_frequency, "i")
+
 
+def read_frequency(frequency_file: Path) -> dict[ConcatAnalysis, int]:
     res: dict[ConcatAnalysis, int] = {}
-    lines = CORPUS_FREQUENCY_FILE.read_text(encoding="UTF-8").splitlines()
+    lines = frequency_file.read_text(encoding="UTF-8").splitlines()
     for line in lines:
         line = line.strip()
         if not line:
@@ -367,7 +571,7 @@ def import_frequency() -> dict[ConcatAnalysis, int]:
             freq, _, *analyses = line.split()
         except ValueError:
             # not enough value to unpack, which means the line has less than 3 values
-            logger.warning(f'line "{line}" is broken in {CORPUS_FREQUENCY_FILE}')
+            logger.warning(f'line "{line}" is broken in {frequency_file}')
         else:
             for analysis in analyses:
                 res[ConcatAnalysis(analysis)] = int(freq)
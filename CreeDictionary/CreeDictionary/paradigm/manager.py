@@ -1,11 +1,11 @@
 from functools import cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from hfst_optimized_lookup import TransducerFile
-from shared import expensive
 from utils import shared_res_dir
 
+from CreeDictionary import hfstol
 from CreeDictionary.paradigm.panes import Paradigm, ParadigmLayout
 
 
@@ -17,9 +17,15 @@ class ParadigmManager:
     (normative/strict) generator FST.
     """
 
-    def __init__(self, layout_directory: Path, generation_fst: TransducerFile):
+    def __init__(
+        self,
+        layout_directory: Path,
+        generation_fst: Union[TransducerFile, hfstol.MemoizedTransducer[str]],
+    ):
         # TODO: technically str == ConcatAnalysis
         self._analysis_to_layout: dict[str, ParadigmLayout] = {}
+        # Static paradigms are the same every time, so they're only filled once:
+        self._filled: dict[ParadigmLayout, Paradigm] = {}
         self._load_static_from(layout_directory / "static")
         self._generator = generation_fst
 
@@ -28,9 +34,14 @@ class ParadigmManager:
         Given an analysis, returns its paradigm.
         """
         if layout := self._analysis_to_layout.get(analysis):
-            return self._inflect(layout)
+            if layout not in self._filled:
+                self._filled[layout] = self._inflect(layout)
+            return self._filled[layout]
         return None
 
+    def has_static_paradigm(self, analysis: str) -> bool:
+        return analysis in self._analysis_to_layout
+
     def _load_static_from(self, path: Path):
         """
         Loads all .tsv files in the path as "static" paradigms.
@@ -43,10 +54,7 @@ class ParadigmManager:
                 self._analysis_to_layout[inflection.analysis] = layout
 
     def _inflect(self, layout: ParadigmLayout) -> Paradigm:
-        analyses = layout.generate_fst_analysis_string(lemma="").splitlines(
-            keepends=False
-        )
-        forms = self._generator.bulk_lookup(analyses)
+        forms = self._generator.bulk_lookup(layout.fst_analyses(lemma=""))
         return layout.fill(forms)
 
 
@@ -56,4 +64,4 @@ def default_paradigm_manager() -> ParadigmManager:
     Returns the ParadigmManager instance that loads layouts and FST from the res
     (resource) directory.
     """
-    return ParadigmManager(shared_res_dir / "layouts", expensive.strict_generator)
+    return ParadigmManager(shared_res_dir / "layouts", hfstol.strict_generator)
@@ -6,10 +6,9 @@ from __future__ import annotations
 
 import logging
 import re
-import string
 from functools import cached_property
 from itertools import zip_longest
-from typing import Collection, Iterable, Optional, TextIO
+from typing import Collection, Iterable, Mapping, Optional, TextIO
 
 from more_itertools import first
 
@@ -74,13 +73,8 @@ class ParadigmLayout(Paradigm):
             yield from pane.inflection_cells
 
     @cached_property
-    def _fst_analysis_template(self) -> string.Template:
-        """
-        A string template that can be given a lemma to generate FST analysis strings
-        for the ENTIRE paradigm.
-        """
-        lines = [inflection.analysis for inflection in self.inflection_cells]
-        return string.Template("\n".join(lines))
+    def _plan(self) -> FillPlan:
+        return FillPlan(self)
 
     @classmethod
     def load(cls, layout_file: TextIO) -> ParadigmLayout:
@@ -130,14 +124,21 @@ class ParadigmLayout(Paradigm):
         Given a lemma, generates a string that can be fed directly to an XFST lookup
         application.
         """
-        return self._fst_analysis_template.substitute(lemma=lemma)
+        return "\n".join(self.fst_analyses(lemma))
+
+    def fst_analyses(self, lemma: str) -> tuple[str, ...]:
+        """
+        The FST analysis of every InflectionTemplate in the layout, in order, for
+        the given lemma.
+        """
+        return self._plan.analyses(lemma)
 
-    def fill(self, forms: dict[str, Collection[str]]) -> Paradigm:
+    def fill(self, forms: Mapping[str, Collection[str]]) -> Paradigm:
         """
         Given a mapping from analysis to a collection of wordforms, returns a
         paradigm with all its InflectionTemplate cells replaced with WordformCells.
         """
-        return Paradigm(pane.fill(forms) for pane in self.panes)
+        return self._plan.fill(forms)
 
     def __str__(self):
         return self.dumps()
@@ -206,7 +207,7 @@ class Pane:
     def contains_wordform(self, wordform: str) -> bool:
         return any(row.contains_wordform(wordform) for row in self.rows)
 
-    def fill(self, forms: dict[str, Collection[str]]) -> Pane:
+    def fill(self, forms: Mapping[str, Collection[str]]) -> Pane:
         return Pane(row.fill(forms) for row in self.rows)
 
 
@@ -244,7 +245,7 @@ class Row:
     def contains_wordform(self, wordform: str) -> bool:
         raise NotImplementedError
 
-    def fill(self, forms: dict[str, Collection[str]]) -> Row:
+    def fill(self, forms: Mapping[str, Collection[str]]) -> Row:
         if not self.has_content:
             # Just labels; can return ourselves verbatim
             return self
@@ -299,7 +300,7 @@ class ContentRow(Row):
     def contains_wordform(self, wordform: str) -> bool:
         return any(cell.contains_wordform(wordform) for cell in self.cells)
 
-    def fill(self, forms: dict[str, Collection[str]]) -> ContentRow:
+    def fill(self, forms: Mapping[str, Collection[str]]) -> ContentRow:
         return ContentRow(cell.fill_one(forms) for cell in self.cells)
 
     def __eq__(self, other) -> bool:
@@ -385,7 +386,7 @@ class Cell:
         # Must be overridden in subclasses
         raise NotImplementedError
 
-    def fill_one(self, forms: dict[str, Collection[str]]) -> Cell:
+    def fill_one(self, forms: Mapping[str, Collection[str]]) -> Cell:
         """
         Returns exactly ONE cell by filling the paradigm.
         """
@@ -417,7 +418,7 @@ class WordformCell(Cell):
     def contains_wordform(self, wordform: str) -> bool:
         return self.inflection == wordform
 
-    def fill_one(self, forms: dict[str, Collection[str]]) -> Cell:
+    def fill_one(self, forms: Mapping[str, Collection[str]]) -> Cell:
         raise AssertionError(f"Cannot fill a cell that already has content: {self}")
 
     def __str__(self) -> str:
@@ -464,7 +465,7 @@ class InflectionTemplate(Cell):
             raise ParseError(f"cell does not look like an inflection: {text!r}")
         return InflectionTemplate(text)
 
-    def fill_one(self, forms: dict[str, Collection[str]]) -> WordformCell:
+    def fill_one(self, forms: Mapping[str, Collection[str]]) -> WordformCell:
         """
         Return a single WordformCell, given the fillable forms.
         """
@@ -588,6 +589,104 @@ class ColumnLabel(BaseLabelCell):
     prefix = "|"
 
 
+class FillPlan:
+    """
+    A ParadigmLayout, compiled for filling it over and over.
+
+    The InflectionTemplates of the layout are numbered in order, and each row
+    of the layout is stored with the number of each of its cells (or None, for
+    cells that are never filled). Rows without any InflectionTemplates are
+    reused as-is. Filling is then a single pass over the rows.
+
+    Each analysis is also split around its ${lemma} placeholder once, so that
+    substituting a lemma is a str.join() instead of a string.Template
+    substitution.
+    """
+
+    _PLACEHOLDER = "${lemma}"
+    _NOT_FILLED = -1
+
+    def __init__(self, layout: ParadigmLayout):
+        self.templates = tuple(layout.inflection_cells)
+
+        self._analysis_parts: tuple[tuple[str, ...], ...] = tuple(
+            tuple(template.analysis.split(self._PLACEHOLDER))
+            for template in self.templates
+        )
+        if any("$" in part for parts in self._analysis_parts for part in parts):
+            # Other placeholders or escapes would need string.Template to
+            # substitute them properly:
+            raise ParseError("analyses may only use the ${lemma} placeholder")
+
+        # Each row, with the slot of each of its cells, or None for rows that are
+        # never filled.
+        self._panes: list[list[tuple[Row, Optional[list[tuple[Cell, int]]]]]] = []
+        slot = 0
+        for pane in layout.panes:
+            rows: list[tuple[Row, Optional[list[tuple[Cell, int]]]]] = []
+            for row in pane.rows:
+                if not isinstance(row, ContentRow) or not any(row.inflection_cells):
+                    rows.append((row, None))
+                    continue
+                cells: list[tuple[Cell, int]] = []
+                for cell in row.cells:
+                    if isinstance(cell, InflectionTemplate):
+                        cells.append((cell, slot))
+                        slot += 1
+                    else:
+                        cells.append((cell, self._NOT_FILLED))
+                rows.append((row, cells))
+            self._panes.append(rows)
+
+    def analyses(self, lemma: str) -> tuple[str, ...]:
+        """
+        The analysis of every InflectionTemplate, in order, for the given lemma.
+        """
+        return tuple(lemma.join(parts) for parts in self._analysis_parts)
+
+    def fill(self, forms: Mapping[str, Collection[str]]) -> Paradigm:
+        """
+        Same as ParadigmLayout.fill().
+        """
+        # The same analysis may appear more than once; fill it just once.
+        filled_by_analysis: dict[str, Cell] = {}
+        filled: list[Cell] = []
+        for template in self.templates:
+            cell = filled_by_analysis.get(template.analysis)
+            if cell is None:
+                cell_forms = forms.get(template.analysis)
+                if cell_forms is not None and len(cell_forms) == 1:
+                    (form,) = cell_forms
+                    cell = WordformCell(form)
+                else:
+                    # Let the template deal with anything unusual:
+                    cell = template.fill_one(forms)
+                filled_by_analysis[template.analysis] = cell
+            filled.append(cell)
+
+        not_filled = self._NOT_FILLED
+        return Paradigm(
+            [
+                Pane(
+                    [
+                        (
+                            row
+                            if cells is None
+                            else ContentRow(
+                                [
+                                    cell if slot == not_filled else filled[slot]
+                                    for cell, slot in cells
+                                ]
+                            )
+                        )
+                        for row, cells in rows
+                    ]
+                )
+                for rows in self._panes
+            ]
+        )
+
+
 def looks_like_analysis_string(text: str) -> bool:
     """
     Returns true if the cell might be analysis.
@@ -0,0 +1,134 @@
+"""
+One place to get the paradigm of any lemma from.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import Iterable, Iterator, Union
+
+from API.models import Wordform
+from utils import ParadigmSize, WordClass
+from utils.fst_analysis_parser import extract_word_class
+
+from .cache import Inflections, ParadigmKey
+from .filler import Layout, ParadigmFiller
+from .manager import ParadigmManager, default_paradigm_manager
+from .panes import Paradigm
+
+# Pane-based paradigms for lemmas with a static layout, or else the tables of
+# the legacy layout of their word class:
+AnyParadigm = Union[Paradigm, list[Layout]]
+
+
+class ParadigmService:
+    """
+    Picks the right layout for a lemma and fills it.
+
+    Lemmas with a static layout (e.g., pronouns) get that pane-based paradigm,
+    which is only filled once; other lemmas get the layout of their word class,
+    filled with cached inflections.
+    """
+
+    def __init__(self, filler: ParadigmFiller, manager: ParadigmManager):
+        self.filler = filler
+        self.manager = manager
+
+    def paradigm_for(self, lemma: Wordform, size: ParadigmSize) -> AnyParadigm:
+        """
+        :return: the paradigm of the lemma, or an empty list if it doesn't inflect
+        """
+        return self.paradigms_for([(lemma, size)])[0]
+
+    def paradigms_for(
+        self, requests: Iterable[tuple[Wordform, ParadigmSize]]
+    ) -> list[AnyParadigm]:
+        """
+        paradigm_for() for several lemmas at once. Whatever has to be generated
+        for all of them is generated with a single lookup.
+        """
+        requests = list(requests)
+
+        paradigms: list[AnyParadigm] = []
+        dynamic_requests = []
+        dynamic_positions = []
+        for lemma, size in requests:
+            if static_paradigm := self.manager.paradigm_for(lemma.analysis):
+                paradigms.append(static_paradigm)
+                continue
+
+            paradigms.append([])
+            # TODO: is there a better way to determine if this lemma inflects?
+            word_class = extract_word_class(lemma.analysis)
+            if word_class is not None:
+                dynamic_requests.append((lemma.text, word_class, size))
+                dynamic_positions.append(len(paradigms) - 1)
+
+        for position, paradigm in zip(
+            dynamic_positions, self.filler.fill_paradigms(dynamic_requests)
+        ):
+            paradigms[position] = paradigm
+        return paradigms
+
+    def iter_tables(self, lemma: Wordform, size: ParadigmSize) -> Iterator[Layout]:
+        """
+        The tables of the paradigm of a lemma without a static paradigm, generated
+        one at a time; see ParadigmFiller.iter_paradigm().
+        """
+        assert not self.manager.has_static_paradigm(lemma.analysis)
+        word_class = extract_word_class(lemma.analysis)
+        if word_class is not None:
+            yield from self.filler.iter_paradigm(lemma.text, word_class, size)
+
+    def has_static_paradigm(self, lemma: Wordform) -> bool:
+        return self.manager.has_static_paradigm(lemma.analysis)
+
+    def warm_up(self, most_visited: int) -> int:
+        """
+        Generates the most visited paradigms, if they aren't in the cache already.
+
+        :return: how many paradigms were generated
+        """
+        if self.filler.cache is None:
+            return 0
+
+        def generate(key: ParadigmKey) -> Inflections:
+            return self.filler.generate_inflections(
+                key.lemma, WordClass(key.word_class), ParadigmSize(key.size)
+            )
+
+        return self.filler.cache.precompute_most_visited(most_visited, generate)
+
+    def prune_cache(self) -> int:
+        """
+        Deletes the cached paradigms of other FST and layout versions; see
+        ParadigmStore.prune_other_versions().
+
+        :return: how many paradigms were deleted
+        """
+        if self.filler.cache is None or self.filler.cache.store is None:
+            return 0
+        return self.filler.cache.store.prune_other_versions()
+
+    def cache_stats(self) -> dict[str, float]:
+        """
+        How well the paradigm cache is doing, e.g., for logging or monitoring.
+        """
+        paradigm_cache = self.filler.cache
+        if paradigm_cache is None:
+            return {}
+        return {
+            "hits": paradigm_cache.hits,
+            "store_hits": paradigm_cache.store_hits,
+            "misses": paradigm_cache.misses,
+            "hit_rate": paradigm_cache.hit_rate,
+            "entries": len(paradigm_cache),
+        }
+
+
+@cache
+def default_paradigm_service() -> ParadigmService:
+    """
+    The paradigm service for the layouts and FST in the res (resource) directory.
+    """
+    return ParadigmService(ParadigmFiller.default_filler(), default_paradigm_manager())
@@ -2,13 +2,28 @@ from __future__ import annotations
 
 import csv
 from enum import IntEnum
-from typing import Iterable, Optional, TextIO, Tuple, TypeVar, Union
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from utils import shared_res_dir
 from utils.types import FSTTag, Label
 
 CRK_ALTERNATE_LABELS_FILE = shared_res_dir / "crk.altlabel.tsv"
 
+# The same tag sequences are relabelled over and over (e.g., for every search result
+# with the same analysis), so each fetcher remembers this many of them:
+MEMOIZED_TAG_SEQUENCES = 4096
+
 
 class _LabelFriendliness(IntEnum):
     """
@@ -43,14 +58,17 @@ class Relabelling:
 
     def __init__(self, data: _DataStructure) -> None:
         self._data = data
+        trie = _TagTrie(data)
 
         self.linguistic_short = _RelabelFetcher(
-            data, _LabelFriendliness.LINGUISTIC_SHORT
+            data, trie, _LabelFriendliness.LINGUISTIC_SHORT
+        )
+        self.linguistic_long = _RelabelFetcher(
+            data, trie, _LabelFriendliness.LINGUISTIC_LONG
         )
-        self.linguistic_long = _RelabelFetcher(data, _LabelFriendliness.LINGUISTIC_LONG)
-        self.english = _RelabelFetcher(data, _LabelFriendliness.ENGLISH)
-        self.cree = _RelabelFetcher(data, _LabelFriendliness.NEHIYAWEWIN)
-        self.emoji = _RelabelFetcher(data, _LabelFriendliness.EMOJI)
+        self.english = _RelabelFetcher(data, trie, _LabelFriendliness.ENGLISH)
+        self.cree = _RelabelFetcher(data, trie, _LabelFriendliness.NEHIYAWEWIN)
+        self.emoji = _RelabelFetcher(data, trie, _LabelFriendliness.EMOJI)
 
     def __contains__(self, key: object) -> bool:
         if isinstance(key, str):
@@ -83,6 +101,43 @@ class Relabelling:
         return cls(res)
 
 
+class _TagTrie:
+    """
+    The tag sequences that have relabellings, for finding the longest one that
+    starts at some point in a sequence of tags, in one walk.
+    """
+
+    # Marks the nodes that end a tag sequence; tags are strings, so it can't clash:
+    _END = None
+
+    # The children of a node by their tag, and True under _END if it ends one:
+    _Node = Dict[Optional[FSTTag], Any]
+
+    def __init__(self, tag_sets: Iterable[tuple[FSTTag, ...]]):
+        self._root: _TagTrie._Node = {}
+        for tag_set in tag_sets:
+            node = self._root
+            for tag in tag_set:
+                node = node.setdefault(tag, {})
+            node[self._END] = True
+
+    def longest_match(self, tags: Sequence[FSTTag], start: int = 0) -> int:
+        """
+        Returns where the longest tag sequence in the trie that starts at
+        tags[start] ends, or start if there is none.
+        """
+        longest = start
+        node = self._root
+        for end in range(start, len(tags)):
+            child: Optional[_TagTrie._Node] = node.get(tags[end])
+            if child is None:
+                break
+            node = child
+            if self._END in node:
+                longest = end + 1
+        return longest
+
+
 class _RelabelFetcher:
     """
     Makes accessing relabellings for a particular label friendliness easier.
@@ -91,11 +146,18 @@ class _RelabelFetcher:
     def __init__(
         self,
         data: Relabelling._DataStructure,
+        trie: _TagTrie,
         label: _LabelFriendliness,
     ):
         self._data = data
+        self._trie = trie
         self._friendliness = label
 
+        memoize = lru_cache(maxsize=MEMOIZED_TAG_SEQUENCES)
+        self._memoized_longest = memoize(self._longest)
+        self._memoized_chunks = memoize(self._chunks)
+        self._memoized_full_relabelling = memoize(self._full_relabelling)
+
     def __getitem__(self, key: FSTTag) -> Optional[Label]:
         return self._data[(key,)][self._friendliness]
 
@@ -109,68 +171,63 @@ class _RelabelFetcher:
         """
         Get a relabelling for the longest prefix of the given tags.
         """
-        _unmatched, label = self._get_longest(tags)
-        return label
+        return self._memoized_longest(tuple(tags))
 
     def chunk(self, tags: Iterable[FSTTag]) -> Iterable[tuple[FSTTag, ...]]:
         """
         Chunk FST Labels that match relabellings and yield the tags.
         """
-        tag_set = tuple(tags)
-        while tag_set:
-            unmatched, _ = self._get_longest(tag_set)
-            prefix_length = len(tag_set) - len(unmatched)
-            if prefix_length == 0:
-                # There was no relabelling found, but we can just return the first tag.
-                prefix_length = 1
-
-            yield tag_set[:prefix_length]
-            tag_set = tag_set[prefix_length:]
+        return self._memoized_chunks(tuple(tags))
 
     def get_full_relabelling(self, tags: Iterable[FSTTag]) -> list[Label]:
         """
         Relabels all tags, trying to match prefixes
         """
+        return list(self._memoized_full_relabelling(tuple(tags)))
+
+    def _longest(self, tags: tuple[FSTTag, ...]) -> Optional[Label]:
+        _end, label = self._match(tags, 0)
+        return label
 
+    def _chunks(self, tags: tuple[FSTTag, ...]) -> tuple[tuple[FSTTag, ...], ...]:
+        chunks = []
+        start = 0
+        while start < len(tags):
+            end, _ = self._match(tags, start)
+            # There was no relabelling found, but we can just return the first tag.
+            end = max(end, start + 1)
+            chunks.append(tags[start:end])
+            start = end
+        return tuple(chunks)
+
+    def _full_relabelling(self, tags: tuple[FSTTag, ...]) -> tuple[Label, ...]:
         labels = []
-        tag_set = tuple(tags)
-        while tag_set:
-            unmatched, maybe_label = self._get_longest(tag_set)
+        start = 0
+        while start < len(tags):
+            end, maybe_label = self._match(tags, start)
             if maybe_label is None:
                 # No relabelling available! Just return the tag itself
                 # TODO: raise a warning?
-                label = Label(tag_set[0])
-                tag_set = tag_set[1:]
+                labels.append(Label(tags[start]))
+                start += 1
             else:
-                assert len(unmatched) < len(tag_set)
-                label = maybe_label
-                tag_set = unmatched
-            labels.append(label)
-
-        return labels
+                labels.append(maybe_label)
+                start = end
+        return tuple(labels)
 
-    def _get_longest(
-        self, tags: Iterable[FSTTag]
-    ) -> tuple[tuple[FSTTag, ...], Optional[Label]]:
+    def _match(
+        self, tags: tuple[FSTTag, ...], start: int
+    ) -> tuple[int, Optional[Label]]:
         """
-        Returns the unmatched tags, and the relabelling of the matched tags from the
-        prefix.
+        Returns where the longest relabelled tag sequence at tags[start] ends, and
+        its relabelling.
 
-        Returns a tuple of all tags if no prefix matched.
+        Returns (start, None) if no tag sequence matched.
         """
-
-        # TODO: better algorithm than this. Probably a trie
-        try_tags = tuple(tags)
-        end = len(try_tags)
-        while end > 0:
-            try:
-                entry = self._data[try_tags[:end]]
-            except KeyError:
-                end -= 1
-            else:
-                return try_tags[end:], entry[self._friendliness]
-
-        return try_tags, None
+        end = self._trie.longest_match(tags, start)
+        if end == start:
+            return start, None
+        return end, self._data[tags[start:end]][self._friendliness]
 
 
 def _label_from_column_or_none(column_no: _LabelFriendliness, row) -> Optional[Label]:
@@ -285,7 +285,41 @@ USE_TZ = True
 ############################## API app settings ###############################
 
 # We only apply affix search for user queries longer than the threshold length
-AFFIX_SEARCH_THRESHOLD = 4
+AFFIX_SEARCH_THRESHOLD = 3
+
+# Affix search keeps at most this many of its best matches for each language
+AFFIX_SEARCH_RESULT_LIMIT = 100
+
+# Each server process caches the responses to this many recent searches…
+SEARCH_RESULT_CACHE_MAX_ENTRIES = 1000
+# …as long as they hold no more than this many search results altogether
+SEARCH_RESULT_CACHE_MAX_RESULTS = 10_000
+
+# Where the importer writes search indexes precomputed from the database, so
+# that server processes can load them instead of rebuilding them.
+if USE_TEST_DB:
+    SEARCH_INDEX_DIR = BASE_PATH / "test_db_search_index"
+else:
+    SEARCH_INDEX_DIR = env.path(
+        "SEARCH_INDEX_DIR", default=BASE_PATH / "db" / "search_index"
+    )
+
+# When nothing else matches, fuzzy search suggests lemmas within this edit
+# distance of the query (see utils.cree_lev_dist.get_modified_distance)
+FUZZY_SEARCH_MAX_DISTANCE = 2
+
+########################## CreeDictionary app settings #########################
+
+# Each server process keeps this many recently filled paradigms in memory…
+PARADIGM_CACHE_MAX_ENTRIES = 1000
+# …and every paradigm ever filled is kept in this SQLite database, shared by all
+# server processes (see CreeDictionary.paradigm.cache)
+if USE_TEST_DB:
+    PARADIGM_CACHE_PATH = BASE_PATH / "test_db_paradigm_cache.sqlite3"
+else:
+    PARADIGM_CACHE_PATH = env.path(
+        "PARADIGM_CACHE_PATH", default=BASE_PATH / "db" / "paradigm_cache.sqlite3"
+    )
 
 ############################## staticfiles app ###############################
 
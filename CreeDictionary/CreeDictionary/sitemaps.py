@@ -18,7 +18,7 @@ class WordformSitemap(Sitemap):
         return Wordform.objects.filter(is_lemma=True).order_by("is_lemma", "text")
 
     def location(self, item: Wordform):
-        return item.get_absolute_url(ambiguity="allow")
+        return item.get_absolute_url()
 
 
 class StaticViewSitemap(Sitemap):
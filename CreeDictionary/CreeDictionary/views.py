@@ -1,20 +1,26 @@
 from http import HTTPStatus
-from typing import Any, Dict, Literal, Union
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, Literal
 
 from API.models import Wordform
-from API.search import presentation, search_with_affixes
+from API.search import cached_search, presentation
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotFound
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotFound,
+    StreamingHttpResponse,
+)
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
 from django.views import View
 from django.views.decorators.http import require_GET
 from utils import ParadigmSize
 
 from CreeDictionary.forms import WordSearchForm
-from CreeDictionary.paradigm.filler import Row
-from CreeDictionary.paradigm.generation import generate_paradigm
-from CreeDictionary.paradigm.manager import default_paradigm_manager
 from CreeDictionary.paradigm.panes import Paradigm
+from CreeDictionary.paradigm.filler import Layout
+from CreeDictionary.paradigm.service import default_paradigm_service
 
 from .display_options import DISPLAY_MODE_COOKIE, DISPLAY_MODES
 from .utils import url_for_query
@@ -60,12 +66,10 @@ def lemma_details(request, lemma_text: str):
     lemma = lemma.get()
     paradigm_size = ParadigmSize.from_string(request.GET.get("paradigm-size"))
 
-    # TODO: make this use the ParadigmManager exclusively
-    paradigm: Union[Paradigm, list[list[Row]]]
-    if new_style_paradigm := default_paradigm_manager().paradigm_for(lemma.analysis):
-        paradigm = new_style_paradigm
-    else:
-        paradigm = generate_paradigm(lemma, paradigm_size)
+    # The paradigm is rendered all at once, whatever its size. The page starts
+    # out BASIC, unless reloaded after "show more", and bigger paradigms are
+    # loaded by the "show more" button from paradigm_internal(), which streams.
+    paradigm = default_paradigm_service().paradigm_for(lemma, paradigm_size)
 
     context = create_context_for_index_template(
         "word-detail",
@@ -93,7 +97,7 @@ def index(request):  # pragma: no cover
     user_query = request.GET.get("q", None)
 
     if user_query:
-        search_results = search_with_affixes(
+        search_results = cached_search(
             user_query,
             include_auto_definitions=should_include_auto_definitions(request),
         )
@@ -122,7 +126,7 @@ def search_results(request, query_string: str):  # pragma: no cover
     """
     returns rendered boxes of search results according to user query
     """
-    results = search_with_affixes(
+    results = cached_search(
         query_string, include_auto_definitions=should_include_auto_definitions(request)
     )
     return render(
@@ -173,17 +177,63 @@ def paradigm_internal(request):
         return HttpResponseNotFound("specified lemma-id is not found in the database")
     # end guards
 
+    service = default_paradigm_service()
+    if paradigm_size != ParadigmSize.BASIC and not service.has_static_paradigm(lemma):
+        # Bigger paradigms take a while to generate; send each table as it's ready.
+        # The first one is generated before responding, so that if the FST fails,
+        # it fails with an error status rather than with a truncated 200 response.
+        tables = service.iter_tables(lemma, paradigm_size)
+        first_table = list(islice(tables, 1))
+        return StreamingHttpResponse(
+            stream_paradigm_tables(
+                request, lemma, paradigm_size, chain(first_table, tables)
+            )
+        )
+
+    paradigm = service.paradigm_for(lemma, paradigm_size)
+    if isinstance(paradigm, Paradigm):
+        return render(
+            request,
+            "CreeDictionary/components/paradigm-with-panes.html",
+            {"paradigm": paradigm},
+        )
+
     return render(
         request,
         "CreeDictionary/components/paradigm.html",
         {
             "lemma": lemma,
             "paradigm_size": paradigm_size.value,
-            "paradigm_tables": generate_paradigm(lemma, paradigm_size),
+            "paradigm_tables": paradigm,
         },
     )
 
 
+def stream_paradigm_tables(
+    request, lemma: Wordform, paradigm_size: ParadigmSize, tables: Iterable[Layout]
+) -> Iterator[str]:
+    """
+    Renders CreeDictionary/components/paradigm.html piece by piece, taking
+    each of the paradigm's tables only after the previous one has been sent.
+    """
+    context = {"lemma": lemma, "paradigm_size": paradigm_size.value}
+
+    # .strip() the newline at the end of each partial, like the {% spaceless %}
+    # around them in paradigm.html; only the one at the end of paradigm.html stays.
+    yield render_to_string(
+        "CreeDictionary/components/paradigm-before-tables.html", context, request
+    ).strip()
+
+    for table in tables:
+        yield render_to_string(
+            "CreeDictionary/components/paradigm-pane.html", {"subtable": table}, request
+        ).strip()
+
+    yield render_to_string(
+        "CreeDictionary/components/paradigm-after-tables.html", context, request
+    )
+
+
 def about(request):  # pragma: no cover
     """
     About page.
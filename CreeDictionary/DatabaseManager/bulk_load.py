@@ -0,0 +1,88 @@
+"""
+Loading a whole dictionary into an SQLite database as fast as SQLite goes.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List, Sequence, Tuple, Type
+
+from django.db import connection, models, transaction
+
+from DatabaseManager.log import DatabaseManagerLogger
+from utils.profiling import PhaseTimer
+
+logger = DatabaseManagerLogger(__name__)
+
+
+@contextmanager
+def bulk_loading(
+    loaded_models: Sequence[Type[models.Model]], timer: PhaseTimer
+) -> Iterator[None]:
+    """
+    Sets up SQLite for inserting lots of rows into the tables of loaded_models:
+
+     - the indexes in the models' Meta.indexes are dropped, and built once at the
+       end, rather than updated on every row inserted;
+     - there is no rollback journal, and nothing is synced to disk until the end;
+     - everything is inserted in a single transaction.
+
+    Then the query planner's statistics are updated (ANALYZE).
+
+    This is only for loading a database that's no use until the load finishes:
+    without a journal, a load that fails or is interrupted can leave the
+    database inconsistent, and it has to be wiped and loaded again.
+
+    On other databases than SQLite, this does nothing.
+    """
+    if connection.vendor != "sqlite":
+        logger.info("Bulk loading is only for SQLite; loading as usual.")
+        yield
+        return
+
+    deferred_indexes: List[Tuple[Type[models.Model], models.Index]] = [
+        (model, index) for model in loaded_models for index in model._meta.indexes
+    ]
+
+    with _without_journal():
+        with timer("dropping indexes"), connection.schema_editor() as editor:
+            for model, index in deferred_indexes:
+                editor.remove_index(model, index)
+
+        try:
+            with transaction.atomic():
+                yield
+        finally:
+            # The indexes are part of the schema: they're needed even if the load
+            # has to be done again.
+            with timer("rebuilding indexes"), connection.schema_editor() as editor:
+                for model, index in deferred_indexes:
+                    editor.add_index(model, index)
+
+        with timer("analyzing"), connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+
+@contextmanager
+def _without_journal() -> Iterator[None]:
+    """
+    Turns off SQLite's rollback journal and syncing to disk, for the connection.
+    """
+    if connection.in_atomic_block:
+        # SQLite doesn't allow it (e.g., in tests, which run in a transaction)
+        logger.info("Already in a transaction: the rollback journal stays on.")
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        (journal_mode,) = cursor.fetchone()
+        cursor.execute("PRAGMA synchronous")
+        (synchronous,) = cursor.fetchone()
+        cursor.execute("PRAGMA journal_mode = OFF")
+        cursor.execute("PRAGMA synchronous = OFF")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            # synchronous is read as a number, which it can be set to as well
+            cursor.execute(f"PRAGMA synchronous = {int(synchronous)}")
+            cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
@@ -1,27 +1,99 @@
 """
 EXPAND lemma with inflections from xml according to an fst and paradigm/layout files
 """
-from typing import Dict, Iterable, List, Set, Tuple
+
+from multiprocessing import get_context
+from multiprocessing.pool import Pool
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from hfst_optimized_lookup import TransducerFile
+from more_itertools import divide
 
 from DatabaseManager.log import DatabaseManagerLogger
 from shared import expensive
 from utils import fst_analysis_parser
+from utils.types import ConcatAnalysis
 from CreeDictionary.paradigm.filler import ParadigmFiller
 
 
 def expand_inflections(
-    analyses: Iterable[str], verbose=True
+    analyses: Iterable[str], verbose=True, jobs=1, pool: Optional[Pool] = None
 ) -> Dict[str, List[Tuple[str, Set[str]]]]:
     """
     for every lemma fst analysis, generate all inflections according to paradigm files
     every analysis in `analyses` should be in the form of a lemma analysis
+
+    :param jobs: how many processes to expand the analyses in. With more than one,
+        the analyses are split into as many contiguous shards, each expanded by a
+        process of its own, and the results merged in the original order, so they
+        are the same as expanding them all in this process.
+    :param pool: the processes to expand the analyses in, from
+        inflection_expanding_pool(jobs), to reuse them from one call to the next.
+        Without one, processes are started for this call only.
     """
+    analyses = list(analyses)
+    if jobs <= 1 or len(analyses) <= 1:
+        return _expand_inflections(
+            analyses,
+            verbose,
+            ParadigmFiller.default_filler(),
+            expensive.strict_generator,
+        )
+
+    if pool is None:
+        with inflection_expanding_pool(jobs) as pool:
+            return expand_inflections(analyses, verbose, jobs, pool)
+
     logger = DatabaseManagerLogger(__name__, verbose)
+    logger.info(f"Generating inflections in {jobs} processes ...")
 
-    paradigm_filler = ParadigmFiller.default_filler()
+    shards = [list(shard) for shard in divide(min(jobs, len(analyses)), analyses)]
+    expanded: Dict[str, List[Tuple[str, Set[str]]]] = {}
+    for shard_expanded in pool.map(_expand_inflections_in_worker, shards):
+        expanded.update(shard_expanded)
 
-    analyses = list(analyses)
-    to_generated: Dict[str, List[str]] = {}
+    logger.info("Done generating inflections")
+    return expanded
+
+
+def inflection_expanding_pool(jobs: int) -> Pool:
+    """
+    Starts `jobs` processes for expand_inflections(), each with its own filler and
+    generator, loaded once for all the analyses it's going to expand.
+    """
+    # Forked workers inherit Django's settings and any FST already loaded here.
+    return get_context("fork").Pool(jobs, initializer=_start_worker)
+
+
+_worker_filler: Optional[ParadigmFiller] = None
+_worker_generator: Optional[TransducerFile] = None
+
+
+def _start_worker():
+    global _worker_filler, _worker_generator
+    _worker_filler = ParadigmFiller.default_filler()
+    _worker_generator = expensive.strict_generator
+
+
+def _expand_inflections_in_worker(
+    analyses: List[str],
+) -> Dict[str, List[Tuple[str, Set[str]]]]:
+    assert _worker_filler is not None and _worker_generator is not None
+    return _expand_inflections(analyses, False, _worker_filler, _worker_generator)
+
+
+def _expand_inflections(
+    analyses: List[str],
+    verbose: bool,
+    paradigm_filler: ParadigmFiller,
+    generator: TransducerFile,
+) -> Dict[str, List[Tuple[str, Set[str]]]]:
+    """
+    expand_inflections(), all in this process.
+    """
+    logger = DatabaseManagerLogger(__name__, verbose)
+
+    to_generated: Dict[str, List[ConcatAnalysis]] = {}
     # We'll generate all of the forms for analyses enqueued here in one fell swoop.
     analysis_queue = []
 
@@ -33,7 +105,7 @@ def expand_inflections(
         if category.has_inflections():
             generated_analyses = list(paradigm_filler.expand_analyses(lemma, category))
         else:
-            generated_analyses = [analysis]
+            generated_analyses = [ConcatAnalysis(analysis)]
 
         to_generated[analysis] = generated_analyses
         analysis_queue.extend(generated_analyses)
@@ -41,16 +113,14 @@ def expand_inflections(
     logger.info("Generating inflections ...")
 
     # optimized for efficiency by calling hfstol once and for all
-    generated_analyses_to_inflections = expensive.strict_generator.bulk_lookup(
-        analysis_queue
-    )
+    generated_analyses_to_inflections = generator.bulk_lookup(analysis_queue)
 
     logger.info("Done generating inflections")
 
     expanded = {}
 
     for analysis in analyses:
-        pooled_generated_words = []
+        pooled_generated_words: List[Tuple[str, Set[str]]] = []
         for generated_analysis in to_generated[analysis]:
             pooled_generated_words.append(
                 (
@@ -1,7 +1,7 @@
 from argparse import ArgumentParser
 from pathlib import Path
 
-from django.core.management import BaseCommand, call_command
+from django.core.management import BaseCommand, CommandError, call_command
 
 
 class Command(BaseCommand):
@@ -24,6 +24,26 @@ class Command(BaseCommand):
             "xml_path", help="The XML file, or directory containing crkeng*.xml"
         )
         import_parser.add_argument("--wipe-first", action="store_true")
+        import_parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="How many processes to generate inflections in (default: 1)",
+        )
+        import_parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only import the entries that changed since the last import. "
+            "Import everything (with --wipe-first) after changing the FSTs or "
+            "the paradigm layouts.",
+        )
+        import_parser.add_argument(
+            "--bulk-load",
+            action="store_true",
+            help="Import faster, by deferring indexes and turning off SQLite's "
+            "rollback journal. If the import fails, the database has to be wiped "
+            "(--wipe-first) before importing again.",
+        )
 
     def handle(self, *args, **options):
         from DatabaseManager.xml_importer import import_xmls
@@ -32,6 +52,14 @@ class Command(BaseCommand):
             if options["wipe_first"]:
                 call_command("wipedefinitions", yes_really=True)
 
-            import_xmls(Path(options["xml_path"]))
+            try:
+                import_xmls(
+                    Path(options["xml_path"]),
+                    jobs=options["jobs"],
+                    incremental=options["incremental"],
+                    bulk_load=options["bulk_load"],
+                )
+            except ValueError as error:
+                raise CommandError(str(error)) from error
         else:
             raise NotImplementedError
@@ -3,7 +3,6 @@ build test_db.sqlite3 from res/test_db_words.txt
 """
 
 import logging
-import xml.etree.ElementTree as ET
 from typing import Set
 
 from tqdm import tqdm
@@ -11,7 +10,7 @@ from tqdm import tqdm
 from DatabaseManager.xml_importer import find_latest_xml_file
 from shared import expensive
 from utils import crkeng_xml_utils, fst_analysis_parser, shared_res_dir
-from utils.crkeng_xml_utils import extract_l_str
+from utils.crkeng_xml_utils import extract_l_str, iter_elements
 from utils.profiling import timed
 
 logger = logging.getLogger(__name__)
@@ -43,16 +42,14 @@ def build_test_xml():
 
     print(f"Building test dictionary files using {crkeng_file_path.name}")
 
-    crkeng_root = ET.parse(str(crkeng_file_path)).getroot()
-
     # relevant entries in crkeng.xml file we want to determine
     relevant_xml_ls: Set[str] = set()
 
-    xml_ls: Set[str] = set()
-    crkeng_entries = crkeng_root.findall(".//e")
-    for element in crkeng_entries:
-        xml_l = extract_l_str(element)
-        xml_ls.add(xml_l)
+    # The dictionary is read twice rather than kept in memory: once for all the
+    # <l> strings, and again for the relevant entries
+    xml_ls: Set[str] = {
+        extract_l_str(element) for element in iter_elements(crkeng_file_path, "e")
+    }
 
     test_words = get_test_words()
 
@@ -85,14 +82,16 @@ def build_test_xml():
                     relevant_xml_ls.add(xml_l)
                     break
 
+    sources = []
     relevant_crkeng_entries = []
 
-    for element in crkeng_entries:
-        xml_l = extract_l_str(element)
-        if xml_l in relevant_xml_ls:
+    for element in iter_elements(crkeng_file_path, "source", "e"):
+        if element.tag == "source":
+            sources.append(element)
+        elif extract_l_str(element) in relevant_xml_ls:
             relevant_crkeng_entries.append(element)
 
     crkeng_xml_utils.write_xml_from_elements(
-        list(crkeng_root.findall(".//source")) + relevant_crkeng_entries,
+        sources + relevant_crkeng_entries,
         shared_res_dir / "test_dictionaries" / "crkeng.xml",
     )
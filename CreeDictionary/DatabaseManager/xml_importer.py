@@ -1,25 +1,57 @@
+import hashlib
+import json
 import re
 import xml.etree.ElementTree as ET
+from contextlib import nullcontext
+from multiprocessing.pool import Pool
 from pathlib import Path
-from typing import Dict, List, NamedTuple, Set, Optional
+from typing import (
+    ContextManager,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from colorama import init
-
-from API.models import Definition, DictionarySource, EnglishKeyword, Wordform
+from django.db import transaction
+from django.db.models import Max
+from more_itertools import chunked
+
+from API.models import (
+    Definition,
+    DictionaryImport,
+    DictionarySource,
+    EnglishKeyword,
+    ImportedEntry,
+    Wordform,
+    homograph_disambiguators,
+)
+from API.search.affix import save_affix_searchers
+from API.search.result_cache import forget_loaded_dictionary, search_result_cache
 from DatabaseManager import xml_entry_lemma_finder
-from DatabaseManager.cree_inflection_generator import expand_inflections
+from DatabaseManager.bulk_load import bulk_loading
+from DatabaseManager.cree_inflection_generator import (
+    expand_inflections,
+    inflection_expanding_pool,
+)
 from DatabaseManager.log import DatabaseManagerLogger
 from DatabaseManager.xml_consistency_checker import (
     does_inflectional_category_match_xml_entry,
 )
-from utils import PartOfSpeech, fst_analysis_parser
+from utils import PartOfSpeech, WordClass, fst_analysis_parser
 from utils.crkeng_xml_utils import (
     IndexedXML,
     convert_xml_inflectional_category_to_word_class,
 )
 from utils.data_classes import XMLEntry, XMLTranslation
 from utils.english_keyword_extraction import stem_keywords
-from utils.profiling import timed
+from utils.profiling import PhaseTimer, timed
+from utils.types import ConcatAnalysis
 
 init()  # for windows compatibility
 
@@ -120,80 +152,399 @@ class ProcessedEntry(NamedTuple):
     lemma_analysis: str
 
 
+# How many lemmas are expanded, and inserted into the database, at a time. Only the
+# database objects of one chunk are ever in memory, so their number doesn't grow
+# with the dictionary.
+IMPORT_CHUNK_SIZE = 500
+
+# How many citations are inserted per INSERT statement
+CITATION_BATCH_SIZE = 1000
+
+
+def entry_hash(entry: XMLEntry) -> str:
+    """
+    Identifies the contents of an entry: as long as the FSTs and the layouts stay
+    the same, entries with the same hash are imported the same way.
+    """
+    return hashlib.sha1(
+        json.dumps(entry, ensure_ascii=False).encode("UTF-8")
+    ).hexdigest()
+
+
 @timed()
-def import_xmls(crkeng_file_path: Path, verbose=True):
+def import_xmls(
+    crkeng_file_path: Path, verbose=True, jobs=1, incremental=False, bulk_load=False
+):
     r"""
     Import from crkeng files, either directly from the specified file or from
     the latest dictionary file in the specified directory.
 
+    Lemmas are imported a chunk at a time (see IMPORT_CHUNK_SIZE): all the
+    wordforms, definitions and keywords of a chunk are inserted before the next
+    chunk is expanded. How long each phase of the import took is logged at the end.
+
     :param crkeng_file_path: either a file or a directory that has pattern
     crkeng.*?(?P<timestamp>\d{6})?\.xml (e.g. crkeng_cw_md_200319.xml or
     crkeng.xml) files, beware the timestamp has format yymmdd. The latest
     timestamped files will be used, with un-timestamped files as a fallback.
     :param verbose: print to stdout or not
+    :param jobs: how many processes to expand inflections in; see expand_inflections().
+        They're started once, for the whole import.
+    :param incremental: only import the entries that were added, changed or
+        removed since the last import, in a single transaction; the rest of the
+        database is left as it is. The FSTs and layouts must not have changed
+        since the last import, or its results would be inconsistent.
+    :param bulk_load: import everything as fast as SQLite goes; see bulk_loading().
+        If the import fails, the database has to be wiped before importing again.
+    :raise ValueError: for an incremental import into a database that has
+        wordforms, but no record of the entries they were imported from, or an
+        incremental import in bulk-load mode
     """
+    if incremental and bulk_load:
+        raise ValueError("Bulk-load mode is for importing everything at once.")
+
     logger.set_print_info_on_console(verbose)
+    timer = PhaseTimer()
 
-    if crkeng_file_path.is_dir():
-        crkeng_file_path = find_latest_xml_file(crkeng_file_path)
-    logger.info(f"using crkeng file: {crkeng_file_path}")
+    # Started before the XML is loaded, so that the processes don't inherit it:
+    pool_context: ContextManager[Optional[Pool]]
+    if jobs > 1:
+        pool_context = inflection_expanding_pool(jobs)
+    else:
+        pool_context = nullcontext()
+    with pool_context as pool:
+        if crkeng_file_path.is_dir():
+            crkeng_file_path = find_latest_xml_file(crkeng_file_path)
+        logger.info(f"using crkeng file: {crkeng_file_path}")
+
+        assert crkeng_file_path.exists()
+
+        with timer("parsing XML"), open(crkeng_file_path) as f:
+            crkeng_xml = IndexedXML.from_xml_file(f)
+
+        if incremental and not ImportedEntry.objects.exists():
+            if Wordform.objects.exists():
+                raise ValueError(
+                    "The entries in the database were not recorded when they were "
+                    "imported, so there is nothing to compare with. Import everything "
+                    "again, with --wipe-first, before importing incrementally."
+                )
+            logger.info("Nothing imported yet: importing everything.")
+            incremental = False
+
+        if incremental:
+            with transaction.atomic():
+                changed = import_changed_entries(crkeng_xml, timer, jobs, pool)
+                if changed:
+                    DictionaryImport.objects.create(
+                        source=crkeng_file_path.name, incremental=True
+                    )
+            if not changed:
+                logger.info("Nothing changed since the last import.")
+                return
+        elif bulk_load:
+            with bulk_loading(
+                [Wordform, Definition, EnglishKeyword],
+                timer,
+            ):
+                import_all_entries(crkeng_xml, timer, jobs, pool)
+                DictionaryImport.objects.create(source=crkeng_file_path.name)
+        else:
+            import_all_entries(crkeng_xml, timer, jobs, pool)
+            DictionaryImport.objects.create(source=crkeng_file_path.name)
 
-    assert crkeng_file_path.exists()
+    logger.info("Saving affix search indexes...")
+    with timer("affix search indexes"):
+        save_affix_searchers()
+    logger.info("Done saving.")
 
-    with open(crkeng_file_path) as f:
-        crkeng_xml = IndexedXML.from_xml_file(f)
+    # In case this process has searched the dictionary as it was:
+    search_result_cache.clear()
+    forget_loaded_dictionary()
 
-    source_abbreviations = crkeng_xml.source_abbreviations
+    logger.info("Time spent in each phase:\n%s", timer.report())
 
-    logger.info("Sources parsed: %r", source_abbreviations)
-    for source_abbreviation in source_abbreviations:
-        src = DictionarySource(abbrv=source_abbreviation)
-        src.save()
-        logger.info("Created source: %s", source_abbreviation)
+
+def import_all_entries(
+    crkeng_xml: IndexedXML, timer: PhaseTimer, jobs=1, pool: Optional[Pool] = None
+):
+    """
+    Imports every entry into a database that has none yet.
+    """
+    create_sources(crkeng_xml.source_abbreviations)
 
     # these two will be imported to the database
-    (
+    with timer("identifying lemmas"):
+        (
+            identified_entry_to_analysis,
+            as_is_entries,
+        ) = xml_entry_lemma_finder.identify_entries(
+            crkeng_xml, write_out_inconsistencies=True
+        )
+
+    db_objects = DatabaseObjects(crkeng_xml, timer)
+    import_entries(db_objects, identified_entry_to_analysis, as_is_entries, jobs, pool)
+
+    logger.info("Working out homograph disambiguators...")
+    with timer("homograph disambiguators"):
+        save_homograph_disambiguators()
+    logger.info("Done.")
+
+
+def import_changed_entries(
+    crkeng_xml: IndexedXML, timer: PhaseTimer, jobs=1, pool: Optional[Pool] = None
+) -> bool:
+    """
+    Brings the database up to date with crkeng_xml, going by the entries recorded
+    as ImportedEntry at the last import:
+
+     - lemmas imported from an entry that was removed or changed are deleted with
+       all their wordforms, and imported again from the entries that are left;
+     - entries that were added or changed are imported;
+     - wordforms that have the text of any of those entries get their definitions
+       again, since their definitions come from every entry with their text.
+
+    Call this in a transaction!
+
+    :return: whether anything changed
+    """
+    with timer("comparing entries"):
+        entries_by_hash = {entry_hash(entry): entry for entry in crkeng_xml}
+        imported = {
+            hash: (text, lemma_id)
+            for hash, text, lemma_id in ImportedEntry.objects.values_list(
+                "hash", "text", "lemma_id"
+            )
+        }
+        added = entries_by_hash.keys() - imported.keys()
+        removed = imported.keys() - entries_by_hash.keys()
+
+    logger.info(
+        "%d entries are new or changed, %d were removed or changed",
+        len(added),
+        len(removed),
+    )
+    if not added and not removed:
+        return False
+
+    stale_lemma_ids = {imported[hash][1] for hash in removed}
+    # Unchanged entries that were imported as one of those lemmas:
+    reimported = {
+        hash
+        for hash, (_, lemma_id) in imported.items()
+        if lemma_id in stale_lemma_ids and hash not in removed
+    }
+    changed_texts = {imported[hash][0] for hash in removed} | {
+        entries_by_hash[hash].l for hash in added
+    }
+
+    create_sources(
+        abbreviation
+        for abbreviation in crkeng_xml.source_abbreviations
+        if not DictionarySource.objects.filter(abbrv=abbreviation).exists()
+    )
+
+    with timer("deleting"):
+        logger.info("Deleting %d lemmas and their wordforms...", len(stale_lemma_ids))
+        Wordform.objects.filter(lemma_id__in=stale_lemma_ids).delete()
+
+    db_objects = DatabaseObjects(crkeng_xml, timer)
+
+    with timer("updating definitions"):
+        # As-is wordforms only ever have the definitions of their own entry
+        wordforms = list(Wordform.objects.filter(text__in=changed_texts, as_is=False))
+        logger.info("Updating the definitions of %d wordforms...", len(wordforms))
+        # Auto-translations are deleted along with the definitions they came from:
+        Definition.objects.filter(
+            wordform__in=wordforms, auto_translation_source__isnull=True
+        ).delete()
+        EnglishKeyword.objects.filter(lemma__in=wordforms).delete()
+        for wordform in wordforms:
+            lemma_text_and_word_class = (
+                fst_analysis_parser.extract_lemma_text_and_word_class(wordform.analysis)
+            )
+            assert lemma_text_and_word_class is not None
+            db_objects.add_definitions(wordform, lemma_text_and_word_class[1])
+    db_objects.insert()
+
+    # Same as the entries that are left, which were identified the same way before
+    entries_to_import = IndexedXML(
+        {entries_by_hash[hash] for hash in added | reimported},
+        crkeng_xml.source_abbreviations,
+    )
+    with timer("identifying lemmas"):
+        (
+            identified_entry_to_analysis,
+            as_is_entries,
+        ) = xml_entry_lemma_finder.identify_entries(entries_to_import)
+
+    # New entries may be the same lemma as one that's already there:
+    existing_lemmas = {
+        ProcessedEntry(
+            stem=lemma.stem or None,
+            ic=lemma.inflectional_category,
+            lemma_analysis=lemma.analysis,
+        ): lemma.id
+        for lemma in Wordform.objects.filter(
+            is_lemma=True,
+            as_is=False,
+            analysis__in=set(identified_entry_to_analysis.values()),
+        )
+    }
+
+    import_entries(
+        db_objects,
         identified_entry_to_analysis,
         as_is_entries,
-    ) = xml_entry_lemma_finder.identify_entries(
-        crkeng_xml, write_out_inconsistencies=True
+        jobs,
+        pool,
+        existing_lemmas,
     )
 
-    logger.info("Structuring wordforms, english keywords, and definition objects...")
+    with timer("homograph disambiguators"):
+        save_homograph_disambiguators()
 
-    wordform_counter = 1
-    definition_counter = 1
-    keyword_counter = 1
+    return True
 
-    def generate_english_keywords(
-        wordform: Wordform, translation: XMLTranslation
-    ) -> List[EnglishKeyword]:
-        """
-        MUTATES keyword_counter!!!!!!!!!
 
-        Returns a list of EnglishKeyword instances parsed from the translation text.
-        """
-        nonlocal keyword_counter
+def import_entries(
+    db_objects: "DatabaseObjects",
+    identified_entry_to_analysis: Mapping[XMLEntry, ConcatAnalysis],
+    as_is_entries: List[XMLEntry],
+    jobs=1,
+    pool: Optional[Pool] = None,
+    existing_lemmas: Mapping[ProcessedEntry, int] = {},
+):
+    """
+    Inserts the wordforms, definitions and keywords of the entries, a chunk at a
+    time, and records the entries as ImportedEntry.
+
+    :param jobs: how many processes to expand inflections in
+    :param pool: the processes to expand inflections in; see expand_inflections()
+    :param existing_lemmas: lemmas already in the database, by the processed
+        entry they were imported from; entries that are the same lemma are only
+        recorded as imported as that lemma
+    """
+    logger.info("Importing %d as-is entries...", len(as_is_entries))
 
-        keywords = [
-            EnglishKeyword(id=unique_id, text=english_keyword, lemma=wordform)
-            for unique_id, english_keyword in enumerate(
-                stem_keywords(translation.text), start=keyword_counter
+    # now we import as is entries to the database, the entries that we fail to provide an lemma analysis.
+    for as_is_chunk in chunked(as_is_entries, IMPORT_CHUNK_SIZE):
+        for entry in as_is_chunk:
+            db_wordform = db_objects.add_as_is_entry(entry)
+            db_objects.add_imported_entry(entry, db_wordform.id)
+        db_objects.insert()
+
+    # Entries that share a stem, inflectional category and lemma analysis are the
+    # same lemma; it's imported from the first of them.
+    entries_by_lemma: Dict[ProcessedEntry, List[XMLEntry]] = {}
+    for entry, lemma_analysis in identified_entry_to_analysis.items():
+        p_entry = ProcessedEntry(
+            stem=entry.stem, ic=entry.ic, lemma_analysis=lemma_analysis
+        )
+        entries_by_lemma.setdefault(p_entry, []).append(entry)
+
+    new_lemmas: List[Tuple[ProcessedEntry, List[XMLEntry]]] = []
+    for p_entry, entries in entries_by_lemma.items():
+        if p_entry in existing_lemmas:
+            for entry in entries:
+                db_objects.add_imported_entry(entry, existing_lemmas[p_entry])
+        else:
+            new_lemmas.append((p_entry, entries))
+
+    imported_lemma_count = 0
+
+    # now we import identified entries to the database, the entries we successfully identify with their lemma analyses
+    # (each process expanding inflections gets a chunk's worth of lemmas)
+    for lemma_chunk in chunked(new_lemmas, IMPORT_CHUNK_SIZE * max(jobs, 1)):
+        logger.info(
+            "Importing lemmas %d to %d of %d...",
+            imported_lemma_count + 1,
+            imported_lemma_count + len(lemma_chunk),
+            len(new_lemmas),
+        )
+
+        # generate ALL inflections within the paradigm tables from the lemma analysis
+        with db_objects.timer("expanding inflections"):
+            expanded = expand_inflections(
+                (p_entry.lemma_analysis for p_entry, _ in lemma_chunk),
+                verbose=False,
+                jobs=jobs,
+                pool=pool,
             )
-        ]
-        keyword_counter += len(keywords)
-        return keywords
 
-    db_inflections: List[Wordform] = []
-    db_definitions: List[Definition] = []
-    db_keywords: List[EnglishKeyword] = []
-    citations: Dict[int, Set[str]] = {}
+        for p_entry, entries in lemma_chunk:
+            db_lemma = db_objects.add_lemma(
+                entries[0], p_entry.lemma_analysis, expanded[p_entry.lemma_analysis]
+            )
+            for entry in entries:
+                db_objects.add_imported_entry(entry, db_lemma.id)
+
+        db_objects.insert()
+        imported_lemma_count += len(lemma_chunk)
 
-    # now we import as is entries to the database, the entries that we fail to provide an lemma analysis.
-    for entry in as_is_entries:
+    # the entries recorded as imported as existing lemmas, if nothing else:
+    db_objects.insert()
+    logger.info("Done inserting.")
+
+
+class DatabaseObjects:
+    """
+    Builds the rows of imported entries, numbered after those already in the
+    database, and inserts them a chunk at a time.
+    """
+
+    def __init__(self, crkeng_xml: IndexedXML, timer: PhaseTimer):
+        self.crkeng_xml = crkeng_xml
+        self.timer = timer
+
+        self._next_wordform_id = _next_id(Wordform)
+        self._next_definition_id = _next_id(Definition)
+        self._next_keyword_id = _next_id(EnglishKeyword)
+
+        # These hold the objects of the current chunk only; see insert()
+        self.wordforms: List[Wordform] = []
+        self.definitions: List[Definition] = []
+        self.keywords: List[EnglishKeyword] = []
+        self.citations: Dict[int, Set[str]] = {}
+        self.imported_entries: List[ImportedEntry] = []
+
+    def insert(self):
+        """
+        Inserts the objects of the current chunk to the database, and forgets them.
+        """
+        logger.debug(
+            "Inserting %d inflections, %d definitions and %d English keywords...",
+            len(self.wordforms),
+            len(self.definitions),
+            len(self.keywords),
+        )
+        with self.timer("inserting"):
+            Wordform.objects.bulk_create(self.wordforms)
+            Definition.objects.bulk_create(self.definitions)
+            EnglishKeyword.objects.bulk_create(self.keywords)
+            ImportedEntry.objects.bulk_create(self.imported_entries)
+        with self.timer("inserting citations"):
+            insert_citations(self.citations)
+
+        self.wordforms.clear()
+        self.definitions.clear()
+        self.keywords.clear()
+        self.citations.clear()
+        self.imported_entries.clear()
+
+    def add_imported_entry(self, entry: XMLEntry, lemma_id: int):
+        self.imported_entries.append(
+            ImportedEntry(hash=entry_hash(entry), text=entry.l, lemma_id=lemma_id)
+        )
+
+    def add_as_is_entry(self, entry: XMLEntry) -> Wordform:
+        """
+        Adds an entry that we fail to provide a lemma analysis for, as a lemma of
+        its own.
+        """
         upper_pos = entry.pos.upper()
         wordform_dict = dict(
-            id=wordform_counter,
+            id=self._take_wordform_id(),
             text=entry.l,
             analysis=generate_as_is_analysis(entry.l, entry.pos, entry.ic),
             pos=upper_pos if upper_pos in RECOGNIZABLE_POS else "",
@@ -208,33 +559,29 @@ def import_xmls(crkeng_file_path: Path, verbose=True):
 
         # Insert keywords for as-is entries
         for translation in entry.translations:
-            db_keywords.extend(generate_english_keywords(db_wordform, translation))
+            self._add_english_keywords(db_wordform, translation)
 
         db_wordform.lemma = db_wordform
 
-        wordform_counter += 1
-        db_inflections.append(db_wordform)
+        self.wordforms.append(db_wordform)
 
         for str_definition, source_strings in entry.translations:
+            self._add_definition(db_wordform, str_definition, source_strings)
 
-            db_definition = Definition(
-                id=definition_counter, text=str_definition, wordform=db_wordform
-            )
-
-            # Figure out what citations we should be making.
-            assert definition_counter not in citations
-            citations[definition_counter] = set(source_strings)
-
-            definition_counter += 1
-            db_definitions.append(db_definition)
+        return db_wordform
 
-    # generate ALL inflections within the paradigm tables from the lemma analysis
-    expanded = expand_inflections(identified_entry_to_analysis.values())
-
-    seen_lemmas: Set[ProcessedEntry] = set()
+    def add_lemma(
+        self,
+        entry: XMLEntry,
+        lemma_analysis: str,
+        expanded: List[Tuple[str, Set[str]]],
+    ) -> Wordform:
+        """
+        Adds an entry we successfully identified with its lemma analysis, with all
+        the inflections expanded from it.
 
-    # now we import identified entries to the database, the entries we successfully identify with their lemma analyses
-    for (entry, lemma_analysis) in identified_entry_to_analysis.items():
+        :return: the lemma
+        """
         lemma_text_and_word_class = (
             fst_analysis_parser.extract_lemma_text_and_word_class(lemma_analysis)
         )
@@ -243,18 +590,11 @@ def import_xmls(crkeng_file_path: Path, verbose=True):
         fst_lemma_text, word_class = lemma_text_and_word_class
         generated_pos = word_class.pos
 
-        p_entry = ProcessedEntry(
-            stem=entry.stem, ic=entry.ic, lemma_analysis=lemma_analysis
-        )
-        if p_entry in seen_lemmas:
-            continue
-        seen_lemmas.add(p_entry)
-
         db_wordforms_for_analysis = []
         db_lemma = None
 
         # build wordforms and definition in db
-        for generated_analysis, generated_wordform_texts in expanded[lemma_analysis]:
+        for generated_analysis, generated_wordform_texts in expanded:
 
             generated_lemma_text_and_ic = (
                 fst_analysis_parser.extract_lemma_text_and_word_class(
@@ -275,7 +615,7 @@ def import_xmls(crkeng_file_path: Path, verbose=True):
                 else:
                     is_lemma = False
                 wordform_dict = dict(
-                    id=wordform_counter,
+                    id=self._take_wordform_id(),
                     text=generated_wordform_text,
                     analysis=generated_analysis,
                     is_lemma=is_lemma,
@@ -288,64 +628,107 @@ def import_xmls(crkeng_file_path: Path, verbose=True):
                 db_wordform = Wordform(**wordform_dict)
 
                 db_wordforms_for_analysis.append(db_wordform)
-                wordform_counter += 1
-                db_inflections.append(db_wordform)
+                self.wordforms.append(db_wordform)
 
                 if is_lemma:
                     db_lemma = db_wordform
 
-                # now we create definition for all (possibly non-lemma) entries in the xml that are forms of this lemma.
+                self.add_definitions(db_wordform, generated_ic)
 
-                # try to match our generated wordform to entries in the xml file,
-                # in order to get its translation from the entries
-                entries_with_translations: List[XMLEntry] = []
+        assert db_lemma is not None
+        for wordform in db_wordforms_for_analysis:
+            wordform.lemma = db_lemma
 
-                # first get homographic entries from the xml file
-                homographic_entries = crkeng_xml.filter(l=generated_wordform_text)
+        return db_lemma
 
-                # The case when we do have homographic entries in xml,
-                # Then we check whether these entries' pos and ic agrees with our generated wordform
-                if len(homographic_entries) > 0:
-                    for homographic_entry in homographic_entries:
-                        if does_inflectional_category_match_xml_entry(
-                            generated_ic, homographic_entry.pos, homographic_entry.ic
-                        ):
-                            entries_with_translations.append(homographic_entry)
+    def add_definitions(self, db_wordform: Wordform, generated_ic: WordClass):
+        """
+        Adds definitions for a (possibly non-lemma) wordform from all the entries in
+        the xml that are forms of it.
+        """
+        # try to match our generated wordform to entries in the xml file,
+        # in order to get its translation from the entries
+        entries_with_translations: List[XMLEntry] = []
+
+        # first get homographic entries from the xml file
+        homographic_entries = self.crkeng_xml.filter(l=db_wordform.text)
+
+        # The case when we do have homographic entries in xml,
+        # Then we check whether these entries' pos and ic agrees with our generated wordform
+        if len(homographic_entries) > 0:
+            for homographic_entry in homographic_entries:
+                if does_inflectional_category_match_xml_entry(
+                    generated_ic, homographic_entry.pos, homographic_entry.ic
+                ):
+                    entries_with_translations.append(homographic_entry)
 
-                # The case when we don't have homographic entries in xml,
-                # The generated inflection doesn't have a definition
+        # The case when we don't have homographic entries in xml,
+        # The generated inflection doesn't have a definition
 
-                for entry_with_translation in entries_with_translations:
+        for entry_with_translation in entries_with_translations:
 
-                    for translation in entry_with_translation.translations:
-                        db_definition = Definition(
-                            id=definition_counter,
-                            text=translation.text,
-                            wordform=db_wordform,
-                        )
-                        assert definition_counter not in citations
-                        citations[definition_counter] = set(translation.sources)
+            for translation in entry_with_translation.translations:
+                self._add_definition(db_wordform, translation.text, translation.sources)
+                self._add_english_keywords(db_wordform, translation)
 
-                        definition_counter += 1
-                        db_definitions.append(db_definition)
+    def _add_definition(
+        self, db_wordform: Wordform, text: str, sources: Iterable[str]
+    ) -> None:
+        db_definition = Definition(
+            id=self._next_definition_id, text=text, wordform=db_wordform
+        )
 
-                        db_keywords.extend(
-                            generate_english_keywords(db_wordform, translation)
-                        )
+        # Figure out what citations we should be making.
+        assert self._next_definition_id not in self.citations
+        self.citations[self._next_definition_id] = set(sources)
 
-        assert db_lemma is not None
-        for wordform in db_wordforms_for_analysis:
-            wordform.lemma = db_lemma
+        self._next_definition_id += 1
+        self.definitions.append(db_definition)
 
-    logger.info("Inserting %d inflections to database..." % len(db_inflections))
-    Wordform.objects.bulk_create(db_inflections)
-    logger.info("Done inserting.")
+    def _add_english_keywords(self, wordform: Wordform, translation: XMLTranslation):
+        """
+        Adds the EnglishKeyword instances parsed from the translation text.
+        """
+        keywords = [
+            EnglishKeyword(id=unique_id, text=english_keyword, lemma=wordform)
+            for unique_id, english_keyword in enumerate(
+                stem_keywords(translation.text), start=self._next_keyword_id
+            )
+        ]
+        self._next_keyword_id += len(keywords)
+        self.keywords.extend(keywords)
 
-    logger.info("Inserting definition to database...")
-    Definition.objects.bulk_create(db_definitions)
-    logger.info("Done inserting.")
+    def _take_wordform_id(self) -> int:
+        wordform_id = self._next_wordform_id
+        self._next_wordform_id += 1
+        return wordform_id
+
+
+def _next_id(model) -> int:
+    """
+    The id after the highest one of the model's table, which is 1 when it's empty.
+    """
+    return (model.objects.aggregate(max_id=Max("pk"))["max_id"] or 0) + 1
 
-    logger.info("Inserting citations [definition -> dictionary source] to database...")
+
+def create_sources(source_abbreviations: Iterable[str]):
+    source_abbreviations = list(source_abbreviations)
+    logger.info("Sources parsed: %r", source_abbreviations)
+    for source_abbreviation in source_abbreviations:
+        src = DictionarySource(abbrv=source_abbreviation)
+        src.save()
+        logger.info("Created source: %s", source_abbreviation)
+
+
+def insert_citations(citations: Dict[int, Set[str]]):
+    """
+    Inserts the citations [definition -> dictionary source] of some definitions to
+    the database, in batches of rows of the "hidden" many-to-many model, since
+    Definition.citations.add() would take queries for every definition.
+
+    :param citations: the abbreviations of the sources each definition cites, by
+        definition id
+    """
     # ThroughModel is the "hidden" model that manages the Many-to-Many
     # relationship
     ThroughModel = Definition.citations.through
@@ -356,18 +739,39 @@ def import_xmls(crkeng_file_path: Path, verbose=True):
             for src_pk in src_ids:
                 yield ThroughModel(definition_id=dfn_id, dictionarysource_id=src_pk)
 
-    ThroughModel.objects.bulk_create(_generate_through_models())
-    logger.info("Done inserting.")
+    # A definition cites each source once; rows that are already there are skipped:
+    ThroughModel.objects.bulk_create(
+        _generate_through_models(),
+        batch_size=CITATION_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
 
-    logger.info("Inserting English keywords to database...")
-    EnglishKeyword.objects.bulk_create(db_keywords)
-    logger.info("Done inserting.")
 
-    # Convert the sources (stored as a string) to citations
-    # The reason why this is not done in the first place and there is a conversion:
-    #   django's efficient `bulk_create` method we use above doesn't play well with ManyToManyField
-    for dfn in Definition.objects.all():
-        source_ids = sorted(source.abbrv for source in dfn.citations.all())
-        for source_id in source_ids:
-            dfn.citations.add(source_id)
-        dfn.save()
+def save_homograph_disambiguators():
+    """
+    Works out the URL of every lemma in the database, so that pages don't have to
+    look for homographs when they link to a lemma. Only the lemmas whose
+    disambiguator changed are updated.
+    """
+    # Only the fields homograph_disambiguators() needs, rather than whole Wordforms:
+    lemmas = Wordform.objects.filter(is_lemma=True).values_list(
+        "id",
+        "text",
+        "pos",
+        "inflectional_category",
+        "analysis",
+        "homograph_disambiguator",
+        named=True,
+    )
+    saved = {lemma.id: lemma.homograph_disambiguator for lemma in lemmas}
+    disambiguators = homograph_disambiguators(lemmas)
+
+    Wordform.objects.bulk_update(
+        [
+            Wordform(id=lemma_id, homograph_disambiguator=disambiguator)
+            for lemma_id, disambiguator in disambiguators.items()
+            if disambiguator != saved[lemma_id]
+        ],
+        ["homograph_disambiguator"],
+        batch_size=500,
+    )
@@ -12,7 +12,7 @@ from django.core.management import BaseCommand
 from django.db.models import Max, Q, prefetch_related_objects
 from tqdm import tqdm
 
-from API.models import Wordform, Definition, DictionarySource
+from API.models import Wordform, Definition, DictionaryImport, DictionarySource
 from phrase_translate.definition_processing import remove_parentheticals
 from phrase_translate.tag_map import UnknownTagError
 from phrase_translate.translate import (
@@ -208,6 +208,8 @@ class Command(BaseCommand):
 
         definition_buffer.save()
         citation_buffer.save()
+        # So that cached search results get the new definitions:
+        DictionaryImport.objects.create(source="translatewordforms", incremental=True)
         logger.info("Translation done")
 
     def write_translations_to_jsonl(self, filename):
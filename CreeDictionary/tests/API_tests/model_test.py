@@ -3,10 +3,22 @@ import json
 import pytest
 from hypothesis import assume, given
 
-from API.models import Wordform
+from API.models import (
+    DictionaryImport,
+    Wordform,
+    dictionary_version,
+    homograph_disambiguators,
+    wordform_cache,
+)
 from API.search import search
+from API.search.core import SearchRun
+from API.search.lookup import fetch_results
+from API.search.ranking import sort_by_user_query
+from API.search.types import Result
 from API.search.util import to_sro_circumflex
 from tests.conftest import lemmas
+from utils import get_modified_distance
+from utils.english_keyword_extraction import stem_keywords
 
 
 @pytest.mark.django_db
@@ -121,6 +133,19 @@ def test_compare_simple_vs_affix_search() -> None:
     assert results_contains_wordform(lemma, general_results)
 
 
+@pytest.mark.django_db
+def test_misspelled_query_gets_fuzzy_results() -> None:
+    """
+    A query too misspelled for the FST to analyze still suggests similar lemmas.
+    """
+    results = search(query="acahkoss").presentation_results()
+    assert results_contains_wordform("acâhkos", results)
+    assert not results_contains_wordform(
+        "acâhkos",
+        search(query="acahkoss", include_affixes=False).presentation_results(),
+    )
+
+
 @pytest.mark.django_db
 def test_search_for_pronoun() -> None:
     """
@@ -197,6 +222,41 @@ def test_search_serialization_json_parsable(query):
         raise
 
 
+@pytest.mark.django_db
+def test_presentation_is_the_same_when_cached():
+    """
+    The presentation of analyses and word classes is cached; cached results must be
+    the same as fresh ones.
+    """
+    from API.search.presentation import present_analysis, present_word_class
+
+    present_analysis.cache_clear()
+    present_word_class.cache_clear()
+    fresh = search(query="nitawi-nipâw").serialized_presentation_results()
+    cached = search(query="nitawi-nipâw").serialized_presentation_results()
+
+    assert present_analysis.cache_info().hits > 0
+    assert present_word_class.cache_info().hits > 0
+    assert json.dumps(cached) == json.dumps(fresh)
+    assert fresh[0]["relevant_tags"]
+
+
+@pytest.mark.django_db
+def test_serialized_wordform_has_every_field():
+    from django.forms import model_to_dict
+
+    from API.search.presentation import WordformSerializer, serialize_wordform
+
+    wordform = Wordform.objects.get(text="nipâw", is_lemma=True)
+    serialized = serialize_wordform(wordform)
+    assert model_to_dict(wordform).items() <= serialized.items()
+    assert serialized["lemma_url"] == wordform.get_absolute_url()
+
+    serializer = WordformSerializer()
+    assert serializer(wordform) == serialized
+    assert serializer(wordform) is serializer(wordform)
+
+
 @pytest.mark.django_db
 def test_search_words_with_preverbs():
     """
@@ -287,6 +347,96 @@ def test_search_results_order(query: str, top_result: str, later_result: str):
     ), f"{top_result} did not come before {later_result}"
 
 
+@pytest.mark.django_db
+def test_ranking_uses_the_distance_of_the_result():
+    wordform = Wordform.objects.filter(text="nipâw", is_lemma=True).first()
+    result = Result(
+        wordform, source_language_match="nipâw", query_wordform_edit_distance=42.0
+    )
+
+    _, distance, _ = sort_by_user_query(SearchRun("nipâw"))(result)
+    assert distance == 42.0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["wâpamêw", "acâhkos", "nipâw"])
+def test_source_language_results_sorted_by_edit_distance(query: str):
+    """
+    Source-language matches are ordered by their edit distance to the query.
+    """
+    results = search(query=query).sorted_results()
+    assert results[0].wordform.text == query
+
+    distances = [
+        get_modified_distance(query, r.wordform.text)
+        for r in results
+        if r.did_match_source_language
+    ]
+    assert distances == sorted(distances)
+
+
+@pytest.mark.django_db
+def test_stored_homograph_disambiguators_are_up_to_date():
+    lemmas = list(Wordform.objects.filter(is_lemma=True))
+    expected = homograph_disambiguators(lemmas)
+    assert {lemma.id: lemma.homograph_disambiguator for lemma in lemmas} == expected
+    assert "pos" in expected.values()
+
+
+@pytest.mark.django_db
+def test_saving_a_homograph_disambiguates_existing_lemmas():
+    (lemma,) = Wordform.objects.filter(text="wâpamêw", is_lemma=True)
+    assert lemma.homograph_disambiguator is None
+
+    homograph = Wordform(
+        text="wâpamêw", pos="N", inflectional_category="NA-1", analysis="wâpamêw+N+A+Sg"
+    )
+    homograph.is_lemma = True
+    homograph.save()
+
+    lemma.refresh_from_db()
+    assert lemma.homograph_disambiguator is not None
+    assert homograph.homograph_disambiguator is not None
+    assert lemma.get_absolute_url() != homograph.get_absolute_url()
+
+
+@pytest.mark.django_db
+def test_lemma_urls_do_not_query_the_database(django_assert_num_queries):
+    lemmas = list(Wordform.objects.filter(text="ôma", is_lemma=True))
+    with django_assert_num_queries(0):
+        urls = {lemma.get_absolute_url() for lemma in lemmas}
+    assert len(urls) == len(lemmas)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["story", "tell a story about dogs"])
+def test_english_keywords_are_looked_up_together(query, django_assert_num_queries):
+    # Loading the lexicon index and the preverbs queries the database once only:
+    wordform_cache.LEXICON_INDEX, wordform_cache.PREVERB_ASCII_LOOKUP
+    search_run = SearchRun(query)
+
+    # One query for the keywords, and one for the lemmas they match:
+    with django_assert_num_queries(2):
+        fetch_results(search_run)
+
+    matched_keywords = {
+        keyword
+        for result in search_run.unsorted_results()
+        for keyword in result.target_language_keyword_match
+    }
+    assert matched_keywords == set(stem_keywords(query))
+
+
+@pytest.mark.django_db
+def test_dictionary_version_changes_with_every_import(django_assert_num_queries):
+    with django_assert_num_queries(1):
+        before = dictionary_version()
+
+    DictionaryImport.objects.create(source="crkeng.xml", incremental=True)
+
+    assert dictionary_version() != before
+
+
 ####################################### Helpers ########################################
 
 
@@ -0,0 +1,77 @@
+import pytest
+
+from API.search.affix import AffixSearcher
+from utils import get_modified_distance
+
+WORDS = [
+    "acâhkos",
+    "acâhkosiwiw",
+    "atâhk",
+    "maskwa",
+    "minôs",
+    "nipâw",
+    "nipâwin",
+    "niyaw",
+    "pê-nipâw",
+    "wâpamêw",
+]
+
+
+@pytest.fixture(scope="module")
+def searcher() -> AffixSearcher:
+    return AffixSearcher((text, i) for i, text in enumerate(WORDS))
+
+
+@pytest.mark.parametrize("query", ["nipaww", "acahkoss", "atak", "maskwak", "x"])
+@pytest.mark.parametrize("max_distance", [0, 0.5, 1, 2])
+def test_search_by_similarity(searcher: AffixSearcher, query: str, max_distance):
+    """
+    The trie walk finds exactly the words within max_distance of the query, when
+    diacritics are ignored.
+    """
+    expected = {
+        i
+        for i, text in enumerate(WORDS)
+        if get_modified_distance(
+            AffixSearcher.to_simplified_form(text),
+            AffixSearcher.to_simplified_form(query),
+        )
+        <= max_distance
+    }
+    assert set(searcher.search_by_similarity(query, max_distance)) == expected
+
+
+def test_prefix_and_suffix_search(searcher: AffixSearcher):
+    assert set(searcher.search_by_prefix("nipâ")) == {5, 6}
+    assert set(searcher.search_by_suffix("nipaw")) == {5, 8}
+
+
+def test_saved_searcher_round_trips(searcher: AffixSearcher, tmp_path):
+    searcher.save(tmp_path, "cree", version="1")
+    loaded = AffixSearcher.load(tmp_path, "cree", version="1")
+
+    assert loaded is not None
+    for query in ["a", "nip", "aw", "kos"]:
+        assert list(loaded.search_by_prefix(query)) == list(
+            searcher.search_by_prefix(query)
+        )
+        assert list(loaded.search_by_suffix(query)) == list(
+            searcher.search_by_suffix(query)
+        )
+    assert set(loaded.search_by_similarity("nipaww", 2)) == set(
+        searcher.search_by_similarity("nipaww", 2)
+    )
+
+
+def test_saved_searcher_is_invalidated_by_reimport(searcher: AffixSearcher, tmp_path):
+    searcher.save(tmp_path, "cree", version="1")
+
+    assert AffixSearcher.load(tmp_path, "cree", version="2") is None
+    assert AffixSearcher.load(tmp_path, "english", version="1") is None
+
+
+def test_search_by_affix_keeps_the_shortest_matches(searcher: AffixSearcher):
+    # nipâw, nipâwin, and pê-nipâw all match; the shortest are kept
+    assert searcher.search_by_affix("nipaw") == [5, 6, 8]
+    assert searcher.search_by_affix("nipaw", limit=2) == [5, 6]
+    assert searcher.search_by_affix("nipaw", limit=0) == []
@@ -0,0 +1,105 @@
+import pytest
+
+from API.models import LexiconIndex, Wordform, WordformRow
+
+
+@pytest.fixture
+def lexicon_index() -> LexiconIndex:
+    rows = [
+        WordformRow(
+            1,
+            "nipâw",
+            "VAI-1",
+            "V",
+            "nipâw+V+AI+Ind+3Sg",
+            None,
+            True,
+            False,
+            1,
+            "nipâ-",
+        ),
+        WordformRow(
+            2,
+            "ninipân",
+            "VAI-1",
+            "V",
+            "nipâw+V+AI+Ind+1Sg",
+            None,
+            False,
+            False,
+            1,
+            "nipâ-",
+        ),
+        WordformRow(3, "nipâw", "", "", "nipâw+N", None, True, True, 3, "", "pos"),
+        WordformRow(7, "ôma", "PrI", "", "ôma+Ipc", None, True, True, 7, ""),
+    ]
+    return LexiconIndex(rows, cw_wordform_ids=[3])
+
+
+def test_lookup_by_analysis(lexicon_index: LexiconIndex):
+    assert lexicon_index.wordform_ids_with_analysis("nipâw+V+AI+Ind+1Sg") == [2]
+    assert lexicon_index.wordform_ids_with_analysis("nipâw+V+AI+Ind+2Sg") == []
+
+
+def test_lookup_by_text(lexicon_index: LexiconIndex):
+    assert lexicon_index.wordform_ids_with_text("nipâw", is_lemma=True) == [1, 3]
+    assert lexicon_index.wordform_ids_with_text("ninipân", is_lemma=True) == []
+    assert lexicon_index.wordform_ids_with_text("ninipân", is_lemma=False) == [2]
+
+
+def test_row_round_trips(lexicon_index: LexiconIndex):
+    row = lexicon_index.row(2)
+    assert row == WordformRow(
+        2, "ninipân", "VAI-1", "V", "nipâw+V+AI+Ind+1Sg", None, False, False, 1, "nipâ-"
+    )
+    assert 7 in lexicon_index
+    assert 4 not in lexicon_index
+    with pytest.raises(KeyError):
+        lexicon_index.row(4)
+
+
+def test_homograph_disambiguators(lexicon_index: LexiconIndex):
+    assert lexicon_index.row(3).homograph_disambiguator == "pos"
+    assert lexicon_index.row(1).homograph_disambiguator is None
+    (lemma,) = lexicon_index.wordforms([3])
+    assert lemma.get_absolute_url().endswith("?pos=")
+
+
+def test_cw_definitions(lexicon_index: LexiconIndex):
+    assert lexicon_index.has_cw_definition(3)
+    assert not lexicon_index.has_cw_definition(1)
+
+
+def test_materialized_wordforms_share_lemma(lexicon_index: LexiconIndex):
+    lemma, inflection = lexicon_index.wordforms([1, 2])
+    assert isinstance(inflection, Wordform)
+    assert inflection.text == "ninipân"
+    assert inflection.lemma.text == "nipâw"
+    assert lemma.lemma is lemma
+
+
+def test_rows_must_be_sorted():
+    rows = [
+        WordformRow(2, "a", "", "", "", None, True, True, 2, ""),
+        WordformRow(1, "b", "", "", "", None, True, True, 1, ""),
+    ]
+    with pytest.raises(ValueError):
+        LexiconIndex(rows)
+
+
+@pytest.mark.django_db
+def test_index_agrees_with_database():
+    lexicon_index = LexiconIndex.from_database()
+    assert len(lexicon_index) == Wordform.objects.count()
+
+    for wordform in Wordform.objects.filter(text="nipâw"):
+        assert wordform.id in lexicon_index.wordform_ids_with_analysis(
+            wordform.analysis
+        )
+        assert wordform.id in lexicon_index.wordform_ids_with_text(
+            wordform.text, is_lemma=wordform.is_lemma
+        )
+        (materialized,) = lexicon_index.wordforms([wordform.id])
+        assert materialized.analysis == wordform.analysis
+        assert materialized.lemma_id == wordform.lemma_id
+        assert materialized.homograph_disambiguator == wordform.homograph_disambiguator
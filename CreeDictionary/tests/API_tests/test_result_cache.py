@@ -0,0 +1,79 @@
+import pytest
+
+from API.search import cached_search, search_with_affixes
+from API.search import result_cache
+from API.search.result_cache import SearchCacheKey, SearchResultCache
+
+
+@pytest.fixture
+def dictionary_version(monkeypatch):
+    """
+    Pretend the dictionary is at version "1"; set .version to re-import it.
+    """
+
+    class FakeVersion:
+        version = "1"
+
+    fake = FakeVersion()
+    monkeypatch.setattr(result_cache, "dictionary_version", lambda: fake.version)
+    return fake
+
+
+def key(query: str) -> SearchCacheKey:
+    return SearchCacheKey.for_query(
+        query, include_affixes=True, include_auto_definitions=False
+    )
+
+
+def test_keys_are_normalized():
+    assert key("Nipāw ") == key("nipâw")
+    assert key("nipâw") != key("verbose:1 nipâw")
+    assert key("nipâw") != key("auto:1 nipâw")
+
+
+def test_hits_and_misses(dictionary_version):
+    cache = SearchResultCache(max_entries=10, max_results=100)
+    searches = []
+
+    def search():
+        searches.append(1)
+        return [{"n": len(searches)}]
+
+    assert cache.get_or_search(key("nipâw"), search) == [{"n": 1}]
+    assert cache.get_or_search(key("nipâw"), search) == [{"n": 1}]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_least_recently_used_is_evicted(dictionary_version):
+    cache = SearchResultCache(max_entries=2, max_results=100)
+    cache.get_or_search(key("a"), lambda: [])
+    cache.get_or_search(key("b"), lambda: [])
+    cache.get_or_search(key("a"), lambda: [])
+    cache.get_or_search(key("c"), lambda: [])
+
+    assert cache.get_or_search(key("a"), lambda: ["searched"]) == []
+    assert cache.get_or_search(key("b"), lambda: ["searched"]) == ["searched"]
+
+
+def test_large_responses_are_evicted(dictionary_version):
+    cache = SearchResultCache(max_entries=10, max_results=3)
+    cache.get_or_search(key("a"), lambda: [1, 2])
+    cache.get_or_search(key("b"), lambda: [1, 2])
+
+    assert len(cache) == 1
+    assert cache.get_or_search(key("a"), lambda: ["searched"]) == ["searched"]
+
+
+def test_reimport_invalidates(dictionary_version):
+    cache = SearchResultCache(max_entries=10, max_results=100)
+    cache.get_or_search(key("a"), lambda: ["old"])
+
+    dictionary_version.version = "2"
+    assert cache.get_or_search(key("a"), lambda: ["new"]) == ["new"]
+
+
+@pytest.mark.django_db
+def test_cached_search_matches_search():
+    assert cached_search("nipâw") == search_with_affixes("nipâw")
+    assert cached_search("nipâw") == search_with_affixes("nipâw")
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from django.urls import reverse
 
@@ -52,3 +54,20 @@ def test_click_in_text_disables_affix_search(client):
         reverse("cree-dictionary-word-click-in-text-api") + f"?q={ASCII_WAPAMEW}"
     ).content.decode("utf-8")
     assert EXPECTED_SUFFIX_SEARCH_RESULT not in click_in_text_response
+
+
+@pytest.mark.django_db
+def test_click_in_text_json_is_the_same_as_json_response(client):
+    from django.http import JsonResponse
+
+    from API.search import cached_search
+
+    response = client.get(
+        reverse("cree-dictionary-word-click-in-text-api") + "?q=niskak"
+    )
+
+    assert response["Content-Type"] == "application/json"
+    results = cached_search("niskak", include_affixes=False)
+    assert json.loads(response.content) == json.loads(
+        JsonResponse({"results": results}).content
+    )
@@ -3,7 +3,14 @@
 
 import pytest
 
-from CreeDictionary.hfstol import analyze, generate
+from CreeDictionary.hfstol import (
+    MemoizedTransducer,
+    analyze,
+    analyze_many,
+    generate,
+    generate_many,
+)
+from shared import expensive
 
 
 @pytest.mark.parametrize(
@@ -87,3 +94,36 @@ def test_analyses_do_not_contain_err_frag():
         "+Err/Frag" not in analysis.raw_suffixes
         for analysis in analyze(possible_fragment)
     )
+
+
+def test_analyze_many_and_generate_many():
+    wordforms = ["wâpamêw", "niskak", "wâpamêw", "pîpîpôpô"]
+    analyses = analyze_many(wordforms)
+    assert list(analyses) == ["wâpamêw", "niskak", "pîpîpôpô"]
+    for wordform, wordform_analyses in analyses.items():
+        assert wordform_analyses == tuple(analyze(wordform))
+
+    generated = generate_many(["IC+nipâw+V+AI+Cnj+3Sg", "pîpîpôpô+Ipc"])
+    assert "nêpât" in generated["IC+nipâw+V+AI+Cnj+3Sg"]
+    assert generated["pîpîpôpô+Ipc"] == ()
+
+
+def test_memoized_transducer():
+    generator = MemoizedTransducer("strict_generator", maxsize=2)
+    analysis = "wâpamêw+V+TA+Ind+3Sg+4Sg/PlO"
+
+    assert generator.lookup(analysis) == tuple(
+        expensive.strict_generator.lookup(analysis)
+    )
+    generator.lookup(analysis)
+    assert (generator.hits, generator.misses) == (1, 1)
+    assert generator.hit_rate == 0.5
+
+    assert generator.bulk_lookup(
+        ["IC+nipâw+V+AI+Cnj+3Sg", "pîpîpôpô+Ipc"]
+    ) == expensive.strict_generator.bulk_lookup(
+        ["IC+nipâw+V+AI+Cnj+3Sg", "pîpîpôpô+Ipc"]
+    )
+    # Only the two most recent lookups are remembered
+    generator.lookup(analysis)
+    assert generator.misses == 4
@@ -180,6 +180,34 @@ def test_produces_fst_analysis_string(na_layout: ParadigmLayout):
     assert expected_lines == set(generated_analyses)
 
 
+def test_fill_matches_filling_pane_by_pane(pronoun_paradigm_path: Path):
+    layout = ParadigmLayout.loads(pronoun_paradigm_path.read_text(encoding="UTF-8"))
+    forms = {
+        cell.analysis: {f"form{i}"} for i, cell in enumerate(layout.inflection_cells)
+    }
+
+    paradigm = layout.fill(forms)
+
+    assert list(paradigm.panes) == [pane.fill(forms) for pane in layout.panes]
+    assert paradigm.contains_wordform("form0")
+
+
+def test_fill_keeps_missing_forms(na_layout: ParadigmLayout):
+    forms = {cell.analysis: {"minôs"} for cell in na_layout.inflection_cells}
+
+    paradigm = na_layout.fill(forms)
+
+    assert any("--" in str(pane) for pane in paradigm.panes)
+    assert paradigm.contains_wordform("minôs")
+    assert not any(
+        isinstance(cell, InflectionTemplate)
+        for pane in paradigm.panes
+        for row in pane.rows
+        if isinstance(row, ContentRow)
+        for cell in row.cells
+    )
+
+
 @pytest.fixture
 def na_layout_path(shared_datadir: Path) -> Path:
     """
@@ -0,0 +1,193 @@
+from importlib import import_module
+
+import pytest
+from utils import ParadigmSize, WordClass, shared_res_dir
+
+from CreeDictionary.paradigm.cache import (
+    ParadigmCache,
+    ParadigmKey,
+    ParadigmStore,
+    compute_version,
+)
+from CreeDictionary.paradigm.filler import ParadigmFiller
+
+NIPAW = ParadigmKey("nipâw", "VAI", "BASIC")
+MINOS = ParadigmKey("minôs", "NA", "BASIC")
+
+
+@pytest.fixture
+def store(tmp_path) -> ParadigmStore:
+    return ParadigmStore(tmp_path / "paradigms.sqlite3", version="1")
+
+
+class Generator:
+    """
+    Counts how many paradigms were generated.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, key: ParadigmKey = NIPAW):
+        self.calls += 1
+        return (f"{key.lemma} {self.calls}", "")
+
+
+def test_store_round_trip(store: ParadigmStore):
+    assert store.get(NIPAW) is None
+    store.put(NIPAW, ("nipâw", "", "ninipân / ninipân"))
+    assert store.get(NIPAW) == ("nipâw", "", "ninipân / ninipân")
+    assert NIPAW in store
+    assert len(store) == 1
+
+
+def test_store_many(store: ParadigmStore):
+    store.put_many([(NIPAW, ("nipâw",)), (MINOS, ("minôs",))])
+    assert store.keys() == {NIPAW, MINOS}
+    assert store.get(MINOS) == ("minôs",)
+
+
+def test_versions_are_kept_apart(store: ParadigmStore):
+    store.put(NIPAW, ("nipâw",))
+    store.add_visits({NIPAW: 2})
+
+    # e.g., a server that was updated while this one wasn't:
+    updated = ParadigmStore(store.path, version="2")
+    assert updated.get(NIPAW) is None
+    assert len(updated) == 0
+    assert updated.most_visited(10) == [NIPAW]
+    assert store.get(NIPAW) == ("nipâw",)
+
+
+def test_prune_other_versions(store: ParadigmStore):
+    store.put(NIPAW, ("nipâw",))
+    updated = ParadigmStore(store.path, version="2")
+    updated.put(MINOS, ("minôs",))
+
+    assert updated.prune_other_versions() == 1
+    assert store.get(NIPAW) is None
+    assert updated.keys() == {MINOS}
+
+
+def test_store_failures_are_only_logged(tmp_path):
+    # A directory can't be opened as a database:
+    (tmp_path / "paradigms.sqlite3").mkdir()
+    broken = ParadigmStore(tmp_path / "paradigms.sqlite3", version="1")
+
+    assert broken.get(NIPAW) is None
+    broken.put(NIPAW, ("nipâw",))
+    assert broken.keys() == set()
+    assert broken.most_visited(10) == []
+    assert len(broken) == 0
+    assert broken.prune_other_versions() == 0
+
+
+def test_memory_then_store_then_generate(store: ParadigmStore):
+    generate = Generator()
+
+    cache = ParadigmCache(maxsize=10, store=store)
+    assert cache.get_or_generate(NIPAW, generate) == ("nipâw 1", "")
+    assert cache.get_or_generate(NIPAW, generate) == ("nipâw 1", "")
+    assert (cache.hits, cache.store_hits, cache.misses) == (1, 0, 1)
+
+    # e.g., another server process:
+    other_cache = ParadigmCache(maxsize=10, store=store)
+    assert other_cache.get_or_generate(NIPAW, generate) == ("nipâw 1", "")
+    assert (other_cache.hits, other_cache.store_hits, other_cache.misses) == (0, 1, 0)
+    assert generate.calls == 1
+
+
+def test_least_recently_used_is_evicted():
+    generate = Generator()
+    cache = ParadigmCache(maxsize=1)
+
+    cache.get_or_generate(NIPAW, generate)
+    cache.get_or_generate(MINOS, generate)
+    assert len(cache) == 1
+    cache.get_or_generate(NIPAW, generate)
+    assert generate.calls == 3
+
+
+def test_precompute_most_visited(store: ParadigmStore):
+    cache = ParadigmCache(maxsize=10, store=store)
+    for _ in range(3):
+        cache.get_or_generate(MINOS, Generator())
+    cache.get_or_generate(NIPAW, Generator())
+    cache.flush_visits()
+
+    # The FST was updated:
+    updated = ParadigmCache(maxsize=10, store=ParadigmStore(store.path, version="2"))
+    assert updated.precompute_most_visited(1, Generator()) == 1
+    assert updated.store is not None
+    assert MINOS in updated.store
+    assert NIPAW not in updated.store
+
+
+def test_version_depends_on_layouts(tmp_path):
+    fst = tmp_path / "generator.hfstol"
+    fst.write_bytes(b"fst")
+    layouts = tmp_path / "layouts"
+    layouts.mkdir()
+    (layouts / "verb-ai-basic.layout.tsv").write_text("a")
+
+    version = compute_version(fst, layouts)
+    assert compute_version(fst, layouts) == version
+
+    (layouts / "verb-ai-basic.layout.tsv").write_text("b")
+    assert compute_version(fst, layouts) != version
+
+
+def test_cached_paradigms_are_identical(store: ParadigmStore):
+    layouts = shared_res_dir / "layouts"
+    uncached = ParadigmFiller(layouts)
+    cached = ParadigmFiller(layouts, cache=ParadigmCache(maxsize=10, store=store))
+    assert cached.cache is not None
+
+    expected = uncached.fill_paradigm("nipâw", WordClass.VAI, ParadigmSize.FULL)
+    assert cached.fill_paradigm("nipâw", WordClass.VAI, ParadigmSize.FULL) == expected
+    cached.cache.cache_clear()
+    assert cached.fill_paradigm("nipâw", WordClass.VAI, ParadigmSize.FULL) == expected
+    assert cached.cache.store_hits == 1
+
+
+def test_pregeneration_workers_generate_the_same_paradigms():
+    # Management commands aren't in a package, so mypy can't follow a plain import:
+    pregenerateparadigms = import_module(
+        "CreeDictionary.management.commands.pregenerateparadigms"
+    )
+
+    pregenerateparadigms._start_worker()
+    ((key, inflections),) = pregenerateparadigms._generate_paradigms([NIPAW])
+
+    filler = ParadigmFiller(shared_res_dir / "layouts")
+    assert key == NIPAW
+    assert inflections == filler.generate_inflections(
+        "nipâw", WordClass.VAI, ParadigmSize.BASIC
+    )
+
+
+def test_missing_paradigms_are_generated_together(store: ParadigmStore):
+    cache = ParadigmCache(maxsize=10, store=store)
+    cache.get_or_generate(NIPAW, Generator())
+
+    batches = []
+
+    def generate_many(keys):
+        batches.append(keys)
+        return {key: (key.lemma,) for key in keys}
+
+    found = cache.get_or_generate_many([NIPAW, MINOS, MINOS], generate_many)
+    assert found == {NIPAW: ("nipâw 1", ""), MINOS: ("minôs",)}
+    assert batches == [[MINOS]]
+    assert store.get(MINOS) == ("minôs",)
+
+
+def test_streamed_paradigms_are_cached(store: ParadigmStore):
+    layouts = shared_res_dir / "layouts"
+    filler = ParadigmFiller(layouts, cache=ParadigmCache(maxsize=10, store=store))
+
+    streamed = list(filler.iter_paradigm("nipâw", WordClass.VAI, ParadigmSize.FULL))
+    assert filler.cache is not None
+    assert filler.cache.misses == 1
+    assert filler.fill_paradigm("nipâw", WordClass.VAI, ParadigmSize.FULL) == streamed
+    assert filler.cache.hits == 1
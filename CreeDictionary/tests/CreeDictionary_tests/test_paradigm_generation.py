@@ -8,7 +8,7 @@ from CreeDictionary.paradigm.filler import (
 )
 from utils import ParadigmSize
 
-from CreeDictionary.paradigm.generation import generate_paradigm
+from CreeDictionary.paradigm.service import default_paradigm_service
 
 
 @pytest.mark.parametrize(
@@ -38,7 +38,9 @@ def test_paradigm(lemma: str, examples: list[str]):
     Test we can generate a paradigm from a given lemma.
     """
     wordform = Wordform.objects.get(text=lemma, is_lemma=True)
-    paradigms = generate_paradigm(wordform, ParadigmSize.BASIC)
+    paradigms = default_paradigm_service().paradigm_for(wordform, ParadigmSize.BASIC)
+    # these lemmas have the legacy layout of their word class, not a static one:
+    assert isinstance(paradigms, list)
     for inflection in examples:
         assert paradigms_contain_inflection(paradigms, inflection)
 
@@ -0,0 +1,50 @@
+import pytest
+from API.models import Wordform
+from utils import ParadigmSize, shared_res_dir
+
+from CreeDictionary import hfstol
+from CreeDictionary.paradigm.cache import ParadigmCache
+from CreeDictionary.paradigm.filler import ParadigmFiller
+from CreeDictionary.paradigm.manager import ParadigmManager
+from CreeDictionary.paradigm.panes import Paradigm
+from CreeDictionary.paradigm.service import ParadigmService
+
+
+@pytest.fixture
+def service() -> ParadigmService:
+    layouts = shared_res_dir / "layouts"
+    return ParadigmService(
+        ParadigmFiller(layouts, cache=ParadigmCache(maxsize=10)),
+        ParadigmManager(layouts, hfstol.strict_generator),
+    )
+
+
+@pytest.mark.django_db
+def test_static_and_dynamic_paradigms(service: ParadigmService):
+    niya = Wordform.objects.get(text="niya", is_lemma=True)
+    nipaw = Wordform.objects.get(text="nipâw", is_lemma=True)
+
+    static = service.paradigm_for(niya, ParadigmSize.BASIC)
+    assert isinstance(static, Paradigm)
+    # Static paradigms are only filled once:
+    assert service.paradigm_for(niya, ParadigmSize.FULL) is static
+
+    dynamic = service.paradigm_for(nipaw, ParadigmSize.BASIC)
+    assert isinstance(dynamic, list) and len(dynamic) > 0
+    assert service.cache_stats()["misses"] == 1
+
+
+@pytest.mark.django_db
+def test_batched_paradigms_are_identical(service: ParadigmService):
+    requests = [
+        (Wordform.objects.get(text=text, is_lemma=True), size)
+        for text in ["nipâw", "minôs", "niya"]
+        for size in [ParadigmSize.BASIC, ParadigmSize.FULL]
+    ]
+
+    batched = service.paradigms_for(requests)
+    assert service.cache_stats()["misses"] == 4
+
+    assert service.filler.cache is not None
+    service.filler.cache.cache_clear()
+    assert batched == [service.paradigm_for(lemma, size) for lemma, size in requests]
@@ -80,3 +80,30 @@ def test_chunks_make_full_labels():
         ("Ind",),
         ("3Sg", "4Sg/PlO"),
     ]
+
+
+def test_longest_match_without_a_label_in_this_column():
+    """
+    "3Sg+4Sg/PlO" has no short linguistic label, so its first tag is used as is;
+    it is still one chunk, though.
+    """
+    tag_set = ("3Sg", "4Sg/PlO", "Not-A-Tag")
+    assert labels.linguistic_short.get_longest(tag_set) is None
+    assert labels.linguistic_short.get_full_relabelling(tag_set) == [
+        "3Sg",
+        "→ 4",
+        "Not-A-Tag",
+    ]
+    assert list(labels.linguistic_short.chunk(tag_set)) == [
+        ("3Sg", "4Sg/PlO"),
+        ("Not-A-Tag",),
+    ]
+
+
+def test_relabellings_are_not_shared_between_calls():
+    tag_set = ("V", "TA", "Prs")
+    labels.english.get_full_relabelling(tag_set).append("changed")
+    assert labels.english.get_full_relabelling(tag_set) == [
+        "Action word - like: wîcihêw, itêw",
+        "something is happening now",
+    ]
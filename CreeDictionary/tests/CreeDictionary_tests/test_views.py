@@ -53,6 +53,68 @@ class TestLemmaDetailsInternal4xx:
         assert response.status_code == HttpResponseNotAllowed.status_code
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("paradigm_size", ["FULL", "LINGUISTIC"])
+def test_bigger_paradigms_are_streamed(paradigm_size: str, client: Client):
+    """
+    Streaming a paradigm table by table should send the same HTML as rendering it
+    all at once.
+    """
+    from API.models import Wordform
+    from django.template.loader import render_to_string
+    from utils import ParadigmSize
+
+    from CreeDictionary.paradigm.service import default_paradigm_service
+
+    lemma = Wordform.objects.get(text="nipâw", is_lemma=True)
+    response = client.get(
+        reverse("cree-dictionary-paradigm-detail"),
+        {"lemma-id": lemma.id, "paradigm-size": paradigm_size},
+    )
+
+    assert response.status_code == 200
+    assert response.streaming
+    streamed = b"".join(response.streaming_content).decode("UTF-8")
+    assert streamed == render_to_string(
+        "CreeDictionary/components/paradigm.html",
+        {
+            "lemma": lemma,
+            "paradigm_size": paradigm_size,
+            "paradigm_tables": default_paradigm_service().paradigm_for(
+                lemma, ParadigmSize(paradigm_size)
+            ),
+        },
+        response.wsgi_request,
+    )
+    assert "ninipân" in streamed
+
+
+@pytest.mark.django_db
+def test_paradigm_that_fails_to_generate_is_not_streamed(client: Client, monkeypatch):
+    """
+    If generating the first table fails, the request should fail with it, rather
+    than start a 200 response that gets cut short.
+    """
+    from API.models import Wordform
+
+    from CreeDictionary.paradigm.service import default_paradigm_service
+
+    def fail_to_generate(*args):
+        raise RuntimeError("the FST failed")
+        yield
+
+    monkeypatch.setattr(
+        default_paradigm_service().filler, "iter_paradigm", fail_to_generate
+    )
+
+    lemma = Wordform.objects.get(text="nipâw", is_lemma=True)
+    with pytest.raises(RuntimeError, match="the FST failed"):
+        client.get(
+            reverse("cree-dictionary-paradigm-detail"),
+            {"lemma-id": lemma.id, "paradigm-size": "FULL"},
+        )
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "url",
@@ -101,6 +101,17 @@ def django_db_setup(request, django_test_environment, django_db_blocker):
     request.addfinalizer(teardown_database)
 
 
+@pytest.fixture(autouse=True)
+def use_temporary_indexes(settings, tmp_path):
+    """
+    Importing saves the affix search indexes. This keeps the ones built from the
+    small test dictionaries here away from the ones the rest of the tests search
+    with.
+    """
+    settings.SEARCH_INDEX_DIR = tmp_path / "search_index"
+    settings.PARADIGM_CACHE_PATH = tmp_path / "paradigm_cache.sqlite3"
+
+
 def migrate_and_import(dictionary_dir):
     """
     assuming a fresh in memory database
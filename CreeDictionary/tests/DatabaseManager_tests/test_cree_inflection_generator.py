@@ -1,4 +1,7 @@
-from DatabaseManager.cree_inflection_generator import expand_inflections
+from DatabaseManager.cree_inflection_generator import (
+    expand_inflections,
+    inflection_expanding_pool,
+)
 
 
 def test_expand_inflections():
@@ -25,3 +28,30 @@ def test_expand_inflections():
     # the function should also work on IPCs
     ipc_result = expand_inflections(["tastawayakap+Ipc"], verbose=False)
     assert ipc_result == {"tastawayakap+Ipc": [("tastawayakap+Ipc", {"tastawayakap"})]}
+
+
+def test_expand_inflections_in_several_processes():
+    analyses = [
+        "kinêpikos+N+A+Sg",
+        "mawinêskomêw+V+TA+Ind+3Sg+4Sg/PlO",
+        "tastawayakap+Ipc",
+    ]
+
+    in_parallel = expand_inflections(analyses, verbose=False, jobs=2)
+
+    # same results, in the same order:
+    assert list(in_parallel.items()) == list(
+        expand_inflections(analyses, verbose=False).items()
+    )
+
+
+def test_expand_inflections_in_the_same_processes():
+    analyses = ["kinêpikos+N+A+Sg", "mawinêskomêw+V+TA+Ind+3Sg+4Sg/PlO"]
+
+    with inflection_expanding_pool(2) as pool:
+        # the processes expand any number of batches:
+        for batch in (analyses, list(reversed(analyses))):
+            in_parallel = expand_inflections(batch, verbose=False, jobs=2, pool=pool)
+            assert list(in_parallel.items()) == list(
+                expand_inflections(batch, verbose=False).items()
+            )
@@ -1,6 +1,10 @@
 import pytest
-from API.models import Wordform
+from django.core.management import call_command
+from django.db import connection
+
+from API.models import Definition, DictionaryImport, EnglishKeyword, Wordform
 from DatabaseManager.cree_inflection_generator import expand_inflections
+from DatabaseManager import xml_importer
 from DatabaseManager.xml_importer import find_latest_xml_file
 from tests.DatabaseManager_tests.conftest import migrate_and_import
 from utils import PartOfSpeech, shared_res_dir
@@ -66,6 +70,121 @@ def test_import_xml_crkeng_small_common_xml_l_different_ic(shared_datadir):
     assert len(Wordform.objects.filter(text="pisiw", is_lemma=True)) == 2
 
 
+@pytest.mark.django_db
+def test_import_xml_in_chunks(shared_datadir, monkeypatch):
+    # Lemmas are inserted a chunk at a time. A chunk of one lemma at a time must
+    # give the same database as one chunk for everything:
+    monkeypatch.setattr(xml_importer, "IMPORT_CHUNK_SIZE", 1)
+    migrate_and_import(shared_datadir / "crkeng-pipon-of-different-word-classes")
+
+    lemmas = Wordform.objects.filter(text="pipon", is_lemma=True)
+    assert {lemma.pos: lemma.definitions.count() for lemma in lemmas} == {
+        "N": 1,
+        "V": 2,
+    }
+    for lemma in lemmas:
+        assert lemma.homograph_disambiguator == "pos"
+        assert lemma.lemma == lemma
+        assert Wordform.objects.filter(lemma=lemma, is_lemma=False).exists()
+
+
+@pytest.mark.django_db
+def test_import_citations(shared_datadir, monkeypatch):
+    # Citations are inserted a batch at a time too:
+    monkeypatch.setattr(xml_importer, "CITATION_BATCH_SIZE", 1)
+    migrate_and_import(shared_datadir / "crkeng-niska")
+
+    goose = Definition.objects.get(
+        wordform__text="niska", wordform__is_lemma=True, text="goose"
+    )
+    assert goose.source_ids == ["CW", "MD"]
+    # Inserting the same citations again changes nothing:
+    xml_importer.insert_citations({goose.id: {"CW", "MD"}})
+    assert goose.source_ids == ["CW", "MD"]
+
+
+@pytest.mark.django_db
+def test_bulk_load(shared_datadir):
+    call_command("migrate", "API")
+    xml_importer.import_xmls(shared_datadir / "crkeng-niska", bulk_load=True)
+
+    assert Wordform.objects.filter(text="niska", is_lemma=True).exists()
+    # The indexes are back once everything is loaded:
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Wordform._meta.db_table
+        )
+    assert {index.name for index in Wordform._meta.indexes} <= constraints.keys()
+
+
+def test_no_incremental_bulk_load(shared_datadir):
+    with pytest.raises(ValueError):
+        xml_importer.import_xmls(
+            shared_datadir / "crkeng-niska", incremental=True, bulk_load=True
+        )
+
+
+@pytest.mark.django_db
+def test_incremental_import_gives_the_same_database_as_a_full_import(
+    shared_datadir, tmp_path
+):
+    xml = shared_datadir / "crkeng-common-analysis-definition-merge" / "crkeng.xml"
+    migrate_and_import(xml.parent)
+
+    niska_xml = (shared_datadir / "crkeng-niska" / "crkeng.xml").read_text()
+    niska_entry = niska_xml[niska_xml.index("<e>") : niska_xml.index("</e>") + 4]
+    original = xml.read_text()
+    nipa_entry_start = original.rindex("<e>", 0, original.index(">nipâ<"))
+    nipa_entry_end = original.index("</e>", nipa_entry_start) + 4
+    changed_xml = tmp_path / "crkeng.xml"
+    # A removed entry, an added entry, and an entry with a changed definition:
+    changed_xml.write_text(
+        (original[:nipa_entry_start] + niska_entry + original[nipa_entry_end:]).replace(
+            "Kill him.", "Kill her."
+        )
+    )
+
+    xml_importer.import_xmls(changed_xml, incremental=True)
+    incrementally_imported = database_contents()
+
+    call_command("wipedefinitions", yes_really=True)
+    xml_importer.import_xmls(changed_xml)
+
+    assert database_contents() == incrementally_imported
+    assert Wordform.objects.filter(text="niska", is_lemma=True).exists()
+    assert not Definition.objects.filter(text="Sleep. [Command]").exists()
+    assert Definition.objects.filter(text__startswith="Kill her").exists()
+    assert not Definition.objects.filter(text__startswith="Kill him").exists()
+    assert DictionaryImport.objects.filter(incremental=True).count() == 1
+
+
+def database_contents():
+    """
+    Everything imported, without ids, which depend on the order of the imports.
+    """
+    return (
+        sorted(
+            Wordform.objects.values_list(
+                "text",
+                "analysis",
+                "is_lemma",
+                "as_is",
+                "pos",
+                "inflectional_category",
+                "stem",
+                "homograph_disambiguator",
+                "lemma__analysis",
+            )
+        ),
+        sorted(
+            Definition.objects.values_list(
+                "text", "wordform__analysis", "wordform__text", "citations__abbrv"
+            )
+        ),
+        sorted(EnglishKeyword.objects.values_list("text", "lemma__analysis")),
+    )
+
+
 @pytest.mark.parametrize(
     "file_names,expected_crkeng_index",
     [
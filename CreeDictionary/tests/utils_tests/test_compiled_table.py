@@ -0,0 +1,54 @@
+import os
+
+import pytest
+from utils.compiled_table import CompiledTable, compile_table, load_table
+
+FREQUENCIES = {"nipâw+V+AI+Ind+3Sg": 6334, "minôs+N+A+Sg": 12, ",+CLB": 32334}
+
+
+@pytest.fixture
+def table(tmp_path) -> CompiledTable:
+    compile_table(FREQUENCIES, tmp_path / "frequencies.table", "i")
+    return CompiledTable(tmp_path / "frequencies.table")
+
+
+def test_lookup(table: CompiledTable):
+    assert table["nipâw+V+AI+Ind+3Sg"] == 6334
+    assert table.get("minôs+N+A+Sg") == 12
+    assert table.get("minôs+N+A+Pl", 0) == 0
+    assert "minôs+N+A+Pl" not in table
+    assert 12 not in table
+
+
+def test_same_as_dict(table: CompiledTable):
+    assert dict(table) == FREQUENCIES
+    assert list(table) == sorted(FREQUENCIES)
+    assert len(table) == 3
+
+
+@pytest.mark.parametrize(
+    "entries", [{}, {"": 1.5}, {str(i): i / 2 for i in range(1000)}]
+)
+def test_round_trip(tmp_path, entries):
+    compile_table(entries, tmp_path / "rankings.table", "d")
+    assert dict(CompiledTable(tmp_path / "rankings.table")) == entries
+
+
+def test_recompiled_when_the_source_changes(tmp_path):
+    source = tmp_path / "frequencies.txt"
+    parse = lambda path: {line: 1 for line in path.read_text().split()}
+
+    source.write_text("nipâw")
+    assert dict(load_table(source, parse, "i")) == {"nipâw": 1}
+    assert (tmp_path / "frequencies.table").exists()
+
+    source.write_text("minôs")
+    table_mtime = (tmp_path / "frequencies.table").stat().st_mtime
+    os.utime(source, (table_mtime + 1, table_mtime + 1))
+    assert dict(load_table(source, parse, "i")) == {"minôs": 1}
+
+
+def test_not_a_table(tmp_path):
+    (tmp_path / "frequencies.table").write_bytes(b"\0" * 32)
+    with pytest.raises(ValueError):
+        CompiledTable(tmp_path / "frequencies.table")
@@ -1,10 +1,12 @@
 from string import ascii_letters
+from typing import List
 
 import pytest
 from hypothesis import assume, example, given
-from hypothesis.strategies import text
+from hypothesis.strategies import lists, text
 from Levenshtein import distance
 from utils import get_modified_distance
+from utils.cree_lev_dist import ModifiedDistanceScorer, del_dist, ins_dist, sub_dist
 
 
 @given(text(alphabet=ascii_letters), text(alphabet=ascii_letters))
@@ -38,3 +40,52 @@ def test_get_distance_basic_lev(spelling: str, normal_form: str):
 )
 def test_get_distance(spelling: str, normal_form: str, expected_distance):
     assert get_modified_distance(spelling, normal_form) == expected_distance
+
+
+def reference_distance(spelling: str, normal_form: str) -> float:
+    """
+    The full-matrix weighted edit distance, written directly in terms of
+    del_dist(), ins_dist(), and sub_dist().
+    """
+    spelling = spelling.lower()
+    normal_form = normal_form.lower()
+    n, m = len(spelling), len(normal_form)
+    d = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        d[i][0] = d[i - 1][0] + del_dist(spelling, i - 1)
+    for j in range(1, m + 1):
+        d[0][j] = d[0][j - 1] + ins_dist(normal_form, normal_form[j - 1], j - 1)
+
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            d[i][j] = min(
+                d[i - 1][j] + del_dist(spelling, i - 1),
+                d[i][j - 1] + ins_dist(normal_form, normal_form[j - 1], j - 1),
+                d[i - 1][j - 1] + sub_dist(spelling, normal_form[j - 1], i - 1),
+            )
+
+    return d[-1][-1]
+
+
+cree_text = text(alphabet="acehikmnopstwyâêîôāēīōÂÊH-", max_size=12)
+
+
+@given(cree_text, cree_text)
+@example("ha", "ah")
+@example("h", "ah")
+def test_get_distance_matches_reference(spelling: str, normal_form: str):
+    assert get_modified_distance(spelling, normal_form) == reference_distance(
+        spelling, normal_form
+    )
+
+
+@given(cree_text, lists(cree_text, max_size=5))
+def test_batch_distances_match_reference(query: str, others: List[str]):
+    scorer = ModifiedDistanceScorer(query)
+
+    assert scorer.distances_from(others) == [
+        reference_distance(spelling, query) for spelling in others
+    ]
+    assert scorer.distances_to(others) == [
+        reference_distance(query, normal_form) for normal_form in others
+    ]
@@ -0,0 +1,44 @@
+import io
+import xml.etree.ElementTree as ET
+
+from utils import shared_res_dir
+from utils.crkeng_xml_utils import IndexedXML, iter_elements
+
+XML = """
+<r>
+    <source id="CW"><title>Cree: Words</title></source>
+    <e><lg><l pos="N">acâhkos</l><lc>NA-1</lc></lg></e>
+    <e><lg><l pos="V">nipâw</l><lc>VAI-v</lc></lg></e>
+</r>
+"""
+
+
+def test_iter_elements_yields_the_elements_in_order():
+    elements = iter_elements(io.StringIO(XML), "source", "e")
+
+    assert [element.tag for element in elements] == ["source", "e", "e"]
+
+
+def test_iter_elements_drops_the_elements_from_the_tree():
+    *entries, root = iter_elements(io.StringIO(XML), "e", "r")
+
+    # the <e> elements are gone, everything else is still there:
+    assert root.findall("e") == []
+    assert len(root.findall("source")) == 1
+    # ...but the elements themselves are left intact for the caller:
+    assert [e.find("lg/l").text for e in entries] == ["acâhkos", "nipâw"]
+
+
+def test_indexed_xml_has_the_same_entries_as_the_parsed_tree():
+    crkeng_file = shared_res_dir / "test_dictionaries" / "crkeng.xml"
+    root = ET.parse(crkeng_file).getroot()
+
+    with open(crkeng_file) as f:
+        crkeng_xml = IndexedXML.from_xml_file(f)
+
+    assert set(crkeng_xml) == {
+        IndexedXML._parse_entry_element(e) for e in root.findall(".//e")
+    }
+    assert list(crkeng_xml.source_abbreviations) == [
+        s.get("id") for s in root.findall(".//source")
+    ]
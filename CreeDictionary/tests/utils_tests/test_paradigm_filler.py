@@ -3,6 +3,7 @@ Tests importing the NA layouts.
 
 Note: if the upstream layouts change, so will these tests!
 """
+
 from string import Template
 
 import pytest
@@ -91,6 +92,32 @@ def test_inflect_all_with_analyses(paradigm_filler) -> None:
     ), f"could not find stem {stem} in regular inflection {random_form}"
 
 
+def test_filling_leaves_layout_untouched(paradigm_filler) -> None:
+    """
+    Paradigms are filled without copying the layout, so the layout must not change.
+    """
+    layout_before = repr(
+        paradigm_filler._layout_tables[WordClass.NA, ParadigmSize.BASIC]
+    )
+
+    maskwa = paradigm_filler.fill_paradigm("maskwa", WordClass.NA, ParadigmSize.BASIC)
+    minos = paradigm_filler.fill_paradigm("minôs", WordClass.NA, ParadigmSize.BASIC)
+
+    assert maskwa[0][1][1].inflection == "maskwak"
+    assert minos[0][1][1].inflection == "minôsak"
+    assert maskwa[0][1][0] is minos[0][1][0], "static cells should be shared"
+    assert (
+        repr(paradigm_filler._layout_tables[WordClass.NA, ParadigmSize.BASIC])
+        == layout_before
+    )
+
+
+@pytest.mark.parametrize("size", [ParadigmSize.FULL, ParadigmSize.LINGUISTIC])
+def test_iter_paradigm_yields_the_same_tables(paradigm_filler, size) -> None:
+    expected = paradigm_filler.fill_paradigm("nipâw", WordClass.VAI, size)
+    assert list(paradigm_filler.iter_paradigm("nipâw", WordClass.VAI, size)) == expected
+
+
 @pytest.fixture
 def paradigm_filler(shared_datadir) -> ParadigmFiller:
     """
@@ -1,6 +1,6 @@
 import time
 
-from utils.profiling import timed
+from utils.profiling import PhaseTimer, timed
 
 
 def test_timed_decorator(capsys):
@@ -12,3 +12,16 @@ def test_timed_decorator(capsys):
 
     out, err = capsys.readouterr()
     assert "quick_nap finished in 0.1 seconds\n" == out
+
+
+def test_phase_timer_adds_up_each_phase():
+    timer = PhaseTimer()
+    for _ in range(2):
+        with timer("napping"):
+            time.sleep(0.05)
+        with timer("waking up"):
+            pass
+
+    assert list(timer.seconds) == ["napping", "waking up"]
+    assert timer.seconds["napping"] >= 0.1
+    assert timer.report().splitlines()[0].startswith("napping    00:00.1")
@@ -0,0 +1,189 @@
+"""
+Read-only tables from strings to numbers, compiled into a binary file that is
+read through mmap.
+
+Parsing a large resource file (e.g., corpus frequencies) into a dict costs every
+process that needs it both time and memory. A compiled table is parsed once;
+after that, opening it takes no parsing at all, and every process shares the
+same pages of the file.
+
+File layout (native byte order; it's a build artifact, not something to share):
+
+    header    magic, format version, value typecode, entry count, bucket count
+    buckets   uint32 per bucket: index of the entry + 1, or 0 when empty
+    offsets   uint32 per entry, + 1: where each key starts in the key blob
+    values    one value per entry, in the header's array typecode
+    keys      the UTF-8 encoded keys, in sorted order, back to back
+
+Keys are found by hashing them into the buckets (with linear probing), so a
+lookup is a CRC32 and, usually, a single comparison.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Callable, Iterator, Mapping, TypeVar, cast
+from zlib import crc32
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CTBL"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("=4sIcxxxII")
+
+V = TypeVar("V", int, float)
+# The keys of a table are strings, or a NewType of str, e.g., ConcatAnalysis:
+K = TypeVar("K", bound=str)
+
+
+class CompiledTable(Mapping[str, V]):
+    """
+    A table written by compile_table().
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as table_file:
+            self._mmap = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._buckets: memoryview
+        self._offsets: memoryview
+        self._values: memoryview
+
+        magic, version, typecode, count, bucket_count = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"not a compiled table (version {FORMAT_VERSION}): {path}")
+
+        view = memoryview(self._mmap)
+        start = _HEADER.size
+        self._buckets = view[start : start + 4 * bucket_count].cast("I")
+        start += self._buckets.nbytes
+        self._offsets = view[start : start + 4 * (count + 1)].cast("I")
+        start += self._offsets.nbytes
+        value_typecode = typecode.decode("ASCII")
+        value_size = array(value_typecode).itemsize
+        self._values = view[start : start + value_size * count].cast(value_typecode)
+        self._keys_start = start + self._values.nbytes
+        self._mask = bucket_count - 1
+
+    def __getitem__(self, key: str) -> V:
+        index = self._index(key)
+        if index < 0:
+            raise KeyError(key)
+        return self._values[index]
+
+    def get(self, key, default=None):
+        # Mapping.get() goes through __getitem__() and KeyError, which is slower:
+        index = self._index(key)
+        return self._values[index] if index >= 0 else default
+
+    def __contains__(self, key: object) -> bool:
+        return self._index(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self._key(index).decode("UTF-8")
+
+    def _index(self, key: object) -> int:
+        """
+        The index of the entry for key, or -1 if there is none.
+        """
+        if not isinstance(key, str):
+            return -1
+        encoded = key.encode("UTF-8")
+
+        buckets: memoryview = self._buckets
+        offsets, keys_start = self._offsets, self._keys_start
+        bucket: int = crc32(encoded) & self._mask
+        entry: int
+        while entry := buckets[bucket]:
+            start = keys_start + offsets[entry - 1]
+            end = keys_start + offsets[entry]
+            # Comparing lengths first saves slicing out most of the other keys:
+            if end - start == len(encoded) and self._mmap[start:end] == encoded:
+                return entry - 1
+            bucket = (bucket + 1) & self._mask
+        return -1
+
+    def _key(self, index: int) -> bytes:
+        start = self._keys_start + self._offsets[index]
+        end = self._keys_start + self._offsets[index + 1]
+        return self._mmap[start:end]
+
+
+def compile_table(table: Mapping[K, V], path: Path, typecode: str) -> None:
+    """
+    Writes the table to path, replacing any existing file atomically, so that
+    processes that have the old one open keep working.
+
+    :param typecode: how to store the values, as an array typecode, e.g., "i" or "d"
+    """
+    keys = [key.encode("UTF-8") for key in sorted(table)]
+    values = array(typecode, (table[key] for key in sorted(table)))
+
+    # At most half full, so that probing stays short:
+    bucket_count = 1 << (2 * len(keys)).bit_length()
+    mask = bucket_count - 1
+    buckets = array("I", [0]) * bucket_count
+    for index, key in enumerate(keys):
+        bucket = crc32(key) & mask
+        while buckets[bucket]:
+            bucket = (bucket + 1) & mask
+        buckets[bucket] = index + 1
+
+    offsets = array("I", [0])
+    for key in keys:
+        offsets.append(offsets[-1] + len(key))
+
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with temporary_path.open("wb") as table_file:
+        table_file.write(
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                typecode.encode("ASCII"),
+                len(keys),
+                bucket_count,
+            )
+        )
+        table_file.write(buckets.tobytes())
+        table_file.write(offsets.tobytes())
+        table_file.write(values.tobytes())
+        table_file.write(b"".join(keys))
+    os.replace(temporary_path, path)
+
+
+def compiled_path(source: Path) -> Path:
+    """
+    Where the compiled table of a resource file goes.
+    """
+    return source.with_suffix(".table")
+
+
+def load_table(
+    source: Path, parse: Callable[[Path], Mapping[K, V]], typecode: str
+) -> Mapping[K, V]:
+    """
+    Opens the compiled table of the source file, compiling it first if it's
+    missing or older than the source.
+
+    When the table can't be written (e.g., a read-only deployment that skipped
+    `manage.py compileresourcetables`), returns the parsed source instead.
+    """
+    compiled = compiled_path(source)
+    if not compiled.exists() or compiled.stat().st_mtime_ns < source.stat().st_mtime_ns:
+        table = parse(source)
+        try:
+            compile_table(table, compiled, typecode)
+        except OSError as error:
+            logger.warning(f"could not compile {source}, using it as is: {error}")
+            return table
+
+    # The same keys, read back as plain strings:
+    return cast(Mapping[K, V], CompiledTable(compiled))
@@ -1,5 +1,7 @@
-import string
-import unicodedata
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
 VOWELS = {"a", "e", "i", "o"}
 
@@ -99,26 +101,239 @@ def get_modified_distance(spelling: str, normal_form: str) -> float:
 
     This function neglects letter case
 
+    To compare one string against many, use ModifiedDistanceScorer directly.
+
     :param spelling:
     :param normal_form:
     :return: Our own metric of edit distance
     """
-    # see these slides for "weighted min edit distance"
-    # https://web.stanford.edu/class/cs124/lec/med.pdf
-    spelling = spelling.lower()
-    normal_form = normal_form.lower()
-    n, m = len(spelling), len(normal_form)
-    d = [[0] * (m + 1) for _ in range(n + 1)]
-    for i in range(1, n + 1):
-        d[i][0] = d[i - 1][0] + del_dist(spelling, i - 1)
-    for j in range(1, m + 1):
-        d[0][j] = d[0][j - 1] + ins_dist(normal_form, normal_form[j - 1], j - 1)
-
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            _del_dist = d[i - 1][j] + del_dist(spelling, i - 1)
-            _ins_dist = d[i][j - 1] + ins_dist(normal_form, normal_form[j - 1], j - 1)
-            _sub_dist = d[i - 1][j - 1] + sub_dist(spelling, normal_form[j - 1], i - 1)
-            d[i][j] = min((_del_dist, _ins_dist, _sub_dist))
-
-    return d[-1][-1]
+    return _scorer(normal_form).distance_from(spelling)
+
+
+class ModifiedDistanceScorer:
+    """
+    Computes get_modified_distance() between one fixed query and many other strings.
+
+    Everything that depends on only one of the two strings is computed once:
+    lowercasing, diacritic removal, the deletion/insertion cost of each position,
+    and, for every distinct character seen, the cost of substituting it for each
+    character of the query. The dynamic programming then only keeps two rows,
+    and the row buffers are reused for every string in a batch.
+
+    >>> scorer = ModifiedDistanceScorer("atâhk")
+    >>> scorer.distances_from(["atâk", "atahk", "atak", "adak"])
+    [0.5, 0.5, 1.0, 2.0]
+    >>> scorer.distance_to("atâhk")
+    0.0
+    """
+
+    def __init__(self, query: str):
+        self._query = _prepare(query)
+        self._substitution_rows: Dict[str, Tuple[float, ...]] = {}
+
+    def distance_from(self, spelling: str) -> float:
+        """
+        Equivalent to get_modified_distance(spelling, query)
+        """
+        return self.distances_from((spelling,))[0]
+
+    def distance_to(self, normal_form: str) -> float:
+        """
+        Equivalent to get_modified_distance(query, normal_form)
+        """
+        return self.distances_to((normal_form,))[0]
+
+    def distances_from(self, spellings: Iterable[str]) -> List[float]:
+        """
+        Equivalent to [get_modified_distance(s, query) for s in spellings]
+        """
+        buffers = self._new_buffers()
+        query_insertion_costs = self._query.insertion_costs
+        return [
+            self._distance(row, row.deletion_costs, query_insertion_costs, *buffers)
+            for row in map(_prepare, spellings)
+        ]
+
+    def distances_to(self, normal_forms: Iterable[str]) -> List[float]:
+        """
+        Equivalent to [get_modified_distance(query, n) for n in normal_forms]
+        """
+        # The distance is computed with the query along the columns either way.
+        # Substitution costs are symmetric, so that only means that
+        # deleting from the query is charged along the columns, and inserting
+        # the other string's characters is charged along the rows.
+        buffers = self._new_buffers()
+        query_deletion_costs = self._query.deletion_costs
+        return [
+            self._distance(row, row.insertion_costs, query_deletion_costs, *buffers)
+            for row in map(_prepare, normal_forms)
+        ]
+
+    def first_row(self) -> List[float]:
+        """
+        The first row of the distances_from() matrix: the cost of producing each
+        prefix of the query from an empty spelling.
+
+        Together with next_row(), this lets a trie walk compute the distance from
+        every key to the query one character at a time, sharing the rows of
+        common prefixes.
+
+        >>> scorer = ModifiedDistanceScorer("ahk")
+        >>> scorer.first_row()
+        [0.0, 1.0, 1.5, 2.5]
+        """
+        row = [0.0]
+        for cost in self._query.insertion_costs:
+            row.append(row[-1] + cost)
+        return row
+
+    def next_row(
+        self, row: Sequence[float], char: str, previous_char: Optional[str]
+    ) -> List[float]:
+        """
+        Extends the spelling that produced ``row`` by one character.
+
+        :param row: the row of the spelling so far
+        :param char: the next character of the spelling
+        :param previous_char: the last character of the spelling so far, if any
+        :return: the row of the extended spelling; its last item is the distance
+                 from the extended spelling to the query, and its minimum is a
+                 lower bound on the distance from any longer spelling that
+                 starts with it.
+
+        >>> scorer = ModifiedDistanceScorer("ahk")
+        >>> row = scorer.next_row(scorer.first_row(), "a", None)
+        >>> scorer.next_row(row, "k", "a")[-1]
+        0.5
+        """
+        lowered = char.lower()
+        if (
+            previous_char is not None
+            and remove_cree_diacritics(previous_char.lower()) in VOWELS
+            and lowered == "h"
+        ):
+            row_cost = 0.5
+        else:
+            row_cost = 1.0
+
+        substitution_costs = self._substitution_row(lowered)
+        column_costs = self._query.insertion_costs
+
+        left = row[0] + row_cost
+        current = [left]
+        for j in range(len(column_costs)):
+            best = row[j] + substitution_costs[j]
+            candidate = row[j + 1] + row_cost
+            if candidate < best:
+                best = candidate
+            candidate = left + column_costs[j]
+            if candidate < best:
+                best = candidate
+            current.append(best)
+            left = best
+        return current
+
+    def _new_buffers(self) -> Tuple[List[float], List[float]]:
+        width = len(self._query.lowered) + 1
+        return [0.0] * width, [0.0] * width
+
+    def _distance(
+        self,
+        row: _PreparedString,
+        row_costs: Sequence[float],
+        column_costs: Sequence[float],
+        previous: List[float],
+        current: List[float],
+    ) -> float:
+        """
+        Weighted edit distance with ``row`` down the side and the query across the
+        top. Consuming a character of the row alone costs ``row_costs``; consuming a
+        character of the query alone costs ``column_costs``.
+        """
+        width = len(column_costs)
+
+        previous[0] = 0.0
+        for j in range(width):
+            previous[j + 1] = previous[j] + column_costs[j]
+
+        for i, char in enumerate(row.lowered):
+            substitution_costs = self._substitution_row(char)
+            row_cost = row_costs[i]
+
+            left = current[0] = previous[0] + row_cost
+            for j in range(width):
+                best = previous[j] + substitution_costs[j]
+                candidate = previous[j + 1] + row_cost
+                if candidate < best:
+                    best = candidate
+                candidate = left + column_costs[j]
+                if candidate < best:
+                    best = candidate
+                current[j + 1] = left = best
+
+            previous, current = current, previous
+
+        return previous[width]
+
+    def _substitution_row(self, char: str) -> Tuple[float, ...]:
+        """
+        The cost of substituting char for each character of the query.
+        """
+        try:
+            return self._substitution_rows[char]
+        except KeyError:
+            pass
+
+        base = remove_cree_diacritics(char)
+        costs = tuple(
+            _substitution_cost(char, base, query_char, query_base)
+            for query_char, query_base in zip(self._query.lowered, self._query.base)
+        )
+        self._substitution_rows[char] = costs
+        return costs
+
+
+class _PreparedString(NamedTuple):
+    lowered: str
+    # lowered, with diacritics removed
+    base: str
+    # Cost of deleting each character when this is the spelling:
+    deletion_costs: Tuple[float, ...]
+    # Cost of inserting each character when this is the normal form:
+    insertion_costs: Tuple[float, ...]
+
+
+@lru_cache(maxsize=4096)
+def _prepare(text: str) -> _PreparedString:
+    """
+    Precompute the per-position costs of a string; matches del_dist() and ins_dist().
+    """
+    lowered = text.lower()
+    base = remove_cree_diacritics(lowered)
+    deletion_costs = tuple(
+        0.5 if i > 0 and base[i - 1] in VOWELS and lowered[i] == "h" else 1.0
+        for i in range(len(lowered))
+    )
+    # N.B., ins_dist() looks at the character *before* the insertion point, which,
+    # for the very first character, wraps around to the last character.
+    insertion_costs = tuple(
+        0.5 if lowered[j] == "h" and base[j - 1] in VOWELS else 1.0
+        for j in range(len(lowered))
+    )
+    return _PreparedString(lowered, base, deletion_costs, insertion_costs)
+
+
+def _substitution_cost(char: str, base: str, other: str, other_base: str) -> float:
+    """
+    Matches sub_dist(), given both characters with and without diacritics.
+    """
+    if char == other:
+        return 0.0
+    elif base == other_base:
+        return 0.0 if base == "e" else 0.5
+    return 1.0
+
+
+@lru_cache(maxsize=1024)
+def _scorer(query: str) -> ModifiedDistanceScorer:
+    return ModifiedDistanceScorer(query)
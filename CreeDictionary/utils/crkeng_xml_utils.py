@@ -45,6 +45,31 @@ def write_xml_from_elements(elements: Iterable[ET.Element], target_file: Path):
     target_file.write_text(pretty_text)
 
 
+def iter_elements(
+    xml_file: Union[str, Path, TextIO], *tags: str
+) -> Iterator[ET.Element]:
+    """
+    Yields the elements with the given tags from an XML file as they are parsed,
+    without building the whole tree.
+
+    Once the caller moves on to the next element, the previous one is removed from
+    its parent, so memory use stays the same however large the file is. The
+    elements themselves are left intact, so the caller can still keep the ones
+    it needs.
+    """
+    ancestors: List[ET.Element] = []
+    for event, element in ET.iterparse(xml_file, events=("start", "end")):
+        if event == "start":
+            ancestors.append(element)
+            continue
+
+        ancestors.pop()
+        if element.tag in tags:
+            yield element
+            if ancestors:
+                ancestors[-1].remove(element)
+
+
 def extract_l_str(element: ET.Element) -> str:
     """
     receives <e> element and get <l> string. raises ValueError if <l> not found or <l> has empty text
@@ -238,21 +263,22 @@ class IndexedXML(Iterable[XMLEntry]):
     def from_xml_file(cls, crkeng_xml: TextIO) -> "IndexedXML":
         """
         import entries from a given crkeng_xml
-        """
 
-        root = ET.parse(crkeng_xml).getroot()
+        The file is parsed incrementally: only the parsed entries are kept, never the
+        elements they came from.
+        """
 
         # we build entries by iterating over <e></e> in the xml file
-        entries: Set[XMLEntry] = {
-            cls._parse_entry_element(element) for element in root.findall(".//e")
-        }
-
+        entries: Set[XMLEntry] = set()
         source_abbreviations = []
 
-        for s in root.findall(".//source"):
-            abbreviation = s.get("id")
-            assert abbreviation is not None
-            source_abbreviations.append(abbreviation)
+        for element in iter_elements(crkeng_xml, "e", "source"):
+            if element.tag == "e":
+                entries.add(cls._parse_entry_element(element))
+            else:
+                abbreviation = element.get("id")
+                assert abbreviation is not None
+                source_abbreviations.append(abbreviation)
 
         return cls(entries=entries, source_abbreviations=source_abbreviations)
 
@@ -1,7 +1,9 @@
 """measure and report function execution time"""
+
 import time
+from contextlib import contextmanager
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Iterator
 
 
 def timed(
@@ -36,3 +38,42 @@ def timed(
         return timed_func
 
     return decorator
+
+
+class PhaseTimer:
+    """
+    adds up the time spent in each phase of a long job, to report them all at the end
+
+    usage example:
+
+        timer = PhaseTimer()
+        for chunk in chunks:
+            with timer("expanding"):
+                ...
+            with timer("inserting"):
+                ...
+        print(timer.report())
+    """
+
+    def __init__(self):
+        # phase -> seconds, in the order the phases first started
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def __call__(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + elapsed
+
+    def report(self) -> str:
+        """
+        one line per phase, e.g. "expanding  00:12.345"
+        """
+        width = max(map(len, self.seconds), default=0)
+        return "\n".join(
+            f"{phase:<{width}}  {seconds // 60:02.0f}:{seconds % 60:06.3f}"
+            for phase, seconds in self.seconds.items()
+        )
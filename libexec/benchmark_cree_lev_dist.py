@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks the Cree-aware edit distance against the original full-matrix
+implementation, scoring a handful of queries against every headword in a
+dictionary XML file.
+
+    libexec/benchmark_cree_lev_dist.py [--dictionary crkeng.xml] [--repeat 3]
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, List
+
+# Figure out shared_res_dir
+add_to_path = Path(__file__).parent.parent / "CreeDictionary"
+assert add_to_path.is_dir()
+sys.path.insert(0, str(add_to_path))
+shared_res_dir = __import__("utils").shared_res_dir
+cree_lev_dist = __import__("utils.cree_lev_dist").cree_lev_dist
+
+QUERIES = ["nipaw", "atahk", "wâpamêw", "ê-kî-nipât", "acâhkos", "minôs", "mîcisow"]
+
+
+def original_distance(spelling: str, normal_form: str) -> float:
+    """
+    get_modified_distance() as it was before the cost tables were precomputed.
+    """
+    del_dist = cree_lev_dist.del_dist
+    ins_dist = cree_lev_dist.ins_dist
+    sub_dist = cree_lev_dist.sub_dist
+
+    spelling = spelling.lower()
+    normal_form = normal_form.lower()
+    n, m = len(spelling), len(normal_form)
+    d = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        d[i][0] = d[i - 1][0] + del_dist(spelling, i - 1)
+    for j in range(1, m + 1):
+        d[0][j] = d[0][j - 1] + ins_dist(normal_form, normal_form[j - 1], j - 1)
+
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            _del_dist = d[i - 1][j] + del_dist(spelling, i - 1)
+            _ins_dist = d[i][j - 1] + ins_dist(normal_form, normal_form[j - 1], j - 1)
+            _sub_dist = d[i - 1][j - 1] + sub_dist(spelling, normal_form[j - 1], i - 1)
+            d[i][j] = min((_del_dist, _ins_dist, _sub_dist))
+
+    return d[-1][-1]
+
+
+def time_it(label: str, repeat: int, run: Callable[[], List[float]]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        run()
+        best = min(best, perf_counter() - start)
+    print(f"{label:<40} {best * 1000:9.1f} ms")
+    return best
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--dictionary",
+        type=Path,
+        default=shared_res_dir / "test_dictionaries" / "crkeng.xml",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    headwords = [
+        element.text
+        for element in ET.parse(str(args.dictionary)).getroot().iterfind("e/lg/l")
+        if element.text
+    ]
+    print(f"{len(QUERIES)} queries × {len(headwords)} headwords")
+
+    def run_original() -> List[float]:
+        return [original_distance(q, w) for q in QUERIES for w in headwords]
+
+    def run_single() -> List[float]:
+        get_modified_distance = cree_lev_dist.get_modified_distance
+        return [get_modified_distance(q, w) for q in QUERIES for w in headwords]
+
+    def run_batch() -> List[float]:
+        return [
+            distance
+            for q in QUERIES
+            for distance in cree_lev_dist.ModifiedDistanceScorer(q).distances_to(
+                headwords
+            )
+        ]
+
+    assert run_original() == run_single() == run_batch()
+
+    baseline = time_it("original full matrix", args.repeat, run_original)
+    for label, run in [
+        ("get_modified_distance()", run_single),
+        ("ModifiedDistanceScorer.distances_to()", run_batch),
+    ]:
+        elapsed = time_it(label, args.repeat, run)
+        print(f"{'':<40} {baseline / elapsed:9.1f}× faster")
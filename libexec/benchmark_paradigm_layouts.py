@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks filling pane-based paradigm layouts with and without their
+precompiled fill plans, using the layouts from the pane tests.
+
+    libexec/benchmark_paradigm_layouts.py [--layouts DIR] [--repeat 5] [--number 1000]
+
+The FST is not involved: every analysis gets a made-up form, so that only the
+layout handling is timed.
+"""
+
+import string
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+# Figure out shared_res_dir
+add_to_path = Path(__file__).parent.parent / "CreeDictionary"
+assert add_to_path.is_dir()
+sys.path.insert(0, str(add_to_path))
+panes = __import__("CreeDictionary.paradigm.panes").paradigm.panes
+
+LEMMA = "minôs"
+
+
+def original_analyses(layout, lemma: str) -> list[str]:
+    """
+    ParadigmLayout.generate_fst_analysis_string() as it was before fill plans,
+    split into lines as ParadigmManager did.
+    """
+    lines = [inflection.analysis for inflection in layout.inflection_cells]
+    template = string.Template("\n".join(lines))
+    return template.substitute(lemma=lemma).splitlines(keepends=False)
+
+
+def original_fill(layout, forms):
+    """
+    ParadigmLayout.fill() as it was before fill plans.
+    """
+    return panes.Paradigm(pane.fill(forms) for pane in layout.panes)
+
+
+def time_it(label: str, repeat: int, number: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (perf_counter() - start) / number)
+    print(f"  {label:<36} {best * 1_000_000:9.1f} µs")
+    return best
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--layouts",
+        type=Path,
+        default=add_to_path
+        / "tests"
+        / "CreeDictionary_tests"
+        / "data"
+        / "paradigm-layouts",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=1000)
+    args = parser.parse_args()
+
+    for layout_file in sorted(args.layouts.rglob("*.tsv")):
+        layout = panes.ParadigmLayout.loads(layout_file.read_text(encoding="UTF-8"))
+        # ParadigmLayout.fill() looks forms up by the unsubstituted analysis:
+        forms = {
+            cell.analysis: {f"form{i}"}
+            for i, cell in enumerate(layout.inflection_cells)
+        }
+        print(f"{layout_file.relative_to(args.layouts)}: {len(forms)} inflections")
+
+        assert original_analyses(layout, LEMMA) == list(layout.fst_analyses(LEMMA))
+        baseline = time_it(
+            "analyses: one string.Template",
+            args.repeat,
+            args.number,
+            lambda: original_analyses(layout, LEMMA),
+        )
+        elapsed = time_it(
+            "analyses: fill plan",
+            args.repeat,
+            args.number,
+            lambda: layout.fst_analyses(LEMMA),
+        )
+        print(f"  {'':<36} {baseline / elapsed:9.1f}× faster")
+
+        try:
+            expected = original_fill(layout, forms)
+        except NotImplementedError:
+            # Filling pane by pane can't handle MissingForm cells
+            print("  fill: pane by pane fails on this layout")
+            continue
+        assert list(layout.fill(forms).panes) == list(expected.panes)
+        baseline = time_it(
+            "fill: pane by pane",
+            args.repeat,
+            args.number,
+            lambda: original_fill(layout, forms),
+        )
+        elapsed = time_it(
+            "fill: fill plan", args.repeat, args.number, lambda: layout.fill(forms)
+        )
+        print(f"  {'':<36} {baseline / elapsed:9.1f}× faster")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks relabelling FST tags by their longest matching tag sequences, as
+search results and paradigm headers do, before and after the tag trie.
+
+    libexec/benchmark_relabelling.py [--repeat 5] [--number 20]
+
+The tag sequences are those of every analysis in the paradigm layouts, e.g.,
+PV/e+V+AI+Cnj+1Sg, relabelled with crk.altlabel.tsv.
+"""
+
+import re
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+# Figure out shared_res_dir
+add_to_path = Path(__file__).parent.parent / "CreeDictionary"
+assert add_to_path.is_dir()
+sys.path.insert(0, str(add_to_path))
+relabelling = __import__("CreeDictionary.relabelling").relabelling
+shared_res_dir = __import__("utils").shared_res_dir
+
+
+def original_full_relabelling(data, friendliness, tags) -> list:
+    """
+    _RelabelFetcher.get_full_relabelling() as it was before the tag trie.
+    """
+
+    def get_longest(try_tags):
+        end = len(try_tags)
+        while end > 0:
+            try:
+                entry = data[try_tags[:end]]
+            except KeyError:
+                end -= 1
+            else:
+                return try_tags[end:], entry[friendliness]
+        return try_tags, None
+
+    labels = []
+    tag_set = tuple(tags)
+    while tag_set:
+        unmatched, maybe_label = get_longest(tag_set)
+        if maybe_label is None:
+            labels.append(tag_set[0])
+            tag_set = tag_set[1:]
+        else:
+            labels.append(maybe_label)
+            tag_set = unmatched
+    return labels
+
+
+def tag_sequences(layout_dir: Path) -> list[tuple[str, ...]]:
+    analysis = re.compile(r"[^\t\"]*\$\{lemma\}[^\t\"]*")
+    sequences = []
+    for layout_file in sorted(layout_dir.glob("*.tsv")):
+        for match in analysis.findall(layout_file.read_text(encoding="UTF-8")):
+            sequences.append(
+                tuple(tag for tag in match.split("+") if tag and tag != "${lemma}")
+            )
+    return sequences
+
+
+def time_it(label: str, repeat: int, number: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (perf_counter() - start) / number)
+    print(f"  {label:<36} {best * 1000:9.2f} ms")
+    return best
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    labels = relabelling.LABELS
+    fetcher = labels.english
+    sequences = tag_sequences(shared_res_dir / "layouts")
+    print(
+        f"{len(sequences)} tag sequences ({len(set(sequences))} distinct), "
+        f"{sum(map(len, sequences))} tags"
+    )
+
+    for tags in sequences:
+        assert fetcher.get_full_relabelling(tags) == original_full_relabelling(
+            labels._data, fetcher._friendliness, tags
+        )
+
+    baseline = time_it(
+        "full relabelling: prefix probing",
+        args.repeat,
+        args.number,
+        lambda: [
+            original_full_relabelling(labels._data, fetcher._friendliness, tags)
+            for tags in sequences
+        ],
+    )
+    trie = time_it(
+        "full relabelling: trie",
+        args.repeat,
+        args.number,
+        lambda: [fetcher._full_relabelling.__wrapped__(tags) for tags in sequences],
+    )
+    memoized = time_it(
+        "full relabelling: trie, memoized",
+        args.repeat,
+        args.number,
+        lambda: [fetcher.get_full_relabelling(tags) for tags in sequences],
+    )
+    print(f"  {'trie':<36} {baseline / trie:9.1f}× faster")
+    print(f"  {'trie, memoized':<36} {baseline / memoized:9.1f}× faster")
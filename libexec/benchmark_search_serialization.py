@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks serializing a 100-result search response, as the click-in-text API
+does, before and after the dedicated serializer.
+
+    USE_TEST_DB=true libexec/benchmark_search_serialization.py [--results 100]
+
+The results come from several searches of the database, and are prefetched
+beforehand, so that only serialization and JSON encoding are timed.
+"""
+
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+# Figure out the Django project
+add_to_path = Path(__file__).parent.parent / "CreeDictionary"
+assert add_to_path.is_dir()
+sys.path.insert(0, str(add_to_path))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "CreeDictionary.settings")
+
+import django
+
+django.setup()
+
+import orjson
+from django.core.serializers.json import DjangoJSONEncoder
+from django.forms import model_to_dict
+
+from API.search import presentation, search
+
+QUERIES = ["see", "eat", "wâpamêw", "nipâw", "acâhkos", "sleep", "mîcisow", "go"]
+
+
+def original_serialize_wordform(wordform):
+    """
+    serialize_wordform() as it was before the dedicated serializer.
+    """
+    result = model_to_dict(wordform)
+    result["definitions"] = presentation.serialize_definitions(
+        wordform.definitions.all()
+    )
+    result["lemma_url"] = wordform.get_absolute_url()
+    result.update(
+        presentation.present_word_class(
+            wordform.analysis, wordform.pos, wordform.inflectional_category
+        )
+    )
+    return result
+
+
+def original_serialize(result):
+    """
+    PresentationResult.serialize() with the original serialize_wordform().
+    """
+    return result.serialize(original_serialize_wordform)
+
+
+def time_it(label: str, repeat: int, number: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (perf_counter() - start) / number)
+    print(f"  {label:<44} {best * 1000:9.2f} ms")
+    return best
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--results", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    results = []
+    while len(results) < args.results:
+        for query in QUERIES:
+            results.extend(search(query=query).presentation_results())
+    results = results[: args.results]
+    print(
+        f"{len(results)} results, {len({r.lemma_wordform.id for r in results})} lemmas"
+    )
+
+    def before():
+        return json.dumps(
+            {"results": [original_serialize(r) for r in results]},
+            cls=DjangoJSONEncoder,
+        ).encode("UTF-8")
+
+    def after():
+        serializer = presentation.WordformSerializer()
+        response = {"results": [r.serialize(serializer) for r in results]}
+        return orjson.dumps(response, default=DjangoJSONEncoder().default)
+
+    assert json.loads(before()) == json.loads(after())
+    baseline = time_it(
+        "model_to_dict() per wordform, json module", args.repeat, args.number, before
+    )
+    elapsed = time_it("WordformSerializer, orjson", args.repeat, args.number, after)
+    print(f"  {'':<44} {baseline / elapsed:9.1f}× faster")
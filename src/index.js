@@ -177,16 +177,17 @@ function setupParadigmSizeToggleButton() {
   toggleButton.addEventListener('click', () => {
     displayButtonAsLoading(toggleButton)
 
+    const paradigmContainer = document.getElementById('paradigm')
+    const oldParadigm = paradigmContainer.querySelector('.js-replaceable-paradigm')
+
     fetch(Urls['cree-dictionary-paradigm-detail']() + `?lemma-id=${lemmaId}&paradigm-size=${nextParadigmSize}`).then(r => {
       if (r.ok) {
-        return r.text()
+        return showParadigmAsItArrives(r, oldParadigm)
       } else {
         throw new Error(`${r.status} ${r.statusText} when loading paradigm: ${r.text()}`)
       }
     }).then(
-      text => {
-        const newParadigm = document.createRange().createContextualFragment(text)
-
+      newParadigm => {
         // TODO: is this necessary? Shouldn't the component itself know what
         // text to use?
         if (mostDetailedParadigmSizeIsSelected()) {
@@ -197,9 +198,6 @@ function setupParadigmSizeToggleButton() {
 
         window.history.replaceState({}, document.title, updateQueryParam('paradigm-size', nextParadigmSize))
 
-        const paradigmContainer = document.getElementById('paradigm')
-        paradigmContainer.querySelector('.js-replaceable-paradigm').replaceWith(newParadigm)
-
         paradigmSize = nextParadigmSize
         setupParadigmSizeToggleButton()
 
@@ -219,6 +217,67 @@ function setupParadigmSizeToggleButton() {
   }
 }
 
+/**
+ * Shows the paradigm in the response in place of the old one, as it arrives.
+ *
+ * Bigger paradigms are sent a table at a time (see stream_paradigm_tables() in
+ * CreeDictionary/views.py), so that the first tables can be shown while the
+ * server is still generating the rest. The HTML is parsed as it arrives, and
+ * whatever has been parsed of the paradigm so far replaces what's shown.
+ *
+ * If the response ends before the paradigm does (e.g., the server failed part
+ * way through), the old paradigm is shown again, and the promise is rejected.
+ *
+ * @param {Response} response
+ * @param {Element} oldParadigm  the .js-replaceable-paradigm on the page
+ * @return {Promise<Element>} the .js-replaceable-paradigm that replaced it
+ */
+async function showParadigmAsItArrives(response, oldParadigm) {
+  // A document of its own parses the HTML bit by bit, without running anything:
+  const parsed = document.implementation.createHTMLDocument('')
+  parsed.open()
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let shown = oldParadigm
+  let endOfResponse = ''
+
+  try {
+    for (;;) {
+      const {done, value} = await reader.read()
+      const html = decoder.decode(value, {stream: !done})
+      parsed.write(html)
+      endOfResponse = (endOfResponse + html).slice(-100)
+      if (done) {
+        parsed.close()
+      }
+
+      const paradigm = parsed.querySelector('.js-replaceable-paradigm')
+      if (paradigm) {
+        const copy = document.importNode(paradigm, true)
+        shown.replaceWith(copy)
+        shown = copy
+      }
+
+      if (done) {
+        break
+      }
+    }
+
+    // The parser closes whatever is left open, so check the server did too:
+    if (!endOfResponse.trimEnd().endsWith('</section>')) {
+      throw new Error('the paradigm was cut short')
+    }
+  } catch (err) {
+    if (shown !== oldParadigm) {
+      shown.replaceWith(oldParadigm)
+    }
+    throw err
+  }
+
+  return shown
+}
+
 /**
  * Make the button look like it's loading.
  */